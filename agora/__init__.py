@@ -1,28 +1,165 @@
-import warnings, copy, time, uuid, json
+import warnings, copy, time, uuid, json, os, hashlib, weakref, pickle, threading
 import asyncio
+import contextvars
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait as _wait_futures
+from contextlib import contextmanager
+from collections.abc import MutableMapping
 from datetime import datetime
 from typing import Dict, Any, List, Optional
 
+from .cache import _cache_lookup
+from .checkpoint import Checkpointer, new_execution_id, restore
+from .ratelimit import resolve_rate_limiter
+from .hedge import HedgePolicy
+from .retry import RetryPolicy
+
+# ======================================================================
+# SOURCE CAPTURE (LAZY, CACHED PER CLASS)
+# ======================================================================
+
+# Set AGORA_CAPTURE_SOURCE=0 (or call set_source_capture(False)) in production
+_capture_source = os.environ.get("AGORA_CAPTURE_SOURCE", "1").lower() not in ("0", "false", "no")
+_source_cache = weakref.WeakKeyDictionary()  # class/function -> (code, code_hash)
+_source_by_hash = {}  # code_hash -> code, so identical sources share one string
+
+
+def set_source_capture(enabled):
+    """Globally enable or disable node source capture."""
+    global _capture_source
+    _capture_source = bool(enabled)
+
+
+def get_source(obj, force=False):
+    """Return (code, code_hash) for a class or function, reading the file at most once.
+    
+    Returns (None, None) while source capture is disabled unless force is set
+    (cache keys need the code hash regardless).
+    """
+    if not (_capture_source or force): return None, None
+    try:
+        return _source_cache[obj]
+    except (KeyError, TypeError):
+        pass
+    try:
+        import inspect
+        code = inspect.getsource(obj)
+        code_hash = hashlib.sha256(code.encode("utf-8")).hexdigest()
+        entry = (_source_by_hash.setdefault(code_hash, code), code_hash)
+    except Exception:
+        entry = (None, None)
+    try:
+        _source_cache[obj] = entry
+    except TypeError:
+        pass
+    return entry
+
+
+class _SourceMixin:
+    """Lazy ``code`` / ``code_hash`` attributes shared by sync and async nodes."""
+    _source_obj = None  # object whose source is captured; defaults to the class
+    
+    @property
+    def code(self):
+        if "_code" in self.__dict__: return self._code
+        return get_source(self._source_obj or type(self))[0]
+    
+    @code.setter
+    def code(self, value): self._code = value
+    
+    @property
+    def code_hash(self):
+        if "_code" in self.__dict__:
+            return hashlib.sha256(self._code.encode("utf-8")).hexdigest() if self._code else None
+        return get_source(self._source_obj or type(self))[1]
+
+
+# ======================================================================
+# COPY-ON-WRITE SHARED STATE
+# ======================================================================
+
+_DELETED = object()
+
+
+class SharedOverlay(MutableMapping):
+    """Copy-on-write layer over a shared dict (ChainMap-like).
+
+    Reads fall through to the parent, while writes and deletes stay in a
+    local layer. merge() applies the local layer to the parent.
+    """
+    __slots__ = ("parent", "local")
+    
+    def __init__(self, parent, local=None):
+        self.parent, self.local = parent, dict(local or {})
+    
+    def __getitem__(self, key):
+        if key in self.local:
+            value = self.local[key]
+            if value is _DELETED: raise KeyError(key)
+            return value
+        return self.parent[key]
+    
+    def __setitem__(self, key, value): self.local[key] = value
+    
+    def __delitem__(self, key):
+        if key not in self: raise KeyError(key)
+        self.local[key] = _DELETED
+    
+    def __contains__(self, key):
+        if key in self.local: return self.local[key] is not _DELETED
+        return key in self.parent
+    
+    def __iter__(self):
+        for key, value in self.local.items():
+            if value is not _DELETED: yield key
+        for key in self.parent:
+            if key not in self.local: yield key
+    
+    def __len__(self): return sum(1 for _ in self)
+    
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+    
+    def copy(self):
+        """Flatten into a plain dict."""
+        return dict(self)
+    
+    def changes(self):
+        """Return (written, deleted): local writes and locally deleted keys."""
+        written = {k: v for k, v in self.local.items() if v is not _DELETED}
+        return written, [k for k, v in self.local.items() if v is _DELETED]
+    
+    def merge(self, into=None, exclude=()):
+        """Apply local writes/deletes to `into` (defaults to the parent), in write order."""
+        target = self.parent if into is None else into
+        for key, value in self.local.items():
+            if key in exclude: continue
+            if value is _DELETED: target.pop(key, None)
+            else: target[key] = value
+    
+    def __repr__(self):
+        written, deleted = self.changes()
+        return f"{self.__class__.__name__}(written={written!r}, deleted={deleted!r})"
+
+
 # ======================================================================
 # SYNC CORE CLASSES
 # ======================================================================
 
-class BaseNode:
+class BaseNode(_SourceMixin):
+    trace_attributes = {}
+    
     def __init__(self, name=None):
         self.params, self.successors = {}, {}
         self.name = name or f"{self.__class__.__name__}_{id(self)}"
         self.context = None
-        
-        # Capture source code for visualization
-        try:
-            import inspect
-            self.code = inspect.getsource(self.__class__)
-        except Exception:
-            self.code = None
     
     def set_params(self, params): 
         self.params = params
     
+    def annotate(self, **attributes):
+        """Attach attributes to the tracing span / audit record of the current run."""
+        self.trace_attributes = {**self.trace_attributes, **attributes}
+    
     def next(self, node, action="default"):
         if action in self.successors: 
             warnings.warn(f"Overwriting successor for action '{action}'")
@@ -93,29 +230,62 @@ class _ConditionalTransition:
     def __rshift__(self, tgt): return self.src.next(tgt, self.action)
 
 
+def _retry_policy(node):
+    """The node's RetryPolicy, or one equivalent to its max_retries / wait."""
+    return node.retry_policy or RetryPolicy.fixed(node.max_retries, node.wait)
+
+
+def _checked(node, result):
+    """Reject the None an un-overridden exec() returns."""
+    if result is None and type(node).exec is BaseNode.exec:
+        raise NotImplementedError(
+            f"{node.__class__.__name__}.exec() returned None. "
+            f"Did you forget to override exec()? "
+            f"All nodes must implement exec() method."
+        )
+    return result
+
+
+def _run_with_retries(node, attempt, arg):
+    """The retry engine of sync nodes: cache lookup, RetryPolicy, exec_fallback.
+    
+    attempt(arg, retry) makes one attempt; retry counts the failed ones so far.
+    """
+    key = None
+    if node.cache is not None:
+        key, hit, value = _cache_lookup(node, arg)
+        if hit: return value
+    policy, retry = _retry_policy(node), 0
+    policy.start()
+    while True:
+        try:
+            result = attempt(arg, retry)
+            if key is not None: node.cache.set(key, result)
+            return result
+        except Exception as e:
+            delay = policy.next_delay(e, retry + 1)
+            if delay is None: return node.exec_fallback(arg, e)
+            retry += 1
+            if delay > 0: time.sleep(delay)
+
+
 class Node(BaseNode):
-    def __init__(self, name=None, max_retries=1, wait=0):
+    cache = None  # optional CacheBackend, see agora.cache
+    retry_policy = None  # optional RetryPolicy, see agora.retry; overrides max_retries / wait
+    
+    def __init__(self, name=None, max_retries=1, wait=0, cache=None, retry_policy=None):
         super().__init__(name)
         self.max_retries, self.wait = max_retries, wait
+        if cache is not None: self.cache = cache
+        if retry_policy is not None: self.retry_policy = retry_policy
     
     def exec_fallback(self, prep_res, exc): raise exc
     
-    def _exec(self, prep_res):
-        for self.cur_retry in range(self.max_retries):
-            try: 
-                result = self.exec(prep_res)
-                # Same check as BaseNode, but after successful execution
-                if result is None and type(self).exec is BaseNode.exec:
-                    raise NotImplementedError(
-                        f"{self.__class__.__name__}.exec() returned None. "
-                        f"Did you forget to override exec()? "
-                        f"All nodes must implement exec() method."
-                    )
-                return result
-            except Exception as e:
-                if self.cur_retry == self.max_retries - 1: 
-                    return self.exec_fallback(prep_res, e)
-                if self.wait > 0: time.sleep(self.wait)
+    def _exec_attempt(self, prep_res, retry):
+        self.cur_retry = retry
+        return _checked(self, self.exec(prep_res))
+    
+    def _exec(self, prep_res): return _run_with_retries(self, self._exec_attempt, prep_res)
 
 
 class BatchNode(Node):
@@ -123,19 +293,240 @@ class BatchNode(Node):
         return [super(BatchNode, self)._exec(i) for i in (items or [])]
 
 
+def _run_chunk(node, items):
+    """Worker-process entry point for process-pool batch nodes."""
+    return [node._exec_item(item) for item in items]
+
+
+class _ProcessPoolMixin:
+    """Shared chunking, payload and executor handling for process-pool nodes.
+    
+    Each chunk ships one pickled copy of the node (without successors or
+    context) to a worker, which runs exec with the usual per-item retry and
+    exec_fallback semantics. Pass executor= to reuse a long-lived pool;
+    otherwise a pool of max_workers processes is created per batch.
+    """
+    max_workers = None
+    chunksize = 1
+    executor = None
+    
+    def _configure_pool(self, max_workers, chunksize, executor):
+        if max_workers is not None: self.max_workers = max_workers
+        if chunksize is not None: self.chunksize = chunksize
+        if executor is not None: self.executor = executor
+    
+    def _exec_item_attempt(self, item, retry):
+        self.cur_retry = retry  # each worker runs its chunk's items one at a time
+        return _checked(self, self.exec(item))
+    
+    def _exec_item(self, item): return _run_with_retries(self, self._exec_item_attempt, item)
+    
+    def _chunks(self, items):
+        items, size = list(items or []), max(1, self.chunksize)
+        return [items[i:i + size] for i in range(0, len(items), size)]
+    
+    def _pool_payload(self):
+        node = copy.copy(self)
+        node.successors, node.context, node.cache = {}, None, None
+        node.__dict__.pop("executor", None)
+        try:
+            pickle.dumps(node)
+        except Exception as exc:
+            raise TypeError(
+                f"{self.__class__.__name__} can't be sent to worker processes: {exc}. "
+                f"Define the node class at module level and keep its attributes picklable."
+            ) from exc
+        return node
+    
+    @contextmanager
+    def _pool(self, wait=True):
+        if self.executor is not None:
+            yield self.executor
+            return
+        pool = ProcessPoolExecutor(self.max_workers)
+        try: yield pool
+        finally: pool.shutdown(wait=wait)
+
+
+# Shared, bounded thread pool for the sync parallel primitives
+_thread_pool, _thread_pool_size = None, None
+_thread_pool_lock = threading.Lock()
+_pool_worker = threading.local()
+
+
+def _mark_pool_worker(): _pool_worker.active = True
+
+
+def configure_thread_pool(max_workers):
+    """Set the size of the thread pool shared by ParallelBatchNode / ParallelBatchFlow."""
+    global _thread_pool, _thread_pool_size
+    with _thread_pool_lock:
+        old, _thread_pool, _thread_pool_size = _thread_pool, None, max_workers
+    if old is not None: old.shutdown(wait=False)
+
+
+def _shared_thread_pool():
+    global _thread_pool
+    with _thread_pool_lock:
+        if _thread_pool is None:
+            size = _thread_pool_size or min(32, (os.cpu_count() or 1) + 4)
+            _thread_pool = ThreadPoolExecutor(size, thread_name_prefix="agora",
+                                              initializer=_mark_pool_worker)
+            _thread_pool._agora_size = size
+        return _thread_pool
+
+
+def _thread_map(fn, items, limit=None):
+    """Call fn(item) on the shared pool with at most `limit` calls in flight.
+    
+    Results come back in input order; the first exception is re-raised after
+    cancelling items that haven't started. Calls made from inside a pool
+    worker (nested parallelism) run inline so the bounded pool can't deadlock.
+    """
+    if getattr(_pool_worker, "active", False):
+        return [fn(item) for item in items]
+    pool = _shared_thread_pool()
+    limit = limit or pool._agora_size
+    results, pending = {}, {}
+    
+    def collect(return_when):
+        done, _ = _wait_futures(pending, return_when=return_when)
+        for fut in done:
+            results[pending.pop(fut)] = fut.result()
+    
+    try:
+        for index, item in enumerate(items):
+            if len(pending) >= limit: collect(FIRST_COMPLETED)
+            pending[pool.submit(fn, item)] = index
+        while pending: collect(FIRST_COMPLETED)
+    except BaseException:
+        for fut in pending: fut.cancel()
+        raise
+    return [results[i] for i in range(len(results))]
+
+
+class ParallelBatchNode(BatchNode):
+    """BatchNode that runs items concurrently on the shared thread pool
+    
+    Meant for blocking I/O (SDK calls) in sync flows. Each item keeps Node's
+    max_retries / wait / exec_fallback semantics; max_concurrency caps the
+    items in flight for this node (defaults to the pool size).
+    """
+    max_concurrency = None
+    
+    def __init__(self, name=None, max_retries=1, wait=0, max_concurrency=None, **kwargs):
+        super().__init__(name, max_retries, wait, **kwargs)
+        if max_concurrency is not None: self.max_concurrency = max_concurrency
+    
+    # No self.cur_retry here: it would race between worker threads
+    def _exec_item_attempt(self, item, retry): return _checked(self, self.exec(item))
+    
+    def _exec_item(self, item): return _run_with_retries(self, self._exec_item_attempt, item)
+    
+    def _exec(self, items):
+        return _thread_map(self._exec_item, items or [], self.max_concurrency)
+
+
+class ProcessPoolBatchNode(_ProcessPoolMixin, BatchNode):
+    """BatchNode that runs exec for each item in a ProcessPoolExecutor (CPU-bound work)"""
+    
+    def __init__(self, name=None, max_retries=1, wait=0, max_workers=None, chunksize=None, executor=None,
+                 **kwargs):
+        super().__init__(name, max_retries, wait, **kwargs)
+        self._configure_pool(max_workers, chunksize, executor)
+    
+    def _exec(self, items):
+        chunks = self._chunks(items)
+        if not chunks: return []
+        payload = self._pool_payload()
+        with self._pool() as pool:
+            results = list(pool.map(_run_chunk, [payload] * len(chunks), chunks))
+        return [r for chunk in results for r in chunk]
+
+
+# Per-visit node state a compiled run resets before each step, so loops see
+# it as fresh per-step copies would
+_VISIT_STATE = ("trace_attributes", "cur_retry")
+
+
+class _FlowPlan:
+    """Frozen transition table built by Flow.compile() / AsyncFlow.compile().
+
+    Nodes reachable from the start node get integer ids (start is always 0),
+    actions get integer ids, and ``table[node_id][action_id]`` holds the id of
+    the successor node or -1 when the action ends the flow.
+    """
+    __slots__ = ("nodes", "node_ids", "action_ids", "table")
+
+    def __init__(self, start):
+        self.nodes, self.node_ids, self.action_ids = [], {}, {}
+        pending = [start]
+        while pending:
+            node = pending.pop()
+            if id(node) in self.node_ids: continue
+            self.node_ids[id(node)] = len(self.nodes)
+            self.nodes.append(node)
+            for action, nxt in node.successors.items():
+                self.action_ids.setdefault(action, len(self.action_ids))
+                pending.append(nxt)
+        self.table = [[-1] * len(self.action_ids) for _ in self.nodes]
+        for node_id, node in enumerate(self.nodes):
+            for action, nxt in node.successors.items():
+                self.table[node_id][self.action_ids[action]] = self.node_ids[id(nxt)]
+
+    def instantiate(self, context, params):
+        """Per-run node state: one shallow copy per node, reused for every step."""
+        nodes = [copy.copy(n) for n in self.nodes]
+        for node in nodes:
+            node.context = context
+            node.set_params(params)
+        return nodes
+
+    def visit(self, nodes, i):
+        """nodes[i] with its per-visit state reset to the compiled node's."""
+        node, template = nodes[i], self.nodes[i].__dict__
+        state = node.__dict__
+        for attr in _VISIT_STATE:
+            if attr in template: state[attr] = template[attr]
+            else: state.pop(attr, None)
+        return node
+
+
+def _compile_subflows(plan):
+    for node in plan.nodes:
+        if getattr(node, "start_node", None) is not None and hasattr(node, "compile"):
+            node.compile()
+
+
 class Flow(BaseNode):
     def __init__(self, name=None, start=None):
         super().__init__(name)
         self.start_node = start
+        self._plan = None
     
     # Flow doesn't need exec() override check since it uses _orch() instead
     def exec(self, prep_res): 
         pass
     
     def start(self, start): 
-        self.start_node = start
+        self.start_node, self._plan = start, None
         return start
     
+    def compile(self):
+        """Freeze the graph into a transition table for fast orchestration.
+
+        After compiling, each run copies every node once up front and then
+        steps through integer ids instead of copying a node per step. A node
+        visited several times in a loop is therefore the same copy each time:
+        its annotations and retry count are reset before every visit, but any
+        other attributes it sets on self persist to the next visit within the
+        run. Graph edits made after compile() are not seen until compile() is
+        called again. Nested flows are compiled as well. Returns self.
+        """
+        self._plan = _FlowPlan(self.start_node) if self.start_node else None
+        if self._plan: _compile_subflows(self._plan)
+        return self
+    
     def get_next_node(self, curr, action):
         nxt = curr.successors.get(action or "default")
         if not nxt and curr.successors:
@@ -143,6 +534,8 @@ class Flow(BaseNode):
         return nxt
     
     def _orch(self, shared, params=None):
+        if self._plan is not None:
+            return self._orch_compiled(shared, params)
         curr, p, last_action = copy.copy(self.start_node), (params or {**self.params}), None
         while curr:
             curr.context = self.context
@@ -151,6 +544,26 @@ class Flow(BaseNode):
             curr = copy.copy(self.get_next_node(curr, last_action))
         return last_action
     
+    def _orch_compiled(self, shared, params=None):
+        plan = self._plan
+        nodes = plan.instantiate(self.context, params or {**self.params})
+        table, action_ids, node_ids = plan.table, plan.action_ids, plan.node_ids
+        # Subclasses that hook get_next_node (e.g. to audit transitions) keep it
+        hooked = type(self).get_next_node is not Flow.get_next_node
+        i, last_action = 0, None
+        while i >= 0:
+            curr = plan.visit(nodes, i)
+            last_action = curr._run(shared)
+            if hooked:
+                nxt = self.get_next_node(curr, last_action)
+                i = node_ids[id(nxt)] if nxt is not None else -1
+                continue
+            a = action_ids.get(last_action or "default")
+            i = table[i][a] if a is not None else -1
+            if i < 0 and curr.successors:
+                warnings.warn(f"Flow ends: '{last_action}' not found in {list(curr.successors)}")
+        return last_action
+    
     def _run(self, shared):
         self.before_run(shared)
         try:
@@ -189,10 +602,107 @@ class Flow(BaseNode):
         return "\n".join(lines)
 
 
+class ParallelBatchFlow(Flow):
+    """Sync batch flow that runs one sub-flow per item on the shared thread pool
+    
+    Items read shared through a SharedOverlay; with merge_shared = True their
+    writes are merged back in item order. max_concurrency caps items in flight.
+    """
+    merge_shared = False
+    max_concurrency = None
+    
+    def _orch(self, shared, params=None):
+        items = params or shared.get("items", [])
+        overlays = [SharedOverlay(shared, {"item": item}) for item in items]
+        orch = super()._orch
+        results = _thread_map(lambda item_shared: orch(item_shared, params),
+                              overlays, self.max_concurrency)
+        if self.merge_shared:
+            for item_shared in overlays: item_shared.merge(exclude=("item",))
+        shared["batch_results"] = results
+        return results
+
+
 # ======================================================================
 # ASYNC CLASSES
 # ======================================================================
 
+# Absolute time.monotonic() deadline of the enclosing flow run, if any
+_deadline = contextvars.ContextVar("agora_deadline", default=None)
+
+
+class DeadlineExceeded(asyncio.TimeoutError):
+    """The flow-level deadline passed before the work finished."""
+
+
+def _time_left(timeout=None):
+    """Seconds a call may take: the smaller of timeout and the flow's remaining deadline."""
+    deadline = _deadline.get()
+    if deadline is None: return timeout
+    remaining = deadline - time.monotonic()
+    if remaining <= 0: raise DeadlineExceeded("Flow deadline exceeded")
+    return remaining if timeout is None else min(timeout, remaining)
+
+
+def _time_for_retry(delay):
+    """Whether the flow's deadline leaves room to back off and retry."""
+    deadline = _deadline.get()
+    return deadline is None or deadline - time.monotonic() > delay
+
+
+def _async_retry_delay(policy, exc, attempt):
+    """policy.next_delay, giving up on deadline errors or backoff past the deadline."""
+    if isinstance(exc, DeadlineExceeded): return None
+    delay = policy.next_delay(exc, attempt)
+    return delay if delay is not None and _time_for_retry(delay) else None
+
+
+def _checked_async(node, result):
+    """Reject the None an un-overridden exec_async() returns."""
+    if result is None and type(node).exec_async is AsyncNode.exec_async:
+        raise NotImplementedError(
+            f"{node.__class__.__name__}.exec_async() returned None. "
+            f"Did you forget to override exec_async()? "
+            f"All async nodes must implement exec_async() method."
+        )
+    return result
+
+
+async def _run_with_retries_async(node, attempt, arg):
+    """The retry engine of async nodes (see _run_with_retries).
+    
+    Retries also stop at the enclosing flow's deadline.
+    """
+    key = None
+    if node.cache is not None:
+        key, hit, value = _cache_lookup(node, arg)
+        if hit: return value
+    policy, retry = _retry_policy(node), 0
+    policy.start()
+    while True:
+        try:
+            result = await attempt(arg, retry)
+            if key is not None: node.cache.set(key, result)
+            return result
+        except Exception as e:
+            delay = _async_retry_delay(policy, e, retry + 1)
+            if delay is None: return await node.exec_fallback_async(arg, e)
+            retry += 1
+            if delay > 0: await asyncio.sleep(delay)
+
+
+async def _bounded(awaitable, timeout):
+    """Await with an optional timeout, cancelling the work when it expires."""
+    if timeout is None: return await awaitable
+    try:
+        return await asyncio.wait_for(awaitable, timeout)
+    except asyncio.TimeoutError:
+        deadline = _deadline.get()
+        if deadline is not None and time.monotonic() >= deadline:
+            raise DeadlineExceeded("Flow deadline exceeded") from None
+        raise
+
+
 class _AsyncConditionalTransition:
     """Helper for async conditional transitions"""
     def __init__(self, src, action):
@@ -200,24 +710,36 @@ class _AsyncConditionalTransition:
     def __rshift__(self, tgt): return self.src.next(tgt, self.action)
 
 
-class AsyncNode:
-    """Async version of Node with full Agora features"""
+class AsyncNode(_SourceMixin):
+    """Async version of Node with full Agora features
+    
+    timeout bounds each exec_async attempt (seconds); it is further capped by
+    the enclosing flow's deadline. A timed-out attempt is cancelled and goes
+    through the normal retry / exec_fallback_async path.
+    """
+    cache = None  # optional CacheBackend, see agora.cache
+    retry_policy = None  # optional RetryPolicy, see agora.retry; overrides max_retries / wait
+    timeout = None
+    hedge = None  # optional HedgePolicy, see agora.hedge
+    trace_attributes = {}
     
-    def __init__(self, name=None, max_retries=1, wait=0):
+    def __init__(self, name=None, max_retries=1, wait=0, cache=None, timeout=None, hedge=None,
+                 retry_policy=None):
         self.params, self.successors = {}, {}
         self.name = name or f"{self.__class__.__name__}_{id(self)}"
         self.context = None
         self.max_retries, self.wait = max_retries, wait
-        
-        # Capture source code for visualization
-        try:
-            import inspect
-            self.code = inspect.getsource(self.__class__)
-        except Exception:
-            self.code = None
+        if cache is not None: self.cache = cache
+        if timeout is not None: self.timeout = timeout
+        if hedge is not None: self.hedge = hedge
+        if retry_policy is not None: self.retry_policy = retry_policy
     
     def set_params(self, params): self.params = params
+    def annotate(self, **attributes):
+        """Attach attributes to the tracing span / audit record of the current run."""
+        self.trace_attributes = {**self.trace_attributes, **attributes}
     def next(self, node, action="default"):
+        if isinstance(node, (list, tuple)): node = AsyncFanOut(node)
         if action in self.successors:
             warnings.warn(f"Overwriting successor for action '{action}'")
         self.successors[action] = node
@@ -239,22 +761,38 @@ class AsyncNode:
     async def on_error_async(self, exc, shared): raise exc
     async def exec_fallback_async(self, prep_res, exc): raise exc
     
+    # Rate limiting (see agora.ratelimit): a registered limiter name or a RateLimiter
+    rate_limit = None
+    def estimate_tokens(self, prep_res):
+        """Tokens one exec_async call will consume, for tokens-per-minute limits."""
+        return 0
+    
+    async def _call_exec_async(self, prep_res):
+        """One exec_async attempt, bounded by timeout and the flow deadline.
+        
+        With a hedge policy, a slow attempt may be raced against a backup one.
+        """
+        timeout = _time_left(self.timeout)
+        if self.hedge is None:
+            return await _bounded(self._limited_exec_async(prep_res), timeout)
+        attempt = lambda: self._limited_exec_async(prep_res)
+        return await _bounded(self.hedge.run(attempt, self.annotate), timeout)
+    
+    async def _limited_exec_async(self, prep_res):
+        """exec_async after waiting for rate-limit capacity."""
+        if self.rate_limit is None: return await self.exec_async(prep_res)
+        limiter = resolve_rate_limiter(self.rate_limit)
+        async with limiter.slot(self.estimate_tokens(prep_res)) as waited:
+            waited_ms = self.trace_attributes.get("rate_limit_wait_ms", 0) + waited * 1000
+            self.annotate(rate_limit_wait_ms=round(waited_ms, 3))
+            return await self.exec_async(prep_res)
+    
+    async def _exec_attempt_async(self, prep_res, retry):
+        self.cur_retry = retry
+        return _checked_async(self, await self._call_exec_async(prep_res))
+    
     async def _exec_async(self, prep_res):
-        for self.cur_retry in range(self.max_retries):
-            try: 
-                result = await self.exec_async(prep_res)
-                # Check if exec_async() was not overridden
-                if result is None and type(self).exec_async is AsyncNode.exec_async:
-                    raise NotImplementedError(
-                        f"{self.__class__.__name__}.exec_async() returned None. "
-                        f"Did you forget to override exec_async()? "
-                        f"All async nodes must implement exec_async() method."
-                    )
-                return result
-            except Exception as e:
-                if self.cur_retry == self.max_retries - 1:
-                    return await self.exec_fallback_async(prep_res, e)
-                if self.wait > 0: await asyncio.sleep(self.wait)
+        return await _run_with_retries_async(self, self._exec_attempt_async, prep_res)
     
     async def _run_async(self, shared):
         await self.before_run_async(shared)
@@ -290,42 +828,595 @@ class AsyncBatchNode(AsyncNode):
         return results
 
 
+async def _aiter_items(items):
+    """Iterate a sync or async iterable (or None) as an async iterator."""
+    if hasattr(items, "__aiter__"):
+        async for item in items: yield item
+    else:
+        for item in (items or ()): yield item
+
+
+def _item_puller(items):
+    """Return an async pull() that worker tasks share to take the next item.
+    
+    items may be a sync or async iterable (or None); pull() raises
+    StopAsyncIteration once it is exhausted.
+    """
+    if hasattr(items, "__aiter__"):
+        source, lock = items.__aiter__(), asyncio.Lock()
+        async def pull():
+            async with lock:  # async generators can't be advanced concurrently
+                return await source.__anext__()
+    else:
+        source, end = iter(items or ()), object()
+        async def pull():
+            item = next(source, end)
+            if item is end: raise StopAsyncIteration
+            return item
+    return pull
+
+
+_ERROR_POLICIES = ("fail_fast", "collect", "best_effort")
+
+
+class BatchError(Exception):
+    """Items of a parallel batch failed under the "collect" error policy.
+    
+    errors maps item index to exception; results holds what the batch would
+    have returned, with None in place of failed items when ordered.
+    """
+    def __init__(self, errors, results):
+        self.errors, self.results = errors, results
+        first = next(iter(errors.values()))
+        super().__init__(f"{len(errors)} batch item(s) failed; first: {first!r}")
+
+
+async def _bounded_map(fn, items, limit, ordered=True, errors="fail_fast", counts=None):
+    """Await fn(item) for every item with at most `limit` calls in flight.
+
+    Items are pulled lazily by a pool of `limit` workers, so only O(limit)
+    coroutines exist at once. Results come back in input order, or in
+    completion order when ordered=False.
+    
+    errors decides what an exception from fn does: "fail_fast" cancels the
+    items in flight and raises it, "collect" finishes every item and then
+    raises BatchError, "best_effort" finishes every item and puts None in
+    place of failures (or drops them when unordered). A counts dict, if
+    given, receives completed/failed/cancelled item counts.
+    """
+    if errors not in _ERROR_POLICIES:
+        raise ValueError(f"errors must be one of {_ERROR_POLICIES}, got {errors!r}")
+    count, in_flight, succeeded = 0, 0, 0
+    results, failures = {} if ordered else [], {}
+    pull = _item_puller(items)
+    
+    async def worker():
+        nonlocal count, in_flight, succeeded
+        while True:
+            try: item = await pull()
+            except StopAsyncIteration: return
+            index, count = count, count + 1
+            in_flight += 1
+            try: result = await fn(item)
+            except Exception as exc:
+                failures[index] = exc
+                if errors == "fail_fast": raise
+                if not ordered: continue
+                result = None
+            else: succeeded += 1
+            finally: in_flight -= 1
+            if ordered: results[index] = result
+            else: results.append(result)
+    
+    workers = [asyncio.ensure_future(worker()) for _ in range(max(1, limit))]
+    cancelled = 0
+    try:
+        finished, pending = await asyncio.wait(workers, return_when=asyncio.FIRST_EXCEPTION)
+        failed = next((w for w in finished if w.exception() is not None), None)
+        if failed is not None:
+            cancelled = in_flight
+            for w in pending: w.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            raise failed.exception()
+    finally:
+        if not all(w.done() for w in workers):  # we were cancelled ourselves
+            cancelled = in_flight
+            for w in workers: w.cancel()
+        if counts is not None:
+            counts.update(completed=succeeded, failed=len(failures), cancelled=cancelled)
+    if ordered: results = [results.get(i) for i in range(count)]
+    if failures and errors == "collect":
+        raise BatchError(failures, results)
+    return results
+
+
+class AsyncProcessPoolBatchNode(_ProcessPoolMixin, AsyncNode):
+    """Async batch node that runs a sync exec(item) in a ProcessPoolExecutor
+    
+    prep_async/post_async stay on the event loop; the CPU-bound exec (and
+    exec_fallback) run in worker processes with Node retry semantics.
+    """
+    
+    def __init__(self, name=None, max_retries=1, wait=0, max_workers=None, chunksize=None, executor=None,
+                 **kwargs):
+        super().__init__(name, max_retries, wait, **kwargs)
+        self._configure_pool(max_workers, chunksize, executor)
+    
+    def exec(self, item):
+        """Override with the CPU-bound per-item work (runs in a worker process)."""
+        raise NotImplementedError(f"{self.__class__.__name__}.exec() must be overridden.")
+    
+    def exec_fallback(self, item, exc): raise exc
+    
+    async def _exec_async(self, items):
+        chunks = self._chunks(items)
+        if not chunks: return []
+        payload, loop = self._pool_payload(), asyncio.get_running_loop()
+        with self._pool(wait=False) as pool:
+            results = await asyncio.gather(*[
+                loop.run_in_executor(pool, _run_chunk, payload, chunk) for chunk in chunks
+            ])
+        return [r for chunk in results for r in chunk]
+
+
+class _MicroBatcher:
+    """Coalesces single-item calls from concurrent runs into batched calls.
+    
+    Shared by every copy of an AsyncMicroBatchNode (copies made by flow
+    orchestration share the reference), so concurrent flows feed one queue.
+    A batch is flushed when it reaches max_batch_size or max_wait_ms after
+    its first item arrived.
+    """
+    def __init__(self):
+        self.pending, self.timer, self.loop = [], None, None
+        self.tasks = set()  # the loop only holds weak references to tasks
+    
+    async def submit(self, node, item):
+        loop = asyncio.get_running_loop()
+        if loop is not self.loop:  # batches never span event loops
+            self.pending, self.timer, self.loop = [], None, loop
+        future = loop.create_future()
+        self.pending.append((item, future, time.perf_counter()))
+        if len(self.pending) >= node.max_batch_size:
+            self.flush(node)
+        elif self.timer is None:
+            self.timer = loop.call_later(node.max_wait_ms / 1000, self.flush, node)
+        return await future
+    
+    def flush(self, node):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        batch, self.pending = self.pending, []
+        if batch:
+            task = asyncio.ensure_future(self._run(node, batch))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+    
+    async def _run(self, node, batch):
+        started = time.perf_counter()
+        items = [item for item, _, _ in batch]
+        try:
+            limiter = resolve_rate_limiter(node.rate_limit)
+            if limiter is None:
+                results = list(await node.exec_batch_async(items))
+            else:
+                tokens = sum(node.estimate_tokens(item) for item in items)
+                async with limiter.slot(tokens):
+                    results = list(await node.exec_batch_async(items))
+            if len(results) != len(batch):
+                raise ValueError(
+                    f"{node.__class__.__name__}.exec_batch_async() returned "
+                    f"{len(results)} results for {len(batch)} items"
+                )
+        except asyncio.CancelledError:
+            for _, future, _ in batch: future.cancel()
+            raise
+        except Exception as exc:
+            for _, future, _ in batch:
+                if not future.done(): future.set_exception(exc)
+            return
+        exec_ms = (time.perf_counter() - started) * 1000
+        for (_, future, queued), result in zip(batch, results):
+            if not future.done():
+                future.set_result((result, (started - queued) * 1000, exec_ms, len(batch)))
+
+
+class AsyncMicroBatchNode(AsyncNode):
+    """Async node whose exec_async calls are coalesced across concurrent runs
+    
+    Implement exec_batch_async(items) -> list of results (same order). Each
+    run still sees a single-item exec_async, so retries, fallbacks and caching
+    work per item. The run's span gets batch_size, batch_wait_ms (time spent
+    queued) and batch_exec_ms (time of the shared batched call). A rate_limit
+    applies once per batched call.
+    """
+    max_batch_size = 32
+    max_wait_ms = 10
+    
+    def __init__(self, name=None, max_retries=1, wait=0, max_batch_size=None, max_wait_ms=None, **kwargs):
+        super().__init__(name, max_retries, wait, **kwargs)
+        if max_batch_size is not None: self.max_batch_size = max_batch_size
+        if max_wait_ms is not None: self.max_wait_ms = max_wait_ms
+        self._batcher = _MicroBatcher()
+    
+    async def exec_batch_async(self, items):
+        """Override: process a list of prep results, returning one result per item."""
+        raise NotImplementedError(
+            f"{self.__class__.__name__}.exec_batch_async() must be overridden."
+        )
+    
+    async def _limited_exec_async(self, prep_res):
+        # The rate limit applies to the batched call, not to each item
+        return await self.exec_async(prep_res)
+    
+    async def exec_async(self, prep_res):
+        result, wait_ms, exec_ms, size = await self._batcher.submit(self, prep_res)
+        self.annotate(batch_size=size, batch_wait_ms=round(wait_ms, 3), batch_exec_ms=round(exec_ms, 3))
+        return result
+
+
 class AsyncParallelBatchNode(AsyncNode):
-    """Async parallel batch node - concurrent processing"""
+    """Async parallel batch node - concurrent processing
+    
+    With max_concurrency set, at most that many items are in flight and items
+    are pulled lazily from any iterable or async iterable returned by
+    prep_async. ordered=False returns results in completion order.
+    
+    error_policy handles items that still fail after retries and fallback:
+    "fail_fast" (default) cancels the remaining items and raises, "collect"
+    runs every item and raises BatchError with the partial results,
+    "best_effort" runs every item and returns None for failures. Item counts
+    are reported as batch_completed / batch_failed / batch_cancelled.
+    """
+    max_concurrency = None
+    ordered = True
+    error_policy = "fail_fast"
+    
+    def __init__(self, name=None, max_retries=1, wait=0, max_concurrency=None, ordered=None,
+                 error_policy=None, **kwargs):
+        super().__init__(name, max_retries, wait, **kwargs)
+        if max_concurrency is not None: self.max_concurrency = max_concurrency
+        if ordered is not None: self.ordered = ordered
+        if error_policy is not None: self.error_policy = error_policy
+    
+    # No self.cur_retry here: it would race between concurrent items
+    async def _exec_item_attempt_async(self, item, retry):
+        return _checked_async(self, await self._call_exec_async(item))
+    
+    async def _exec_item_async(self, item):
+        return await _run_with_retries_async(self, self._exec_item_attempt_async, item)
+    
     async def _exec_async(self, items):
-        if not items: return []
-        
-        async def process_item(item):
-            for retry in range(self.max_retries):
-                try: 
-                    result = await self.exec_async(item)
-                    # Check for unimplemented exec_async
-                    if result is None and type(self).exec_async is AsyncNode.exec_async:
-                        raise NotImplementedError(
-                            f"{self.__class__.__name__}.exec_async() returned None. "
-                            f"Did you forget to override exec_async()?"
-                        )
-                    return result
-                except Exception as e:
-                    if retry == self.max_retries - 1:
-                        return await self.exec_fallback_async(item, e)
-                    if self.wait > 0: await asyncio.sleep(self.wait)
+        limit = self.max_concurrency
+        if not limit:
+            if hasattr(items, "__aiter__"):
+                items = [item async for item in items]
+            items = list(items or ())
+            if not items: return []
+            limit = len(items)
+        counts = {}
+        try:
+            return await _bounded_map(self._exec_item_async, items, limit, self.ordered,
+                                      self.error_policy, counts)
+        finally:
+            self.annotate(**{f"batch_{k}": v for k, v in counts.items()})
+
+
+_STREAM_END = object()
+
+
+class _StreamFailure:
+    __slots__ = ("exc",)
+    def __init__(self, exc): self.exc = exc
+
+
+class _BoundedStream:
+    """Async iterator fed by a producer task through a bounded queue.
+    
+    The producer starts on the first read and runs at most `maxsize` items
+    ahead of the consumer. Producer errors are re-raised in the consumer.
+    Once the producer stops, or the consumer calls aclose(), the source
+    generator and the `upstream` iterators it read from are closed, so a
+    consumer that stops early releases the whole chain.
+    """
+    def __init__(self, source, maxsize, upstream=()):
+        self._source, self._maxsize, self._upstream = source, maxsize, upstream
+        self._queue, self._task = None, None
+        self._closed = self._released = False
+    
+    def __aiter__(self): return self
+    
+    async def _produce(self):
+        try:
+            async for item in self._source:
+                await self._queue.put(item)
+            await self._queue.put(_STREAM_END)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            await self._queue.put(_StreamFailure(exc))
+        finally:
+            await self._release()
+    
+    async def _release(self):
+        if self._released: return
+        self._released = True
+        for it in (self._source, *self._upstream):
+            aclose = getattr(it, "aclose", None)
+            if aclose is None: continue
+            try: await aclose()
+            except Exception as exc: warnings.warn(f"Closing stream source failed: {exc!r}")
+    
+    async def __anext__(self):
+        if self._closed: raise StopAsyncIteration
+        if self._task is None:
+            self._queue = asyncio.Queue(self._maxsize)
+            self._task = asyncio.ensure_future(self._produce())
+        item = await self._queue.get()
+        if item is _STREAM_END:
+            self._queue.put_nowait(_STREAM_END)  # stay exhausted
+            raise StopAsyncIteration
+        if isinstance(item, _StreamFailure): raise item.exc
+        return item
+    
+    async def aclose(self):
+        """Stop reading: cancel the producer and close the source and upstream."""
+        self._closed = True
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            await asyncio.wait([self._task])
+        await self._release()
+    
+    async def __aenter__(self): return self
+    
+    async def __aexit__(self, *exc_info): await self.aclose()
+
+
+class AsyncStreamNode(AsyncNode):
+    """Streaming async node: exec_async is an async generator over chunks.
+    
+    prep_async returns an iterable or async iterable (by default
+    shared[input_key], e.g. the stream of an upstream AsyncStreamNode) and
+    exec_async receives it as an async iterator and yields output chunks:
+    
+        class EmbedChunks(AsyncStreamNode):
+            input_key, output_key = "chunks", "vectors"
+            async def exec_async(self, chunks):
+                async for chunk in chunks:
+                    yield await embed(chunk)
+    
+    The node never materializes its output. post_async gets a bounded
+    stream whose producer starts when a downstream node begins reading and
+    runs at most buffer_size chunks ahead, so every stage of a chain runs
+    concurrently with O(buffer_size) memory. By default post_async stores
+    the stream in shared[output_key], or drains it when there is no
+    output_key (the sink of a chain). Producer errors surface in whichever
+    node consumes the stream; retries don't apply since streams can't be
+    replayed. A stage that stops reading early (e.g. ``break``) closes its
+    input stream, cancelling upstream producers and closing their generators;
+    other consumers of a stream should ``await stream.aclose()`` (or use
+    ``async with stream``) when they stop early.
+    """
+    buffer_size = 64
+    input_key = None
+    output_key = None
+    
+    def __init__(self, name=None, buffer_size=None, input_key=None, output_key=None, **kwargs):
+        super().__init__(name, **kwargs)
+        if buffer_size is not None: self.buffer_size = buffer_size
+        if input_key is not None: self.input_key = input_key
+        if output_key is not None: self.output_key = output_key
+    
+    async def prep_async(self, shared):
+        return shared.get(self.input_key) if self.input_key is not None else None
+    
+    async def _exec_async(self, prep_res):
+        items = _aiter_items(prep_res)
+        out = self.exec_async(items)
+        if asyncio.iscoroutine(out): out = await out
+        # Closing this node's stream also closes the stream it reads from
+        return _BoundedStream(out, self.buffer_size, upstream=(items, prep_res))
+    
+    async def post_async(self, shared, prep_res, exec_res):
+        if self.output_key is not None:
+            shared[self.output_key] = exec_res
+        else:
+            async with exec_res:
+                async for _ in exec_res: pass
+
+
+# Semaphore capping the nodes fan-out branches run at once, one per flow run
+_branch_limit = contextvars.ContextVar("agora_branch_limit", default=None)
+# The limiter whose permit the calling branch holds while its node runs
+_branch_permit = contextvars.ContextVar("agora_branch_permit", default=None)
+
+
+class JoinConflictError(RuntimeError):
+    """Two fan-out branches wrote different values to the same shared key."""
+    def __init__(self, conflicts):
+        self.conflicts = conflicts  # key -> list of branch indexes
+        details = ", ".join(f"'{k}' (branches {v})" for k, v in conflicts.items())
+        super().__init__(f"Conflicting branch writes to shared: {details}")
+
+
+def _same_value(a, b):
+    if a is b: return True
+    try: return bool(a == b)
+    except Exception: return False
+
+
+def merge_branches(shared, branches):
+    """Merge branch overlays into shared, raising JoinConflictError on conflicts.
+    
+    Writes of equal values to the same key by several branches are fine.
+    Different values, or a write racing a delete, are conflicts.
+    """
+    values, writers, conflicts = {}, {}, {}
+    for index, state in enumerate(branches):
+        written, deleted = state.changes()
+        for key, value in list(written.items()) + [(k, _DELETED) for k in deleted]:
+            if key in values and not _same_value(values[key], value):
+                conflicts[key] = writers[key] + [index]
+            values[key] = value
+            writers.setdefault(key, []).append(index)
+    if conflicts: raise JoinConflictError(conflicts)
+    for key, value in values.items():
+        if value is _DELETED: shared.pop(key, None)
+        else: shared[key] = value
+
+
+class AsyncJoinNode(AsyncNode):
+    """Fan-in point for parallel branches created with ``node >> [a, b, c]``.
+    
+    Branches stop when they reach the join. Their writes to shared are merged
+    by merge() before the join itself runs; override merge() to combine
+    branch outputs differently. The default exec_async passes prep_res through.
+    """
+    
+    def merge(self, shared, branches):
+        merge_branches(shared, branches)
+    
+    async def exec_async(self, prep_res): return prep_res
+
+
+class AsyncFanOut:
+    """Pseudo-node that runs several branches concurrently (``node >> [a, b]``).
+    
+    Each branch runs on its own SharedOverlay of shared until it reaches
+    this fan-out's join (see ``join``) or ends; fan-outs nested in a branch
+    run their own join and the branch carries on after it. The enclosing
+    flow's max_concurrency caps how many branch nodes run at once across
+    all of its fan-outs, nested ones included; a branch holds its permit
+    only while a node runs, not while it waits on a nested fan-out. The
+    overlays are then merged into shared and the flow continues at the
+    join. ``fan_out >> join`` links every branch tail to the join.
+    """
+    
+    def __init__(self, branches, name=None):
+        self.branches = list(branches)
+        self.name = name or f"fanout_{'_'.join(b.name for b in self.branches)}"
+        self.params, self.context = {}, None
+    
+    def set_params(self, params): self.params = params
+    
+    @property
+    def successors(self):
+        join = self.join
+        return {"default": join} if join is not None else {}
+    
+    @property
+    def join(self):
+        """The first AsyncJoinNode reachable from the branches, if any.
         
-        return await asyncio.gather(*[process_item(item) for item in items])
+        Joins of fan-outs nested inside a branch belong to those fan-outs
+        and are skipped.
+        """
+        seen, pending = set(), list(self.branches)
+        while pending:
+            node = pending.pop(0)
+            if id(node) in seen: continue
+            seen.add(id(node))
+            if isinstance(node, AsyncJoinNode): return node
+            if isinstance(node, AsyncFanOut):
+                inner = node.join
+                if inner is None: continue
+                seen.add(id(inner))
+                node = inner
+            pending.extend(node.successors.values())
+        return None
+    
+    def next(self, node, action="default"):
+        for branch in self.branches:
+            tail = branch
+            while tail.successors.get("default") is not None and tail.successors["default"] is not node:
+                tail = tail.successors["default"]
+            if tail is not node and tail.successors.get(action) is not node:
+                tail.next(node, action)
+        return node
+    
+    def __rshift__(self, other): return self.next(other)
+    
+    async def _run_branch(self, start, shared, join, limit):
+        # A nested fan-out continues at its own join; stop only at ours
+        curr, last_action = start, None
+        while curr is not None and curr is not join:
+            node = copy.copy(curr)
+            node.context = self.context
+            node.set_params(self.params)
+            if limit is None or isinstance(node, AsyncFanOut):
+                last_action = await node._run_async(shared)
+            else:
+                async with limit:
+                    token = _branch_permit.set(limit)
+                    try: last_action = await node._run_async(shared)
+                    finally: _branch_permit.reset(token)
+            curr = curr.successors.get(last_action or "default")
+        return last_action
+    
+    async def _run_async(self, shared):
+        states = [SharedOverlay(shared) for _ in self.branches]
+        limit, join = _branch_limit.get(), self.join
+        # Fanning out from inside a branch's node (e.g. a sub-flow): give the
+        # permit back while waiting, so nested branches can't deadlock on it
+        held = limit is not None and _branch_permit.get() is limit
+        if held: limit.release()
+        token = _branch_permit.set(None)
+        try:
+            await asyncio.gather(*[self._run_branch(b, st, join, limit)
+                                   for b, st in zip(self.branches, states)])
+        finally:
+            _branch_permit.reset(token)
+            if held: await limit.acquire()
+        if join is not None: join.merge(shared, states)
+        else: merge_branches(shared, states)
+        return "default"
+    
+    async def on_error_async(self, exc, shared): raise exc
 
 
 class AsyncFlow:
-    """Async version of Flow with full Agora features"""
+    """Async version of Flow with full Agora features
     
-    def __init__(self, name=None, start=None):
+    max_concurrency caps how many fan-out branch nodes run at once. deadline
+    (seconds) bounds each orchestration: nodes and sub-flows see the
+    remaining time, and whatever is still running when it passes is
+    cancelled with DeadlineExceeded. With a
+    checkpoint_store (see agora.checkpoint) every completed node is
+    checkpointed under self.execution_id and resume(execution_id) continues
+    an interrupted run; checkpointing assumes one run per flow instance at a
+    time. Batch flows checkpoint each finished item rather than the nodes of
+    the per-item runs.
+    """
+    max_concurrency = None
+    deadline = None
+    checkpoint_store = None
+    execution_id = None
+    _resume_point = None
+    trace_attributes = {}
+    
+    def __init__(self, name=None, start=None, max_concurrency=None, deadline=None):
         self.params, self.successors = {}, {}
         self.name = name or f"{self.__class__.__name__}_{id(self)}"
         self.context = None
         self.start_node = start
+        self._plan = None
+        if max_concurrency is not None: self.max_concurrency = max_concurrency
+        if deadline is not None: self.deadline = deadline
     
-    def start(self, start): self.start_node = start; return start
+    def start(self, start): self.start_node, self._plan = start, None; return start
+    
+    def compile(self):
+        """Freeze the graph into a transition table (see Flow.compile). Returns self."""
+        self._plan = _FlowPlan(self.start_node) if self.start_node else None
+        if self._plan: _compile_subflows(self._plan)
+        return self
     def set_params(self, params): self.params = params
     
+    def annotate(self, **attributes):
+        """Attach attributes to the tracing span / audit record of the current run."""
+        self.trace_attributes = {**self.trace_attributes, **attributes}
+    
     def get_next_node(self, curr, action):
         nxt = curr.successors.get(action or "default")
         if not nxt and curr.successors:
@@ -340,6 +1431,31 @@ class AsyncFlow:
     async def on_error_async(self, exc, shared): raise exc
     
     async def _orch_async(self, shared, params=None):
+        if self.max_concurrency is None and self.deadline is None:
+            return await self._orch_steps_async(shared, params)
+        limit_token = deadline_token = None
+        if self.max_concurrency is not None:
+            limit_token = _branch_limit.set(asyncio.Semaphore(self.max_concurrency))
+        try:
+            if self.deadline is None:
+                return await self._orch_steps_async(shared, params)
+            inherited = _deadline.get()
+            deadline = time.monotonic() + self.deadline
+            deadline_token = _deadline.set(deadline if inherited is None else min(inherited, deadline))
+            return await _bounded(self._orch_steps_async(shared, params), _time_left())
+        finally:
+            if deadline_token is not None: _deadline.reset(deadline_token)
+            if limit_token is not None: _branch_limit.reset(limit_token)
+    
+    async def _orch_steps_async(self, shared, params=None):
+        if self.checkpoint_store is not None and self.execution_id is not None:
+            return await self._orch_checkpointed_async(shared, params)
+        return await self._orch_nodes_async(shared, params)
+    
+    async def _orch_nodes_async(self, shared, params=None):
+        """One pass over the graph without checkpoints (also each batch item's run)."""
+        if self._plan is not None:
+            return await self._orch_compiled_async(shared, params)
         curr = copy.copy(self.start_node)
         p = params or {**self.params}
         last_action = None
@@ -350,6 +1466,43 @@ class AsyncFlow:
             curr = copy.copy(self.get_next_node(curr, last_action))
         return last_action
     
+    async def _orch_compiled_async(self, shared, params=None):
+        plan = self._plan
+        nodes = plan.instantiate(self.context, params or {**self.params})
+        table, action_ids, node_ids = plan.table, plan.action_ids, plan.node_ids
+        # Subclasses that hook get_next_node (e.g. to audit transitions) keep it
+        hooked = type(self).get_next_node is not AsyncFlow.get_next_node
+        i, last_action = 0, None
+        while i >= 0:
+            curr = plan.visit(nodes, i)
+            last_action = await curr._run_async(shared)
+            if hooked:
+                nxt = self.get_next_node(curr, last_action)
+                i = node_ids[id(nxt)] if nxt is not None else -1
+                continue
+            a = action_ids.get(last_action or "default")
+            i = table[i][a] if a is not None else -1
+            if i < 0 and curr.successors:
+                warnings.warn(f"Flow ends: '{last_action}' not found in {list(curr.successors)}")
+        return last_action
+    
+    async def _orch_checkpointed_async(self, shared, params=None):
+        plan = self._plan or _FlowPlan(self.start_node)
+        i, step = 0, 0
+        if self._resume_point is not None:
+            (i, step), self._resume_point = self._resume_point, None
+        ckpt = Checkpointer(self.checkpoint_store, self.execution_id, shared if step else None, step)
+        nodes = plan.instantiate(self.context, params or {**self.params})
+        last_action = None
+        while i >= 0:
+            curr = plan.visit(nodes, i)
+            last_action = await curr._run_async(shared)
+            nxt = self.get_next_node(curr, last_action)
+            next_id = plan.node_ids[id(nxt)] if nxt is not None else -1
+            ckpt.record(i, curr.name, last_action, next_id, shared)
+            i = next_id
+        return last_action
+    
     async def _run_async(self, shared):
         await self.before_run_async(shared)
         try:
@@ -365,6 +1518,26 @@ class AsyncFlow:
         self.context = context
         if self.successors:
             warnings.warn("Node won't run successors. Use AsyncFlow.")
+        if self.checkpoint_store is not None:
+            self.execution_id = new_execution_id()
+        return await self._run_async(shared)
+    
+    async def resume(self, execution_id, shared=None, context=None):
+        """Continue a checkpointed run after its last completed node.
+        
+        shared is rebuilt from the checkpoints; pass a dict to supply values
+        that couldn't be persisted (clients, spans). A run that had already
+        finished returns its last action without running anything.
+        """
+        if self.checkpoint_store is None:
+            raise ValueError("resume() needs a checkpoint_store")
+        saved, last = restore(self.checkpoint_store, execution_id)
+        if last is not None and last["next_id"] < 0:
+            return last["action"]
+        shared = {} if shared is None else shared
+        shared.update(saved)
+        self.context, self.execution_id = context, execution_id
+        if last is not None: self._resume_point = (last["next_id"], last["step"] + 1)
         return await self._run_async(shared)
     
     def to_dict(self):
@@ -378,6 +1551,11 @@ class AsyncFlow:
                 "code": getattr(node, 'code', None)
             })
             for action, next_node in node.successors.items():
+                if isinstance(next_node, AsyncFanOut):
+                    for branch in next_node.branches:
+                        edges.append({"from": node.name, "to": branch.name, "action": action, "parallel": True})
+                        walk(branch)
+                    continue
                 edges.append({"from": node.name, "to": next_node.name, "action": action})
                 walk(next_node)
         if self.start_node: walk(self.start_node)
@@ -388,32 +1566,138 @@ class AsyncFlow:
         lines = ["graph TD"]
         for edge in graph["edges"]:
             action_label = f"|{edge['action']}|" if edge['action'] != 'default' else ''
-            lines.append(f"    {edge['from']} -->{action_label} {edge['to']}")
+            arrow = "==>" if edge.get("parallel") else "-->"
+            lines.append(f"    {edge['from']} {arrow}{action_label} {edge['to']}")
         return "\n".join(lines)
 
 
+_BATCH_ITEM_KEY = "_agora_batch_item_{}"
+
+
+class _BatchCheckpoint:
+    """Item-level checkpoints for one run of a batch flow.
+    
+    Each finished item is recorded with its result and its SharedOverlay
+    changes under a private key, so a resumed run skips it and still merges
+    its writes. A last record with next_id -1 marks the batch as finished.
+    """
+    def __init__(self, flow, shared, count):
+        self.shared, self.count, self.state, self.done = shared, count, {}, {}
+        self.pending, step = 0, 0
+        if flow._resume_point is not None:
+            (_, step), flow._resume_point = flow._resume_point, None
+            for index in range(count):
+                key = _BATCH_ITEM_KEY.format(index)
+                if key in shared: self.state[key] = self.done[index] = shared.pop(key)
+        self.ckpt = Checkpointer(flow.checkpoint_store, flow.execution_id,
+                                 self.snapshot() if step else None, step)
+    
+    def snapshot(self): return {**self.shared, **self.state}
+    
+    def overlay(self, index, item):
+        """The item's SharedOverlay, with its writes if it finished before a resume."""
+        local = {"item": item}
+        if index in self.done:
+            _, written, deleted = self.done[index]
+            local.update(written)
+            local.update(dict.fromkeys(deleted, _DELETED))
+        return SharedOverlay(self.shared, local)
+    
+    def record(self, index, result, item_shared):
+        written, deleted = item_shared.changes()
+        self.state[_BATCH_ITEM_KEY.format(index)] = self.done[index] = (result, written, deleted)
+        while self.pending in self.done: self.pending += 1
+        self.ckpt.record(index, f"item {index}", None, self.pending, self.snapshot())
+    
+    def finish(self):
+        self.ckpt.record(self.count, "batch", None, -1, self.snapshot())
+
+
+def _batch_checkpoint(flow, shared, count):
+    """A _BatchCheckpoint when flow is being checkpointed, else None."""
+    if flow.checkpoint_store is None or flow.execution_id is None: return None
+    return _BatchCheckpoint(flow, shared, count)
+
+
 class AsyncBatchFlow(AsyncFlow):
-    """Async batch flow - sequential sub-flow execution"""
-    async def _orch_async(self, shared, params=None):
-        items = params or shared.get("items", [])
-        results = []
-        for item in items:
-            item_shared = {"item": item, **shared}
-            result = await super()._orch_async(item_shared, params)
+    """Async batch flow - sequential sub-flow execution
+    
+    Each item runs against a SharedOverlay of shared, so shared is never
+    copied and per-item writes stay local. With merge_shared = True the
+    writes are merged back into shared in item order once all items finish.
+    With a checkpoint_store, resume() skips the items that had finished.
+    """
+    merge_shared = False
+    
+    async def _orch_steps_async(self, shared, params=None):
+        items = list(params or shared.get("items", []))
+        ckpt = _batch_checkpoint(self, shared, len(items))
+        results, overlays = [], []
+        for index, item in enumerate(items):
+            if ckpt is None:
+                item_shared = SharedOverlay(shared, {"item": item})
+                result = await super()._orch_nodes_async(item_shared, params)
+            elif index in ckpt.done:
+                item_shared, result = ckpt.overlay(index, item), ckpt.done[index][0]
+            else:
+                item_shared = ckpt.overlay(index, item)
+                result = await super()._orch_nodes_async(item_shared, params)
+                ckpt.record(index, result, item_shared)
             results.append(result)
+            overlays.append(item_shared)
+        if self.merge_shared:
+            for item_shared in overlays: item_shared.merge(exclude=("item",))
         shared["batch_results"] = results
+        if ckpt is not None: ckpt.finish()
         return results
 
 
 class AsyncParallelBatchFlow(AsyncFlow):
-    """Async parallel batch flow - concurrent sub-flow execution"""
-    async def _orch_async(self, shared, params=None):
-        items = params or shared.get("items", [])
-        async def process_item(item):
-            item_shared = {"item": item, **shared}
-            return await super(AsyncParallelBatchFlow, self)._orch_async(item_shared, params)
-        results = await asyncio.gather(*[process_item(item) for item in items])
+    """Async parallel batch flow - concurrent sub-flow execution
+    
+    Items share state through SharedOverlay as in AsyncBatchFlow; merging
+    (merge_shared = True) happens in item order, not completion order.
+    
+    error_policy works as on AsyncParallelBatchNode. Failed items are not
+    merged; under "collect" and "best_effort" their exceptions are stored in
+    shared["batch_errors"] by item index. With a checkpoint_store, resume()
+    reruns only the items that hadn't finished (including failed ones).
+    """
+    merge_shared = False
+    error_policy = "fail_fast"
+    
+    async def _orch_steps_async(self, shared, params=None):
+        items = list(params or shared.get("items", []))
+        ckpt = _batch_checkpoint(self, shared, len(items))
+        if ckpt is None: overlays = [SharedOverlay(shared, {"item": item}) for item in items]
+        else: overlays = [ckpt.overlay(index, item) for index, item in enumerate(items)]
+        if not overlays:
+            shared["batch_results"] = []
+            return []
+        errors, counts = {}, {}
+        async def process_item(index):
+            if ckpt is not None and index in ckpt.done: return ckpt.done[index][0]
+            try:
+                result = await super(AsyncParallelBatchFlow, self)._orch_nodes_async(overlays[index], params)
+            except Exception as exc:
+                errors[index] = exc
+                raise
+            if ckpt is not None: ckpt.record(index, result, overlays[index])
+            return result
+        try:
+            results = await _bounded_map(process_item, range(len(overlays)), len(overlays), True,
+                                         self.error_policy, counts)
+        except BatchError as exc:
+            shared["batch_results"], shared["batch_errors"] = exc.results, exc.errors
+            raise
+        finally:
+            self.annotate(**{f"batch_{k}": v for k, v in counts.items()})
+        if self.merge_shared:
+            for index, item_shared in enumerate(overlays):
+                if index not in errors: item_shared.merge(exclude=("item",))
+        if errors: shared["batch_errors"] = errors
         shared["batch_results"] = results
+        if ckpt is not None: ckpt.finish()
         return results
 
 
@@ -423,8 +1707,16 @@ class AsyncParallelBatchFlow(AsyncFlow):
 
 __all__ = [
     # Sync classes
-    'BaseNode', 'Node', 'BatchNode', 'Flow',
+    'BaseNode', 'Node', 'BatchNode', 'ProcessPoolBatchNode', 'Flow',
+    'ParallelBatchNode', 'ParallelBatchFlow', 'configure_thread_pool',
     # Async classes  
-    'AsyncNode', 'AsyncFlow', 'AsyncBatchNode', 'AsyncParallelBatchNode',
-    'AsyncBatchFlow', 'AsyncParallelBatchFlow'
+    'AsyncNode', 'AsyncFlow', 'AsyncBatchNode', 'AsyncParallelBatchNode', 'AsyncStreamNode',
+    'AsyncProcessPoolBatchNode', 'AsyncMicroBatchNode', 'AsyncJoinNode', 'AsyncFanOut',
+    'JoinConflictError', 'merge_branches', 'DeadlineExceeded', 'HedgePolicy', 'BatchError',
+    'RetryPolicy',
+    'AsyncBatchFlow', 'AsyncParallelBatchFlow',
+    # Shared state
+    'SharedOverlay',
+    # Source capture
+    'get_source', 'set_source_capture'
 ]
@@ -20,7 +20,9 @@ from opentelemetry import trace
 from opentelemetry.sdk.trace.export import ConsoleSpanExporter, SimpleSpanProcessor
 from traceloop.sdk import Traceloop
 from agora import AsyncNode, AsyncFlow, AsyncBatchNode, AsyncParallelBatchNode
-import os, time, asyncio, inspect, functools
+from agora import _run_with_retries_async
+from agora.clock import ClockAnchor, elapsed_ms, now_ns
+import os, asyncio, inspect, functools
 from datetime import datetime
 from typing import Optional, Sequence, Any, List, Dict
 import json
@@ -232,21 +234,15 @@ def agora_node(name=None, max_retries=1, wait=0, capture_io=None):
         # Determine capture_io setting
         should_capture_io = capture_io if capture_io is not None else _capture_io_default
 
-        # Capture the original function's source code
-        try:
-            actual_code = inspect.getsource(func)
-            print(f"DEBUG: Captured code for '{node_name}' ({len(actual_code) if actual_code else 0} chars)")
-        except Exception as e:
-            print(f"DEBUG: Failed to capture code for '{node_name}': {e}")
-            actual_code = None
-
         # Create a custom node class dynamically
         class DecoratedNode(TracedAsyncNode):
+            # Report the original function's source, captured lazily on first use
+            _source_obj = func
+
             def __init__(self):
                 super().__init__(node_name, max_retries=max_retries, wait=wait)
                 self._wrapped_func = func
                 self._capture_io = should_capture_io
-                self.code = actual_code
 
             async def exec_async(self, prep_res):
                 """
@@ -303,10 +299,10 @@ class TracedAsyncNode(AsyncNode):
         with trace.get_tracer("agora_tracer").start_as_current_span(f"{self.name}.prep") as span:
             span.set_attribute("agora.node", self.name)
             span.set_attribute("agora.phase", "prep")
-            start = time.time()
+            start = now_ns()
             try:
                 result = await self.prep_async(shared)
-                span.set_attribute("duration_ms", int((time.time() - start) * 1000))
+                span.set_attribute("duration_ms", int(elapsed_ms(start)))
                 return result
             except Exception as e:
                 span.record_exception(e)
@@ -317,7 +313,7 @@ class TracedAsyncNode(AsyncNode):
             span.set_attribute("agora.node", self.name)
             span.set_attribute("agora.phase", "exec")
             span.set_attribute("retry_count", retry_count)
-            start = time.time()
+            start = now_ns()
             
             # Capture input if enabled
             if getattr(self, '_capture_io', _capture_io_default):
@@ -329,8 +325,11 @@ class TracedAsyncNode(AsyncNode):
                     span.set_attribute("input", str(prep_res)[:1000])
             
             try:
-                result = await self.exec_async(prep_res)
-                span.set_attribute("duration_ms", int((time.time() - start) * 1000))
+                result = await self._call_exec_async(prep_res)
+                span.set_attribute("duration_ms", int(elapsed_ms(start)))
+                for key in ("rate_limit_wait_ms", "hedge_fired", "hedge_winner"):
+                    if self.trace_attributes.get(key) is not None:
+                        span.set_attribute(key, self.trace_attributes[key])
                 
                 # Capture output if enabled
                 if getattr(self, '_capture_io', _capture_io_default):
@@ -350,10 +349,10 @@ class TracedAsyncNode(AsyncNode):
         with trace.get_tracer("agora_tracer").start_as_current_span(f"{self.name}.post") as span:
             span.set_attribute("agora.node", self.name)
             span.set_attribute("agora.phase", "post")
-            start = time.time()
+            start = now_ns()
             try:
                 result = await self.post_async(shared, prep_res, exec_res)
-                span.set_attribute("duration_ms", int((time.time() - start) * 1000))
+                span.set_attribute("duration_ms", int(elapsed_ms(start)))
                 span.set_attribute("next_action", str(result))
                 return result
             except Exception as e:
@@ -361,14 +360,7 @@ class TracedAsyncNode(AsyncNode):
                 raise
 
     async def _exec_async(self, prep_res):
-        for retry in range(self.max_retries):
-            try:
-                return await self._traced_exec(prep_res, retry)
-            except Exception as e:
-                if retry == self.max_retries - 1:
-                    return await self.exec_fallback_async(prep_res, e)
-                if self.wait > 0:
-                    await asyncio.sleep(self.wait)
+        return await _run_with_retries_async(self, self._traced_exec, prep_res)
 
     async def _run_async(self, shared):
         global cloud_uploader
@@ -389,16 +381,17 @@ class TracedAsyncNode(AsyncNode):
         with trace.get_tracer("agora_tracer").start_as_current_span(f"{self.name}.node") as span:
             span.set_attribute("agora.node", self.name)
             span.set_attribute("agora.kind", "node")
-            node_start = time.time()
-            started_at = datetime.utcnow()
+            # Wall clock read per run, so upload timestamps don't drift from it
+            anchor = ClockAnchor()
+            node_start = anchor.perf_ns
             await self.before_run_async(shared)
             try:
                 prep_res = await self._traced_prep(shared)
                 exec_res = await self._exec_async(prep_res)
                 post_res = await self._traced_post(shared, prep_res, exec_res)
                 await self.after_run_async(shared)
-                completed_at = datetime.utcnow()
-                total_duration = int((time.time() - node_start) * 1000)
+                node_end = now_ns()
+                total_duration = int(elapsed_ms(node_start, node_end))
                 span.set_attribute("total_duration_ms", total_duration)
 
                 if cloud_uploader and cloud_uploader.enabled and cloud_uploader.execution_id:
@@ -406,8 +399,8 @@ class TracedAsyncNode(AsyncNode):
                         node_name=self.name,
                         node_type="async_node",
                         status="success",
-                        started_at=started_at,
-                        completed_at=completed_at,
+                        started_at=anchor.utc_datetime(node_start),
+                        completed_at=anchor.utc_datetime(node_end),
                         exec_duration_ms=int(total_duration),
                         code=getattr(self, 'code', None)
                     )
@@ -415,15 +408,15 @@ class TracedAsyncNode(AsyncNode):
                 return post_res
             except Exception as exc:
                 span.record_exception(exc)
-                completed_at = datetime.utcnow()
+                node_end = now_ns()
 
                 if cloud_uploader and cloud_uploader.enabled and cloud_uploader.execution_id:
                     await cloud_uploader.add_node_execution(
                         node_name=self.name,
                         node_type="async_node",
                         status="error",
-                        started_at=started_at,
-                        completed_at=completed_at,
+                        started_at=anchor.utc_datetime(node_start),
+                        completed_at=anchor.utc_datetime(node_end),
                         error_message=str(exc),
                         code=getattr(self, 'code', None)
                     )
@@ -464,14 +457,14 @@ class TracedAsyncFlow(AsyncFlow):
             span.set_attribute("agora.flow", self.name)
             if execution_id:
                 span.set_attribute("execution_id", str(execution_id))
-            flow_start = time.time()
+            flow_start = now_ns()
             await self.before_run_async(shared)
             try:
                 prep_res = await self.prep_async(shared)
                 orch_res = await self._orch_async(shared)
                 post_res = await self.post_async(shared, prep_res, orch_res)
                 await self.after_run_async(shared)
-                total_duration = int((time.time() - flow_start) * 1000)
+                total_duration = int(elapsed_ms(flow_start))
                 span.set_attribute("total_duration_ms", total_duration)
 
                 if cloud_uploader and cloud_uploader.enabled:
@@ -0,0 +1,298 @@
+"""Node result caching for Agora workflows.
+
+Nodes that are pure functions of their prep result can opt into caching
+with ``@cached`` or ``cache=``. Results are keyed on a stable hash of the
+prep result plus the node's code hash, so editing a node invalidates its
+entries. Backends: in-memory LRU, LRU with TTL, and on-disk SQLite.
+"""
+
+import hashlib
+import pickle
+import sqlite3
+import threading
+import time
+import warnings
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+def _encode(obj: Any) -> bytes:
+    """Canonical, type-tagged encoding of obj (see stable_hash)."""
+    if obj is None:
+        return b"N"
+    if obj is True or obj is False:
+        return b"T" if obj else b"F"
+    kind = type(obj)
+    if kind is int:
+        return b"i%d;" % obj
+    if kind is float:
+        return b"f" + obj.hex().encode("ascii") + b";"
+    if kind is str:
+        data = obj.encode("utf-8", "surrogatepass")
+        return b"s%d:" % len(data) + data
+    if kind in (bytes, bytearray):
+        return b"b%d:" % len(obj) + bytes(obj)
+    if kind in (list, tuple):
+        return b"%s%d[" % (b"l" if kind is list else b"t", len(obj)) + b"".join(
+            _encode(item) for item in obj
+        ) + b"]"
+    if kind is dict:
+        items = sorted(_encode(k) + _encode(v) for k, v in obj.items())
+        return b"d%d{" % len(items) + b"".join(items) + b"}"
+    if kind in (set, frozenset):
+        members = sorted(_encode(item) for item in obj)
+        return b"%s%d{" % (b"S" if kind is set else b"z", len(members)) + b"".join(members) + b"}"
+    # Anything else (dataclasses, models, ...) by type and pickle
+    name = f"{kind.__module__}.{kind.__qualname__}".encode("utf-8")
+    data = pickle.dumps(obj, protocol=4)
+    return b"o%d:" % len(name) + name + b"%d:" % len(data) + data
+
+
+def stable_hash(obj: Any) -> Optional[str]:
+    """Return a stable sha256 hex digest of obj, or None if it can't be hashed.
+
+    Built-in values (None, bool, int, float, str, bytes, list, tuple, dict,
+    set, frozenset) are hashed from a canonical encoding tagged with their
+    type: the digest doesn't depend on PYTHONHASHSEED or insertion order,
+    and ``(1, 2)`` / ``[1, 2]`` or ``{1: "x"}`` / ``{"1": "x"}`` differ.
+    Other objects are hashed from their type name and pickle.
+    """
+    try:
+        data = _encode(obj)
+    except Exception:  # unpicklable, self-referencing, ...
+        return None
+    return hashlib.sha256(data).hexdigest()
+
+
+_warned_no_code_hash: set = set()
+
+
+def _code_hash(node: Any) -> Optional[str]:
+    """The node's code hash, read even when source capture is disabled."""
+    code_hash = getattr(node, "code_hash", None)
+    if code_hash is None and hasattr(node, "_source_obj"):
+        from . import get_source
+
+        code_hash = get_source(node._source_obj or type(node), force=True)[1]
+    return code_hash
+
+
+def cache_key(node: Any, prep_res: Any) -> Optional[str]:
+    """Build the cache key for running node on prep_res (None if uncacheable).
+
+    Persistent backends need the node's code hash so that editing the node
+    invalidates its entries; without one (source unavailable) the node's
+    results are not cached there, and a warning is issued once per class.
+    """
+    digest = stable_hash(prep_res)
+    if digest is None:
+        return None
+    cls = type(node)
+    code_hash = _code_hash(node)
+    if code_hash is None and getattr(getattr(node, "cache", None), "persistent", False):
+        if cls not in _warned_no_code_hash:
+            _warned_no_code_hash.add(cls)
+            warnings.warn(
+                f"{cls.__qualname__}: source unavailable, so results are not "
+                f"cached on disk (they couldn't be invalidated when the node changes)"
+            )
+        return None
+    return f"{cls.__module__}.{cls.__qualname__}:{code_hash or ''}:{digest}"
+
+
+class CacheBackend:
+    """Base class for node result caches.
+
+    Subclasses implement ``_get`` and ``_set``; hit/miss counters are kept
+    here so every backend reports them the same way. Backends that outlive
+    the process set ``persistent``.
+    """
+
+    persistent = False
+
+    def __init__(self):
+        """Initialize hit/miss counters."""
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Look up key.
+
+        Returns:
+            Tuple of (found, value).
+        """
+        found, value = self._get(key)
+        if found:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return found, value
+
+    def set(self, key: str, value: Any) -> None:
+        """Store value under key."""
+        self._set(key, value)
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters."""
+        return {"hits": self.hits, "misses": self.misses}
+
+    def _get(self, key: str) -> Tuple[bool, Any]:
+        raise NotImplementedError
+
+    def _set(self, key: str, value: Any) -> None:
+        raise NotImplementedError
+
+
+class LRUCache(CacheBackend):
+    """Thread-safe in-memory LRU cache with optional per-entry TTL."""
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None):
+        """Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of entries before evicting the least recently used.
+            ttl: Optional time-to-live in seconds for each entry.
+        """
+        super().__init__()
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[str, Tuple[Optional[float], Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, key: str) -> Tuple[bool, Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return False, None
+            expires, value = entry
+            if expires is not None and expires < time.monotonic():
+                del self._data[key]
+                return False, None
+            self._data.move_to_end(key)
+            return True, value
+
+    def _set(self, key: str, value: Any) -> None:
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class TTLCache(LRUCache):
+    """In-memory cache whose entries expire after ttl seconds."""
+
+    def __init__(self, ttl: float, maxsize: int = 1024):
+        """Initialize the cache.
+
+        Args:
+            ttl: Time-to-live in seconds for each entry.
+            maxsize: Maximum number of entries.
+        """
+        super().__init__(maxsize=maxsize, ttl=ttl)
+
+
+class SQLiteCache(CacheBackend):
+    """On-disk cache in a SQLite file; values are pickled.
+
+    Survives restarts, so replays of a flow reuse earlier results.
+    """
+
+    persistent = True
+
+    def __init__(self, path: str = "agora_cache.sqlite", ttl: Optional[float] = None):
+        """Initialize the cache.
+
+        Args:
+            path: SQLite database file (":memory:" for a private in-memory db).
+            ttl: Optional time-to-live in seconds for each entry.
+        """
+        super().__init__()
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS agora_cache "
+                "(key TEXT PRIMARY KEY, value BLOB, expires REAL)"
+            )
+
+    def _get(self, key: str) -> Tuple[bool, Any]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires FROM agora_cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or (row[1] is not None and row[1] < time.time()):
+            return False, None
+        return True, pickle.loads(row[0])
+
+    def _set(self, key: str, value: Any) -> None:
+        try:
+            blob = pickle.dumps(value, protocol=4)
+        except Exception:
+            return  # unpicklable results are simply not cached
+        expires = time.time() + self.ttl if self.ttl is not None else None
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO agora_cache (key, value, expires) VALUES (?, ?, ?)",
+                (key, sqlite3.Binary(blob), expires),
+            )
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM agora_cache")
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+
+def cached(backend: Optional[CacheBackend] = None):
+    """Class decorator that enables result caching on a Node or AsyncNode.
+
+    Usage:
+        @cached
+        class Embed(AsyncNode): ...
+
+        @cached(SQLiteCache("embeddings.sqlite"))
+        class Embed(AsyncNode): ...
+
+    Args:
+        backend: Cache backend (defaults to a new LRUCache per class).
+
+    Returns:
+        The decorator, or the decorated class when used without arguments.
+    """
+    if isinstance(backend, type):
+        node_class, backend = backend, None
+        node_class.cache = LRUCache()
+        return node_class
+
+    def decorator(cls):
+        cls.cache = backend if backend is not None else LRUCache()
+        return cls
+
+    return decorator
+
+
+def _cache_lookup(node: Any, prep_res: Any) -> Tuple[Optional[str], bool, Any]:
+    """Look prep_res up in node.cache and count the outcome on the node's span."""
+    key = cache_key(node, prep_res)
+    if key is None:
+        return None, False, None
+    found, value = node.cache.get(key)
+    attrs = node.trace_attributes
+    counter = "cache_hits" if found else "cache_misses"
+    node.annotate(**{counter: attrs.get(counter, 0) + 1})
+    return key, found, value
@@ -0,0 +1,226 @@
+"""Checkpoint and resume for long-running Agora flows.
+
+After each node, the orchestrator appends a checkpoint record: the node
+that completed, the action it returned, the next node to run and the
+shared keys that changed since the previous record (pickled). Records are
+append-only, so each write is proportional to what the node changed, not
+to the size of ``shared``. Replaying the records rebuilds ``shared`` and
+tells ``resume()`` where to continue.
+"""
+
+import base64
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import uuid
+import warnings
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class CheckpointStore:
+    """Base class for checkpoint stores (append-only records per execution)."""
+
+    def append(self, execution_id: str, record: Dict[str, Any]) -> None:
+        """Append one checkpoint record for an execution."""
+        raise NotImplementedError
+
+    def load(self, execution_id: str) -> List[Dict[str, Any]]:
+        """Return all records for an execution, oldest first."""
+        raise NotImplementedError
+
+    def delete(self, execution_id: str) -> None:
+        """Drop all records for an execution."""
+        raise NotImplementedError
+
+
+class FileCheckpointStore(CheckpointStore):
+    """Stores each execution as a JSONL file of records in a directory."""
+
+    def __init__(self, directory: str = "./checkpoints"):
+        """Initialize the store.
+
+        Args:
+            directory: Directory for the ``<execution_id>.jsonl`` files.
+        """
+        self.directory = directory
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, execution_id: str) -> str:
+        return os.path.join(self.directory, f"{execution_id}.jsonl")
+
+    def append(self, execution_id: str, record: Dict[str, Any]) -> None:
+        """Append a record and flush it to disk."""
+        line = json.dumps(record) + "\n"
+        with self._lock, open(self._path(execution_id), "a") as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def load(self, execution_id: str) -> List[Dict[str, Any]]:
+        """Read all records; a torn final line (crash mid-write) is ignored."""
+        path = self._path(execution_id)
+        if not os.path.exists(path):
+            return []
+        records = []
+        with open(path) as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    break
+        return records
+
+    def delete(self, execution_id: str) -> None:
+        """Remove the execution's file."""
+        try:
+            os.remove(self._path(execution_id))
+        except FileNotFoundError:
+            pass
+
+
+class SQLiteCheckpointStore(CheckpointStore):
+    """Stores checkpoint records as rows in a SQLite database."""
+
+    def __init__(self, path: str = "agora_checkpoints.sqlite"):
+        """Initialize the store.
+
+        Args:
+            path: SQLite database file.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS agora_checkpoints "
+                "(execution_id TEXT, seq INTEGER, record TEXT, "
+                "PRIMARY KEY (execution_id, seq))"
+            )
+
+    def append(self, execution_id: str, record: Dict[str, Any]) -> None:
+        """Insert a record as the next row for the execution."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO agora_checkpoints (execution_id, seq, record) "
+                "SELECT ?, COALESCE(MAX(seq), -1) + 1, ? FROM agora_checkpoints "
+                "WHERE execution_id = ?",
+                (execution_id, json.dumps(record), execution_id),
+            )
+
+    def load(self, execution_id: str) -> List[Dict[str, Any]]:
+        """Read all records in insertion order."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT record FROM agora_checkpoints WHERE execution_id = ? ORDER BY seq",
+                (execution_id,),
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def delete(self, execution_id: str) -> None:
+        """Delete the execution's rows."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM agora_checkpoints WHERE execution_id = ?", (execution_id,)
+            )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+
+def new_execution_id() -> str:
+    """Return a fresh execution id."""
+    return uuid.uuid4().hex
+
+
+class Checkpointer:
+    """Writes incremental checkpoints for one execution.
+
+    Keeps a digest of every shared value it has written, so each record only
+    carries keys that changed (or were deleted) since the previous one.
+    Values that can't be pickled (spans, clients, ...) are skipped with a
+    single warning per key.
+    """
+
+    def __init__(self, store: CheckpointStore, execution_id: str,
+                 shared: Optional[Dict[str, Any]] = None, step: int = 0):
+        """Initialize the checkpointer.
+
+        Args:
+            store: Where records are appended.
+            execution_id: The execution being checkpointed.
+            shared: Shared state already persisted (when resuming).
+            step: Number of the next record (when resuming).
+        """
+        self.store = store
+        self.execution_id = execution_id
+        self.step = step
+        self._digests: Dict[Any, str] = {}
+        self._skipped: set = set()
+        if shared:
+            self._diff(shared)
+
+    def _diff(self, shared) -> Tuple[Dict[str, str], List[Any]]:
+        changed = {}
+        for key, value in list(shared.items()):
+            try:
+                blob = pickle.dumps(value, protocol=4)
+            except Exception:
+                if key not in self._skipped:
+                    self._skipped.add(key)
+                    warnings.warn(f"Checkpoint skips unpicklable shared['{key}']")
+                continue
+            digest = hashlib.sha1(blob).hexdigest()
+            if self._digests.get(key) != digest:
+                self._digests[key] = digest
+                changed[key] = base64.b64encode(blob).decode("ascii")
+        deleted = [k for k in self._digests if k not in shared]
+        for key in deleted:
+            del self._digests[key]
+        return changed, deleted
+
+    def record(self, node_id: int, node_name: str, action: Any,
+               next_id: int, shared, **extra: Any) -> None:
+        """Append the checkpoint for a completed node.
+
+        Args:
+            node_id: Plan id of the node that completed.
+            node_name: Its name (for humans reading the store).
+            action: The action it returned.
+            next_id: Plan id of the next node, or -1 if the flow is done.
+            shared: Current shared state.
+            **extra: Additional fields (e.g. the engine's cycle number).
+        """
+        changed, deleted = self._diff(shared)
+        step, self.step = self.step, self.step + 1
+        self.store.append(self.execution_id, {
+            "step": step,
+            "node_id": node_id,
+            "node": node_name,
+            "action": action if isinstance(action, (str, type(None))) else str(action),
+            "next_id": next_id,
+            "set": {str(k): v for k, v in changed.items()},
+            "deleted": [str(k) for k in deleted],
+            **extra,
+        })
+
+
+def restore(store: CheckpointStore, execution_id: str) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+    """Rebuild shared state from an execution's records.
+
+    Returns:
+        Tuple of (shared, last_record); last_record is None if nothing was saved.
+    """
+    shared: Dict[str, Any] = {}
+    last = None
+    for record in store.load(execution_id):
+        for key, blob in record.get("set", {}).items():
+            shared[key] = pickle.loads(base64.b64decode(blob))
+        for key in record.get("deleted", []):
+            shared.pop(key, None)
+        last = record
+    return shared, last
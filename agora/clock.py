@@ -0,0 +1,60 @@
+"""Shared timing layer for Agora tracing.
+
+Durations are measured with ``time.perf_counter_ns`` (monotonic, integer,
+sub-microsecond). Wall-clock time is read once per trace or logger into a
+ClockAnchor, and timestamps are only computed and formatted from it when
+traces are exported. Hot paths therefore just take one integer reading per
+event, and a node's duration never jumps with NTP or clock adjustments.
+
+Usage:
+    anchor = ClockAnchor()
+    start = now_ns()
+    ...
+    duration = elapsed_ms(start)
+    stamp = anchor.isoformat(start)
+"""
+
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+now_ns = time.perf_counter_ns
+
+
+def elapsed_ms(start_ns: int, end_ns: Optional[int] = None) -> float:
+    """Milliseconds between two now_ns() readings (end defaults to now)."""
+    return ((now_ns() if end_ns is None else end_ns) - start_ns) / 1e6
+
+
+class ClockAnchor:
+    """One wall-clock reading paired with a perf_counter_ns reading.
+
+    Converts later now_ns() readings to wall-clock time without reading the
+    system clock again.
+    """
+
+    __slots__ = ("wall", "perf_ns")
+
+    def __init__(self) -> None:
+        self.perf_ns = now_ns()
+        self.wall = time.time()
+
+    def wall_time(self, ns: int) -> float:
+        """Epoch seconds at perf_counter_ns reading ``ns``."""
+        return self.wall + (ns - self.perf_ns) / 1e9
+
+    def ns_at(self, wall: float) -> int:
+        """The perf_counter_ns reading at epoch seconds ``wall`` (inverse of wall_time)."""
+        return self.perf_ns + round((wall - self.wall) * 1e9)
+
+    def utc_datetime(self, ns: int) -> datetime:
+        """Naive UTC datetime at ``ns`` (as datetime.utcnow() would return)."""
+        return datetime.fromtimestamp(self.wall_time(ns), timezone.utc).replace(tzinfo=None)
+
+    def isoformat(self, ns: int) -> str:
+        """ISO-8601 UTC timestamp at ``ns``, without an offset."""
+        return self.utc_datetime(ns).isoformat()
+
+
+# Anchor for timings that don't belong to a trace or logger of their own
+process_anchor = ClockAnchor()
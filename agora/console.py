@@ -0,0 +1,134 @@
+"""Non-blocking console output for Agora tracing.
+
+Tracer and AuditLogger log to the ``agora`` logger hierarchy instead of
+calling print(). install() attaches a QueueHandler to that logger, and a
+QueueListener thread does the formatting and the stdout writes, so a flow
+only pays for appending a record to an in-memory queue. Message arguments
+are interpolated on the listener thread too. The queue is bounded: when
+output can't keep up, records are dropped and counted rather than stalling
+the event loop.
+
+If the application has already attached handlers to the ``agora`` logger,
+install() leaves them alone and records go wherever they are configured.
+
+Usage:
+    from agora import console
+    console.install(stream=sys.stderr)
+    ...
+    console.shutdown()  # also runs at interpreter exit
+"""
+
+import atexit
+import logging
+import queue
+import sys
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional, TextIO
+
+LOGGER_NAME = "agora"
+
+
+class _StdoutHandler(logging.StreamHandler):
+    """StreamHandler that resolves sys.stdout at write time (like print)."""
+
+    def __init__(self, stream: Optional[TextIO] = None):
+        super().__init__(stream or sys.stdout)
+        self._fixed = stream
+
+    @property
+    def stream(self) -> TextIO:
+        return self._fixed if self._fixed is not None else sys.stdout
+
+    @stream.setter
+    def stream(self, value: TextIO) -> None:
+        pass
+
+
+class _DroppingQueueHandler(QueueHandler):
+    """QueueHandler that never blocks and defers formatting to the listener."""
+
+    def __init__(self, log_queue: "queue.Queue"):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Same process, so the record needn't be made picklable; leaving
+        # msg % args to the listener keeps string formatting off this thread
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_lock = threading.Lock()
+_handler: Optional[_DroppingQueueHandler] = None
+_listener: Optional[QueueListener] = None
+
+
+def get_logger(name: str = "") -> logging.Logger:
+    """The ``agora`` logger, or its child ``agora.<name>``."""
+    return logging.getLogger(f"{LOGGER_NAME}.{name}" if name else LOGGER_NAME)
+
+
+def install(
+    stream: Optional[TextIO] = None,
+    level: int = logging.DEBUG,
+    queue_size: int = 10_000,
+) -> None:
+    """Route the ``agora`` loggers to the console through a background thread.
+
+    Does nothing if already installed or if the ``agora`` logger already
+    has handlers of its own.
+
+    Args:
+        stream: Where to write (defaults to the current sys.stdout).
+        level: Minimum level written by the console handler.
+        queue_size: Records buffered before new ones are dropped.
+    """
+    global _handler, _listener
+    with _lock:
+        logger = get_logger()
+        if _handler is not None or logger.handlers:
+            return
+        log_queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        output = _StdoutHandler(stream)
+        output.setFormatter(logging.Formatter("%(message)s"))
+        output.setLevel(level)
+        _listener = QueueListener(log_queue, output, respect_handler_level=True)
+        _handler = _DroppingQueueHandler(log_queue)
+        logger.addHandler(_handler)
+        logger.propagate = False
+        if logger.level == logging.NOTSET:
+            logger.setLevel(logging.DEBUG)
+        _listener.start()
+
+
+def shutdown() -> None:
+    """Write out queued records and stop the console thread."""
+    global _handler, _listener
+    with _lock:
+        if _handler is None:
+            return
+        logger = get_logger()
+        logger.removeHandler(_handler)
+        logger.propagate = True
+        _listener.stop()
+        _handler = _listener = None
+
+
+def stats() -> Dict[str, Any]:
+    """Return console queue counters."""
+    if _handler is None:
+        return {"installed": False, "dropped": 0, "queued": 0}
+    return {
+        "installed": True,
+        "dropped": _handler.dropped,
+        "queued": _handler.queue.qsize(),
+    }
+
+
+atexit.register(shutdown)
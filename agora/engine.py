@@ -6,19 +6,41 @@ Inspired by the Strands SDK event loop pattern.
 
 import asyncio
 import copy
-from typing import Any, Dict, Optional
-
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from . import (
+    _FlowPlan,
+    _async_retry_delay,
+    _bounded,
+    _branch_limit,
+    _deadline,
+    _item_puller,
+    _time_left,
+)
+from .checkpoint import CheckpointStore, Checkpointer, new_execution_id, restore
+from .events import ERROR, FLOW_END, FLOW_START, NODE_END, NODE_START, RETRY, Event, EventBus
+from .retry import RetryPolicy
 from .tracer import Tracer
 
 
+_NO_RETRY = RetryPolicy(max_attempts=1)
+
+
 class EventEngine:
     """Event-driven execution engine for AsyncFlow workflows.
 
     Provides:
     - Automatic tracing and metrics
-    - Retry logic with exponential backoff
+    - Retry logic with jittered exponential backoff and a retry budget
     - Graceful error handling
-    - Recursive flow execution (Strands-style)
+    - Multi-cycle flow execution (Strands-style), timed per cycle
+    - Optional checkpoint/resume of long-running flows
+    - Per-run deadlines that bound retries and cancel overrunning nodes
+    - A live lifecycle event stream (``engine.events``)
+
+    One engine can serve many concurrent run_flow() calls (e.g. via
+    asyncio.gather); each run keeps its own trace context.
     """
 
     def __init__(
@@ -27,6 +49,9 @@ class EventEngine:
         max_retries: int = 3,
         retry_delay: float = 1.0,
         max_cycles: int = 100,
+        checkpoint_store: Optional[CheckpointStore] = None,
+        event_bus: Optional[EventBus] = None,
+        retry_policy: Optional[RetryPolicy] = None,
     ):
         """Initialize the event engine.
 
@@ -35,14 +60,34 @@ class EventEngine:
             max_retries: Maximum retries for failed nodes.
             retry_delay: Initial delay between retries (exponential backoff).
             max_cycles: Maximum number of flow cycles (prevents infinite loops).
+            checkpoint_store: Optional store; when set, a checkpoint is written
+                after every node and runs can be continued with resume().
+            event_bus: Optional bus to publish lifecycle events on; by default
+                the engine creates its own (see ``events``).
+            retry_policy: Optional policy for node retries. By default
+                max_retries / retry_delay with full jitter, drawing on the
+                process-wide "default" retry budget. Nodes with their own
+                retries (max_retries > 1 or a retry_policy) are not retried
+                again by the engine.
         """
         self.tracer = tracer or Tracer(enable_console=True)
         self.max_retries = max_retries
         self.retry_delay = retry_delay
         self.max_cycles = max_cycles
+        self.checkpoint_store = checkpoint_store
+        self.events = event_bus or EventBus()
+        self.retry_policy = retry_policy or RetryPolicy(
+            max_attempts=max_retries + 1, base_delay=retry_delay, budget="default"
+        )
 
     async def run_flow(
-        self, flow, shared: Dict[str, Any], context: Optional[Any] = None, **kwargs: Any
+        self,
+        flow,
+        shared: Dict[str, Any],
+        context: Optional[Any] = None,
+        deadline: Optional[float] = None,
+        execution_id: Optional[str] = None,
+        **kwargs: Any,
     ) -> tuple:
         """Run an AsyncFlow with full tracing and error handling.
 
@@ -50,31 +95,191 @@ class EventEngine:
             flow: The AsyncFlow instance to execute.
             shared: Shared state dictionary passed between nodes.
             context: Optional context object.
+            deadline: Optional time budget in seconds for the whole run;
+                defaults to ``flow.deadline``. Raises DeadlineExceeded when
+                it runs out.
+            execution_id: Optional id to checkpoint the run under (with a
+                checkpoint_store); a fresh one is generated by default.
+            **kwargs: Additional arguments for flow execution.
+
+        Returns:
+            Tuple of (last_action, metrics). With checkpointing enabled the
+            metrics include the run's ``execution_id``; it is also set as
+            ``execution_id`` on the exception if the run fails, and sent
+            with the flow_start event, so a failed run can be resume()d.
+        """
+        checkpointer = None
+        if self.checkpoint_store is not None:
+            if execution_id is None:
+                execution_id = new_execution_id()
+            elif self.checkpoint_store.load(execution_id):
+                raise ValueError(
+                    f"Execution '{execution_id}' already has checkpoints; use resume()"
+                )
+            checkpointer = Checkpointer(self.checkpoint_store, execution_id)
+        elif execution_id is not None:
+            raise ValueError("execution_id needs an engine with a checkpoint_store")
+
+        return await self._execute(flow, shared, context, checkpointer, None, 0, deadline, kwargs)
+
+    def run_many(
+        self,
+        flow,
+        inputs: Any,
+        concurrency: int = 16,
+        context: Optional[Any] = None,
+        **kwargs: Any,
+    ) -> "RunMany":
+        """Run ``flow`` once per input on a bounded pool of workers.
+
+        Inputs are pulled lazily, so at most ``concurrency`` runs (and tasks)
+        exist at a time however many inputs there are. Results stream back
+        in completion order.
+
+        Usage:
+            async with engine.run_many(flow, shared_dicts, concurrency=32) as runs:
+                async for shared, action, metrics in runs:
+                    ...
+            print(runs.stats)
+
+        Args:
+            flow: The AsyncFlow to run; it is shared by all runs.
+            inputs: Iterable or async iterable of shared-state dicts, one per run.
+            concurrency: Maximum number of runs in flight.
+            context: Optional context object passed to every run.
+            **kwargs: Additional arguments for each run_flow() call.
+
+        Returns:
+            A RunMany async iterator of ``(input, last_action, metrics)``.
+            A failed run yields ``last_action=None`` and metrics with
+            ``status="error"`` and the ``error``.
+        """
+        return RunMany(self, flow, inputs, concurrency, context, kwargs)
+
+    async def resume(
+        self,
+        flow,
+        execution_id: str,
+        shared: Optional[Dict[str, Any]] = None,
+        context: Optional[Any] = None,
+        deadline: Optional[float] = None,
+        **kwargs: Any,
+    ) -> tuple:
+        """Continue a checkpointed run after its last completed node.
+
+        Args:
+            flow: The same AsyncFlow (same graph) that was checkpointed.
+            execution_id: The execution to continue.
+            shared: Optional dict supplying values that couldn't be persisted;
+                checkpointed values are restored into it.
+            context: Optional context object.
+            deadline: Optional time budget in seconds for the resumed part.
             **kwargs: Additional arguments for flow execution.
 
         Returns:
             Tuple of (last_action, metrics).
         """
-        # Start flow trace
-        self.tracer.start_flow_trace(flow.name, **kwargs)
+        if self.checkpoint_store is None:
+            raise ValueError("resume() needs an engine with a checkpoint_store")
+
+        saved, last = restore(self.checkpoint_store, execution_id)
+        shared = {} if shared is None else shared
+        shared.update(saved)
+
+        resume_at, cycle = None, 0
+        if last is not None:
+            cycle = last.get("cycle", 0)
+            if last["next_id"] >= 0:
+                resume_at = last["next_id"]
+            elif shared.get("_recurse_flow", False):
+                # The cycle finished and asked for another one
+                shared["_recurse_flow"] = False
+                cycle += 1
+            else:
+                return last["action"], {"execution_id": execution_id, "resumed": False}
+
+        checkpointer = Checkpointer(
+            self.checkpoint_store,
+            execution_id,
+            shared,
+            step=last["step"] + 1 if last is not None else 0,
+        )
+        return await self._execute(
+            flow, shared, context, checkpointer, resume_at, cycle, deadline, kwargs
+        )
 
-        try:
-            # Execute the flow with cycle counting
-            last_action = await self._run_flow_cycle(
-                flow=flow, shared=shared, context=context, cycle_count=0, **kwargs
-            )
+    async def _execute(
+        self,
+        flow,
+        shared: Dict[str, Any],
+        context: Optional[Any],
+        checkpointer: Optional[Checkpointer],
+        resume_at: Optional[int],
+        cycle_count: int,
+        deadline: Optional[float],
+        kwargs: Dict[str, Any],
+    ) -> tuple:
+        """Trace and run a flow from its start (or a checkpointed node)."""
+        # The trace is current only while this run executes, so a run started
+        # from a node of another run leaves that run's trace and spans intact
+        with self.tracer.flow_trace(flow.name, **kwargs) as trace:
+            execution_id = checkpointer.execution_id if checkpointer is not None else None
+            start = {"resumed": resume_at is not None or cycle_count > 0}
+            if execution_id is not None:
+                start["execution_id"] = execution_id
+            self._publish(FLOW_START, **start)
+
+            if deadline is None:
+                deadline = getattr(flow, "deadline", None)
+            token = None
+            if deadline is not None:
+                inherited = _deadline.get()
+                at = time.monotonic() + deadline
+                token = _deadline.set(at if inherited is None else min(inherited, at))
 
-            # Mark as successful
-            self.tracer.end_flow_trace(status="success")
-            metrics = self.tracer.emit_metrics()
+            try:
+                # Execute the flow with cycle counting, cancelled at the deadline
+                last_action = await _bounded(
+                    self._run_flow_cycle(
+                        flow=flow,
+                        shared=shared,
+                        context=context,
+                        cycle_count=cycle_count,
+                        checkpointer=checkpointer,
+                        resume_at=resume_at,
+                        **kwargs,
+                    ),
+                    _time_left(),
+                )
+
+                # Mark as successful
+                self.tracer.end_flow_trace(status="success", trace=trace)
+                self._publish(
+                    FLOW_END, status="success", action=last_action, duration_ms=trace.duration_ms
+                )
+                metrics = self.tracer.emit_metrics(trace)
+                if execution_id is not None:
+                    metrics["execution_id"] = execution_id
+
+                return last_action, metrics
 
-            return last_action, metrics
+            except Exception as e:
+                # Handle flow-level errors
+                error = str(e) or type(e).__name__
+                self.tracer.end_flow_trace(status="error", error=error, trace=trace)
+                self._publish(ERROR, error=error, error_type=type(e).__name__)
+                self._publish(FLOW_END, status="error", duration_ms=trace.duration_ms)
+                self.tracer.emit_metrics(trace)
+                if execution_id is not None:
+                    try:
+                        e.execution_id = execution_id
+                    except AttributeError:
+                        pass  # exceptions with __slots__ can't carry it
+                raise
 
-        except Exception as e:
-            # Handle flow-level errors
-            self.tracer.end_flow_trace(status="error", error=str(e))
-            self.tracer.emit_metrics()
-            raise
+            finally:
+                if token is not None:
+                    _deadline.reset(token)
 
     async def _run_flow_cycle(
         self,
@@ -82,28 +287,62 @@ class EventEngine:
         shared: Dict[str, Any],
         context: Optional[Any],
         cycle_count: int,
+        checkpointer: Optional[Checkpointer] = None,
+        resume_at: Optional[int] = None,
         **kwargs: Any,
     ) -> Optional[str]:
-        """Execute a single flow cycle (internal).
+        """Drive flow cycles until one doesn't ask for another (internal).
 
-        This implements the Strands-style recursive pattern where tool_use
-        results in another cycle. In Agora, we recursively process nodes
-        until there are no more successors.
+        This implements the Strands-style loop where tool_use results in
+        another cycle: a cycle that leaves ``shared["_recurse_flow"]`` set is
+        followed by a new one. Cycles run in a loop, so the stack depth stays
+        constant however many there are; each is recorded on the trace.
 
         Args:
             flow: The AsyncFlow instance.
             shared: Shared state dictionary.
             context: Optional context.
-            cycle_count: Current cycle number (for max_cycles check).
+            cycle_count: Number of the first cycle (for max_cycles check).
+            checkpointer: Optional checkpointer recording every node.
+            resume_at: Plan id of the node to start from (when resuming).
             **kwargs: Additional arguments.
 
         Returns:
             The last action string returned by the flow.
         """
-        # Check cycle limit
-        if cycle_count >= self.max_cycles:
-            raise RuntimeError(f"Flow exceeded maximum cycles ({self.max_cycles})")
+        while True:
+            # Check cycle limit
+            if cycle_count >= self.max_cycles:
+                raise RuntimeError(f"Flow exceeded maximum cycles ({self.max_cycles})")
+
+            cycle = self.tracer.start_cycle(cycle_count)
+            try:
+                result = await self._run_cycle(
+                    flow, shared, context, cycle_count, checkpointer, resume_at, kwargs
+                )
+            except BaseException as e:
+                self.tracer.end_cycle(cycle, status="error", error=str(e) or type(e).__name__)
+                raise
+            self.tracer.end_cycle(cycle, action=result)
+
+            # Check if we should run another cycle (simulate tool_use recursion)
+            if not shared.get("_recurse_flow", False):
+                return result
+            shared["_recurse_flow"] = False
+            cycle_count += 1
+            resume_at = None
 
+    async def _run_cycle(
+        self,
+        flow,
+        shared: Dict[str, Any],
+        context: Optional[Any],
+        cycle_count: int,
+        checkpointer: Optional[Checkpointer],
+        resume_at: Optional[int],
+        kwargs: Dict[str, Any],
+    ) -> Optional[str]:
+        """Execute a single flow cycle: prep, orchestration and post."""
         # Execute flow prep
         await flow.before_run_async(shared)
         prep_result = await flow.prep_async(shared)
@@ -114,6 +353,9 @@ class EventEngine:
             shared=shared,
             context=context,
             params=prep_result or {**flow.params},
+            checkpointer=checkpointer,
+            resume_at=resume_at,
+            cycle=cycle_count,
             **kwargs,
         )
 
@@ -121,17 +363,6 @@ class EventEngine:
         result = await flow.post_async(shared, prep_result, last_action)
         await flow.after_run_async(shared)
 
-        # Check if we should recurse (simulate tool_use recursion)
-        if shared.get("_recurse_flow", False):
-            shared["_recurse_flow"] = False
-            return await self._run_flow_cycle(
-                flow=flow,
-                shared=shared,
-                context=context,
-                cycle_count=cycle_count + 1,
-                **kwargs,
-            )
-
         return result if result is not None else last_action
 
     async def _orchestrate(
@@ -140,6 +371,9 @@ class EventEngine:
         shared: Dict[str, Any],
         context: Optional[Any],
         params: Dict[str, Any],
+        checkpointer: Optional[Checkpointer] = None,
+        resume_at: Optional[int] = None,
+        cycle: int = 0,
         **kwargs: Any,
     ) -> Optional[str]:
         """Orchestrate node execution within a flow.
@@ -149,24 +383,53 @@ class EventEngine:
             shared: Shared state dictionary.
             context: Optional context.
             params: Parameters for node execution.
+            checkpointer: Optional checkpointer recording every node.
+            resume_at: Plan id of the node to start from (when resuming).
+            cycle: Current cycle number (stored in checkpoints).
             **kwargs: Additional arguments.
 
         Returns:
             The last action string.
         """
-        curr = copy.copy(flow.start_node)
-        last_action = None
+        # Node ids for checkpoints come from the flow's (possibly ad hoc) plan
+        plan = None
+        if checkpointer is not None:
+            plan = getattr(flow, "_plan", None) or _FlowPlan(flow.start_node)
 
-        while curr:
-            # Set context and params
-            curr.context = context
-            curr.set_params(params)
+        template = plan.nodes[resume_at] if resume_at is not None else flow.start_node
+        curr = copy.copy(template)
+        last_action = None
 
-            # Execute node with tracing and retry logic
-            last_action = await self._run_node_with_retry(curr, shared)
+        # Cap concurrent fan-out branch nodes at the flow's max_concurrency
+        limit = getattr(flow, "max_concurrency", None)
+        token = _branch_limit.set(asyncio.Semaphore(limit)) if limit else None
 
-            # Get next node based on action
-            curr = copy.copy(flow.get_next_node(curr, last_action))
+        try:
+            while curr:
+                # Set context and params
+                curr.context = context
+                curr.set_params(params)
+
+                # Execute node with tracing and retry logic
+                last_action = await self._run_node_with_retry(curr, shared)
+
+                # Get next node based on action
+                nxt = flow.get_next_node(curr, last_action)
+
+                if checkpointer is not None:
+                    checkpointer.record(
+                        plan.node_ids[id(template)],
+                        curr.name,
+                        last_action,
+                        plan.node_ids[id(nxt)] if nxt is not None else -1,
+                        shared,
+                        cycle=cycle,
+                    )
+
+                template, curr = nxt, copy.copy(nxt)
+        finally:
+            if token is not None:
+                _branch_limit.reset(token)
 
         return last_action
 
@@ -182,10 +445,15 @@ class EventEngine:
         Returns:
             The action string returned by the node.
         """
+        # Nodes that retry themselves get a single engine attempt, so
+        # failures don't multiply into max_retries² attempts
+        policy = self.retry_policy
+        if getattr(node, "retry_policy", None) is not None or getattr(node, "max_retries", 1) > 1:
+            policy = _NO_RETRY
+        policy.start()
         retry_count = 0
-        current_delay = self.retry_delay
 
-        while retry_count <= self.max_retries:
+        while True:
             try:
                 # Start node span
                 with self.tracer.start_node_span(
@@ -193,19 +461,43 @@ class EventEngine:
                     node_type=node.__class__.__name__,
                     retry=retry_count,
                 ) as span:
+                    self._publish(NODE_START, node.name, attempt=retry_count)
+
                     # Execute the node
+                    node.trace_attributes = {}
                     result = await node._run_async(shared)
 
+                    # Attributes the node reported (e.g. cache hits/misses)
+                    if node.trace_attributes:
+                        span.attributes.update(node.trace_attributes)
+
                     # End span successfully
                     self.tracer.end_node_span(span, action=result)
+                    self._publish(
+                        NODE_END,
+                        node.name,
+                        status="success",
+                        action=result,
+                        duration_ms=span.duration_ms,
+                        attributes=dict(span.attributes),
+                    )
 
                     return result
 
             except Exception as e:
+                error = str(e) or type(e).__name__
+                self._publish(
+                    NODE_END, node.name, status="error", error=error, attempt=retry_count
+                )
+
+                # Backoff from the policy; it gives up on permanent errors, an
+                # exhausted retry budget, or a delay past the run's deadline
                 retry_count += 1
+                delay = _async_retry_delay(policy, e, retry_count)
 
-                if retry_count > self.max_retries:
-                    # Max retries exceeded - handle with on_error_async
+                if delay is None:
+                    # Retries exhausted - handle with on_error_async
+                    self._publish(ERROR, node.name, error=error, error_type=type(e).__name__)
                     try:
                         result = await node.on_error_async(e, shared)
                         return result
@@ -213,9 +505,24 @@ class EventEngine:
                         # Re-raise if error handler fails
                         raise
 
-                # Wait before retry (exponential backoff)
-                await asyncio.sleep(current_delay)
-                current_delay *= 2
+                # Wait before retry (exponential backoff with jitter)
+                self._publish(RETRY, node.name, attempt=retry_count, delay_s=delay, error=error)
+                await asyncio.sleep(delay)
+
+    def _publish(self, event_type: str, node_name: Optional[str] = None, **data: Any) -> None:
+        """Publish a lifecycle event for the calling run, if anyone listens."""
+        if not self.events.has_subscribers:
+            return
+        trace = self.tracer.current_trace
+        self.events.publish(
+            Event(
+                type=event_type,
+                flow_name=trace.flow_name if trace else None,
+                run_id=trace.trace_id if trace else None,
+                node_name=node_name,
+                data=data,
+            )
+        )
 
     async def run_node(
         self, node, shared: Dict[str, Any], context: Optional[Any] = None
@@ -237,6 +544,151 @@ class EventEngine:
         with self.tracer.start_node_span(
             node_name=node.name, node_type=node.__class__.__name__
         ) as span:
+            node.trace_attributes = {}
             result = await node._run_async(shared)
+            if getattr(node, "trace_attributes", None):
+                span.attributes.update(node.trace_attributes)
             self.tracer.end_node_span(span, action=result)
             return result
+
+
+_WORKER_DONE = object()
+
+
+def _percentile(ordered: List[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q / 100))]
+
+
+class RunMany:
+    """Streaming results of EventEngine.run_many.
+
+    Workers start on the first iteration. Results pass through a queue of
+    size ``concurrency``, so a slow consumer pauses the workers instead of
+    buffering every result. Leaving ``async with`` (or calling aclose())
+    cancels whatever is still running.
+    """
+
+    def __init__(
+        self,
+        engine: EventEngine,
+        flow,
+        inputs: Any,
+        concurrency: int,
+        context: Optional[Any],
+        kwargs: Dict[str, Any],
+    ):
+        self.engine = engine
+        self.flow = flow
+        self.inputs = inputs
+        self.concurrency = max(1, concurrency)
+        self.context = context
+        self.kwargs = kwargs
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._active = 0
+
+        # Aggregates
+        self.completed = 0
+        self.errors = 0
+        self.in_flight = 0
+        self._latencies: List[float] = []
+        self._started: Optional[float] = None
+        self._finished: Optional[float] = None
+
+    def _start(self) -> None:
+        self._started = time.monotonic()
+        self._queue = asyncio.Queue(maxsize=self.concurrency)
+        pull = _item_puller(self.inputs)
+        self._active = self.concurrency
+        self._workers = [
+            asyncio.ensure_future(self._worker(pull)) for _ in range(self.concurrency)
+        ]
+
+    async def _worker(self, pull) -> None:
+        try:
+            while True:
+                try:
+                    shared = await pull()
+                except StopAsyncIteration:
+                    break
+                self.in_flight += 1
+                started = time.monotonic()
+                try:
+                    action, metrics = await self.engine.run_flow(
+                        self.flow, shared, self.context, **self.kwargs
+                    )
+                    self.completed += 1
+                except Exception as e:
+                    action = None
+                    metrics = {"status": "error", "error": str(e) or type(e).__name__}
+                    self.errors += 1
+                finally:
+                    self.in_flight -= 1
+                self._latencies.append(time.monotonic() - started)
+                await self._queue.put((shared, action, metrics))
+        except Exception as e:
+            # The inputs iterator itself failed; surface it to the consumer
+            await self._queue.put(e)
+        await self._queue.put(_WORKER_DONE)
+
+    def __aiter__(self) -> "RunMany":
+        return self
+
+    async def __anext__(self) -> Tuple[Any, Optional[str], Dict[str, Any]]:
+        if self._queue is None:
+            self._start()
+        while self._active or not self._queue.empty():
+            item = await self._queue.get()
+            if item is _WORKER_DONE:
+                self._active -= 1
+                continue
+            if isinstance(item, Exception):
+                await self.aclose()
+                raise item
+            return item
+        if self._finished is None:
+            self._finished = time.monotonic()
+        raise StopAsyncIteration
+
+    async def aclose(self) -> None:
+        """Cancel any runs still in flight."""
+        for worker in self._workers:
+            worker.cancel()
+        if self._workers:
+            await asyncio.gather(*self._workers, return_exceptions=True)
+        self._active = 0
+        if self._started is not None and self._finished is None:
+            self._finished = time.monotonic()
+
+    async def __aenter__(self) -> "RunMany":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Throughput, latency percentiles and error counts so far."""
+        elapsed = 0.0
+        if self._started is not None:
+            elapsed = (self._finished or time.monotonic()) - self._started
+        finished = self.completed + self.errors
+        ordered = sorted(self._latencies)
+
+        def ms(value: Optional[float]) -> Optional[float]:
+            return round(value * 1000, 3) if value is not None else None
+
+        return {
+            "completed": self.completed,
+            "errors": self.errors,
+            "in_flight": self.in_flight,
+            "elapsed_s": round(elapsed, 3),
+            "throughput_per_s": round(finished / elapsed, 3) if elapsed else 0.0,
+            "latency_p50_ms": ms(_percentile(ordered, 50)),
+            "latency_p90_ms": ms(_percentile(ordered, 90)),
+            "latency_p99_ms": ms(_percentile(ordered, 99)),
+            "latency_max_ms": ms(ordered[-1] if ordered else None),
+        }
@@ -0,0 +1,178 @@
+"""Live lifecycle events for Agora workflows.
+
+EventEngine publishes structured events (flow start/end, node start/end,
+retry, error) on an EventBus. Each subscriber gets its own bounded buffer
+and reads it with ``async for``. Publishing never waits: when a subscriber
+falls behind, its oldest events are dropped and counted, so a slow
+dashboard can't stall flow execution.
+
+Usage:
+    engine = EventEngine()
+
+    async def watch():
+        async with engine.events.subscribe(types={"node_end", "error"}) as events:
+            async for event in events:
+                print(event.type, event.node_name, event.data)
+"""
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+FLOW_START = "flow_start"
+FLOW_END = "flow_end"
+NODE_START = "node_start"
+NODE_END = "node_end"
+RETRY = "retry"
+ERROR = "error"
+
+
+@dataclass
+class Event:
+    """A single lifecycle event."""
+
+    type: str
+    flow_name: Optional[str] = None
+    run_id: Optional[str] = None
+    node_name: Optional[str] = None
+    timestamp: float = field(default_factory=time.time)
+    data: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for serialization."""
+        return asdict(self)
+
+
+class Subscription:
+    """A subscriber's bounded view of an EventBus.
+
+    When the buffer is full the oldest event is dropped to make room.
+    ``dropped`` counts those events and ``lag`` is how many are buffered and
+    not yet read.
+    """
+
+    def __init__(self, bus: "EventBus", maxsize: int, types: Optional[Iterable[str]] = None):
+        self._bus = bus
+        self._buffer: deque = deque()
+        self._waiter: Optional[asyncio.Future] = None
+        self.maxsize = maxsize
+        self.types = frozenset(types) if types is not None else None
+        self.closed = False
+
+        # Metrics
+        self.delivered = 0
+        self.dropped = 0
+
+    @property
+    def lag(self) -> int:
+        """Events buffered but not yet consumed."""
+        return len(self._buffer)
+
+    def _push(self, event: Event) -> None:
+        if self.closed or (self.types is not None and event.type not in self.types):
+            return
+        if len(self._buffer) >= self.maxsize:
+            self._buffer.popleft()
+            self.dropped += 1
+        self._buffer.append(event)
+        self._wake()
+
+    def _wake(self) -> None:
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+    def close(self) -> None:
+        """Stop receiving events; buffered ones can still be read."""
+        if not self.closed:
+            self.closed = True
+            self._bus._unsubscribe(self)
+            self._wake()
+
+    def __aiter__(self) -> "Subscription":
+        return self
+
+    async def __anext__(self) -> Event:
+        while not self._buffer:
+            if self.closed:
+                raise StopAsyncIteration
+            self._waiter = asyncio.get_running_loop().create_future()
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+        self.delivered += 1
+        return self._buffer.popleft()
+
+    async def __aenter__(self) -> "Subscription":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return delivery metrics."""
+        return {"delivered": self.delivered, "dropped": self.dropped, "lag": self.lag}
+
+
+class EventBus:
+    """Non-blocking publish/subscribe channel for lifecycle events.
+
+    publish() only appends to subscriber buffers, so it must be called from
+    the event loop thread the subscribers read on.
+    """
+
+    def __init__(self, maxsize: int = 1000):
+        """Initialize the bus.
+
+        Args:
+            maxsize: Default per-subscriber buffer size.
+        """
+        self.maxsize = maxsize
+        self._subscribers: List[Subscription] = []
+        self.published = 0
+
+    @property
+    def has_subscribers(self) -> bool:
+        """Whether anyone is listening (publishers can skip building events)."""
+        return bool(self._subscribers)
+
+    def subscribe(
+        self, maxsize: Optional[int] = None, types: Optional[Iterable[str]] = None
+    ) -> Subscription:
+        """Start receiving events.
+
+        Args:
+            maxsize: Buffer size for this subscriber (defaults to the bus's).
+            types: Optional event types to receive; others are skipped.
+
+        Returns:
+            A Subscription to iterate with ``async for``.
+        """
+        subscription = Subscription(self, maxsize or self.maxsize, types)
+        self._subscribers = self._subscribers + [subscription]
+        return subscription
+
+    def _unsubscribe(self, subscription: Subscription) -> None:
+        self._subscribers = [s for s in self._subscribers if s is not subscription]
+
+    def publish(self, event: Event) -> None:
+        """Deliver an event to every subscriber without waiting."""
+        self.published += 1
+        for subscription in self._subscribers:
+            subscription._push(event)
+
+    def close(self) -> None:
+        """End every subscription once its buffered events are read."""
+        for subscription in self._subscribers:
+            subscription.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return publish counts and per-subscriber drop / lag counters."""
+        return {
+            "published": self.published,
+            "subscribers": len(self._subscribers),
+            "dropped": sum(s.dropped for s in self._subscribers),
+            "max_lag": max((s.lag for s in self._subscribers), default=0),
+        }
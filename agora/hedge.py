@@ -0,0 +1,143 @@
+"""Hedged (speculative) execution for tail-latency-sensitive nodes.
+
+A HedgePolicy watches how long a node's exec_async calls take. Once it has
+enough samples, a call that is still running after the observed pN latency
+gets a second, identical attempt; whichever finishes first wins and the other
+is cancelled. A budget caps the share of calls that may be hedged, so a
+slow backend never sees more than ``1 + budget`` times its normal load.
+
+Usage:
+    class Retrieve(AsyncNode):
+        hedge = HedgePolicy(percentile=95, budget=0.05)
+
+Only hedge work that is safe to run twice (reads, idempotent calls). Give
+each node type its own policy; nodes sharing one also share its latency
+history and budget.
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+class HedgePolicy:
+    """Fire a backup attempt when a call runs past the observed pN latency."""
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        budget: float = 0.05,
+        min_samples: int = 20,
+        window: int = 200,
+        min_delay: float = 0.0,
+    ):
+        """Initialize the policy.
+
+        Args:
+            percentile: Latency percentile after which a hedge fires.
+            budget: Maximum fraction of calls that may be hedged.
+            min_samples: Calls to observe before hedging starts.
+            window: Number of recent latencies the percentile is taken over.
+            min_delay: Lower bound in seconds on the hedge delay.
+        """
+        if not 0 < percentile < 100:
+            raise ValueError("percentile must be between 0 and 100")
+        self.percentile = percentile
+        self.budget = budget
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self._latencies: deque = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.calls = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def observe(self, seconds: float) -> None:
+        """Record the latency of a successful attempt."""
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def delay(self) -> Optional[float]:
+        """Seconds to wait before hedging, or None while samples are too few."""
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            ordered = sorted(self._latencies)
+        index = min(len(ordered) - 1, int(len(ordered) * self.percentile / 100))
+        return max(self.min_delay, ordered[index])
+
+    def _take_budget(self) -> bool:
+        with self._lock:
+            if self.hedges + 1 > self.budget * self.calls:
+                return False
+            self.hedges += 1
+            return True
+
+    async def run(
+        self, attempt: Callable[[], Awaitable[Any]], annotate: Callable[..., None]
+    ) -> Any:
+        """Run ``attempt``, hedging it once if it is slow and budget allows.
+
+        Args:
+            attempt: Zero-argument coroutine function performing one call.
+            annotate: Receives ``hedge_fired``/``hedge_winner`` span attributes.
+
+        Returns:
+            The result of the first attempt to succeed. If both fail, the
+            primary attempt's exception is raised.
+        """
+        with self._lock:
+            self.calls += 1
+        delay = self.delay()
+        started = time.monotonic()
+        primary = asyncio.ensure_future(attempt())
+        try:
+            if delay is not None:
+                await asyncio.wait({primary}, timeout=delay)
+            if delay is None or primary.done() or not self._take_budget():
+                result = await primary
+                self.observe(time.monotonic() - started)
+                return result
+
+            hedge_started = time.monotonic()
+            backup = asyncio.ensure_future(attempt())
+            annotate(hedge_fired=True, hedge_delay_ms=round(delay * 1000, 3))
+            return await self._race(primary, backup, started, hedge_started, annotate)
+        finally:
+            if not primary.done():
+                primary.cancel()
+
+    async def _race(self, primary, backup, started, hedge_started, annotate) -> Any:
+        starts = {primary: started, backup: hedge_started}
+        pending = {primary, backup}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in (primary, backup):
+                    if task in done and not task.cancelled() and task.exception() is None:
+                        self.observe(time.monotonic() - starts[task])
+                        if task is backup:
+                            with self._lock:
+                                self.hedge_wins += 1
+                        annotate(hedge_winner="hedge" if task is backup else "primary")
+                        return task.result()
+            # Both attempts failed
+            annotate(hedge_winner=None)
+            return primary.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hedging metrics."""
+        delay = self.delay()
+        return {
+            "calls": self.calls,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "hedge_delay_ms": round(delay * 1000, 3) if delay is not None else None,
+        }
@@ -50,10 +50,10 @@ class FlowInspector:
         Returns:
             Dictionary with execution statistics.
         """
-        if not self.tracer or not self.tracer.current_trace:
+        if not self.tracer or not self.tracer.latest_trace:
             return {"error": "No runtime data available"}
 
-        trace = self.tracer.current_trace
+        trace = self.tracer.latest_trace
 
         # Calculate per-node statistics
         node_stats = {}
@@ -157,11 +157,11 @@ class FlowInspector:
 
     def visualize_execution_timeline(self) -> None:
         """Print a simple ASCII timeline of node executions."""
-        if not self.tracer or not self.tracer.current_trace:
+        if not self.tracer or not self.tracer.latest_trace:
             print("No runtime data available for timeline visualization")
             return
 
-        trace = self.tracer.current_trace
+        trace = self.tracer.latest_trace
         if not trace.spans:
             return
 
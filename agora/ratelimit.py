@@ -0,0 +1,187 @@
+"""Process-wide rate limiting for Agora nodes.
+
+A RateLimiter combines up to three limits: requests per second, tokens
+per minute (token bucket) and concurrent slots. Limiters are registered by
+name so every node and flow in the process that declares the same name
+shares one quota. Callers wait asynchronously for capacity instead of
+failing, and the time spent waiting is reported on the node's span.
+
+Usage:
+    get_rate_limiter("openai", requests_per_second=50, tokens_per_minute=150_000)
+
+    class Summarize(AsyncNode):
+        rate_limit = "openai"
+
+        def estimate_tokens(self, prep_res):
+            return len(prep_res) // 4
+"""
+
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Optional
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at ``rate`` tokens per second.
+
+    ``reserve`` never blocks: it takes the tokens immediately (the balance
+    may go negative) and returns how long the caller must wait. Callers
+    therefore queue up in arrival order without a lock held across awaits.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """Initialize the bucket.
+
+        Args:
+            rate: Refill rate in tokens per second.
+            capacity: Maximum burst size (defaults to one second of tokens).
+        """
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(rate, 1.0))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float = 1.0) -> float:
+        """Take ``amount`` tokens and return the seconds to wait before using them."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= amount
+            return -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+
+class RateLimiter:
+    """Combined requests/sec, tokens/min and concurrency limiter.
+
+    Concurrency slots use an asyncio.Semaphore, so a limiter that sets
+    ``max_concurrent`` should be used from one event loop at a time.
+    """
+
+    def __init__(
+        self,
+        name: Optional[str] = None,
+        requests_per_second: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        max_concurrent: Optional[int] = None,
+        burst: Optional[float] = None,
+    ):
+        """Initialize the limiter.
+
+        Args:
+            name: Name shown in metrics.
+            requests_per_second: Maximum request rate.
+            tokens_per_minute: Maximum token throughput (see Node.estimate_tokens).
+            max_concurrent: Maximum requests in flight.
+            burst: Request burst size (defaults to one second of requests).
+        """
+        self.name = name
+        self.requests = TokenBucket(requests_per_second, burst) if requests_per_second else None
+        self.tokens = (
+            TokenBucket(tokens_per_minute / 60.0, tokens_per_minute) if tokens_per_minute else None
+        )
+        self.max_concurrent = max_concurrent
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop = None
+
+        # Metrics
+        self.acquired = 0
+        self.waiting = 0
+        self.total_wait_s = 0.0
+        self.max_wait_s = 0.0
+
+    def _slots(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore, self._loop = asyncio.Semaphore(self.max_concurrent), loop
+        return self._semaphore
+
+    @asynccontextmanager
+    async def slot(self, tokens: float = 0):
+        """Wait for capacity, then hold a slot for the duration of the block.
+
+        Args:
+            tokens: Estimated tokens the request will consume.
+
+        Yields:
+            Seconds spent waiting for capacity.
+        """
+        started = time.monotonic()
+        self.waiting += 1
+        semaphore = None
+        try:
+            if self.max_concurrent:
+                semaphore = self._slots()
+                await semaphore.acquire()
+            delay = 0.0
+            if self.requests is not None:
+                delay = self.requests.reserve(1)
+            if self.tokens is not None and tokens:
+                delay = max(delay, self.tokens.reserve(tokens))
+            if delay > 0:
+                await asyncio.sleep(delay)
+        except BaseException:
+            if semaphore is not None:
+                semaphore.release()
+            raise
+        finally:
+            self.waiting -= 1
+
+        waited = time.monotonic() - started
+        self.acquired += 1
+        self.total_wait_s += waited
+        self.max_wait_s = max(self.max_wait_s, waited)
+        try:
+            yield waited
+        finally:
+            if semaphore is not None:
+                semaphore.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return queueing metrics."""
+        return {
+            "name": self.name,
+            "acquired": self.acquired,
+            "waiting": self.waiting,
+            "total_wait_ms": round(self.total_wait_s * 1000, 3),
+            "max_wait_ms": round(self.max_wait_s * 1000, 3),
+        }
+
+
+_registry: Dict[str, RateLimiter] = {}
+_registry_lock = threading.Lock()
+
+
+def get_rate_limiter(name: str, **config: Any) -> RateLimiter:
+    """Get (or create, on first call with config) the process-wide limiter ``name``.
+
+    Args:
+        name: Limiter name, e.g. a provider such as "openai".
+        **config: RateLimiter arguments; when given for an existing name the
+            limiter is replaced.
+
+    Returns:
+        The shared RateLimiter.
+
+    Raises:
+        KeyError: If the name is unknown and no config is given.
+    """
+    with _registry_lock:
+        if config or name not in _registry:
+            if not config:
+                raise KeyError(
+                    f"Rate limiter '{name}' is not configured. "
+                    f"Available: {list(_registry.keys())}"
+                )
+            _registry[name] = RateLimiter(name=name, **config)
+        return _registry[name]
+
+
+def resolve_rate_limiter(rate_limit: Any) -> Optional[RateLimiter]:
+    """Turn a node's ``rate_limit`` (name or RateLimiter) into a RateLimiter."""
+    if rate_limit is None or isinstance(rate_limit, RateLimiter):
+        return rate_limit
+    return get_rate_limiter(rate_limit)
@@ -0,0 +1,237 @@
+"""Retry policies for Agora nodes and the EventEngine.
+
+One RetryPolicy decides, for every failed attempt, whether to try again and
+how long to wait first. Node._exec, AsyncNode._exec_async and
+EventEngine all go through it. It provides:
+
+- Exponential backoff with full jitter, so clients recovering from the same
+  outage don't retry in lockstep.
+- Exception classification: ``retry_on`` / ``give_up_on`` types, or a
+  ``classify`` callback.
+- Retry-After: a server-provided delay (``exc.retry_after`` or a
+  ``Retry-After`` header on ``exc.response``) is honoured as a minimum.
+- Retry budgets: retries spend tokens that are earned by first attempts.
+  A budget shared across the process caps retries at a fraction of normal
+  traffic during an outage instead of multiplying load.
+
+Usage:
+    class CallLLM(AsyncNode):
+        retry_policy = RetryPolicy(max_attempts=5, base_delay=0.5, budget="default")
+"""
+
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Optional, Tuple, Type, Union
+
+
+class RetryBudget:
+    """Token bucket limiting retries to a fraction of first attempts.
+
+    Every call deposits ``ratio`` tokens and every retry withdraws one, so
+    in steady state at most ``ratio`` retries happen per call. A floor of
+    ``min_per_second`` retries keeps low-traffic callers able to retry.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_per_second: float = 10.0, max_tokens: float = 100.0):
+        """Initialize the budget.
+
+        Args:
+            ratio: Retries allowed per call.
+            min_per_second: Retries always allowed per second regardless of traffic.
+            max_tokens: Cap on saved-up retries.
+        """
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_tokens = max_tokens
+        self._tokens = max_tokens
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.retries = 0
+        self.rejected = 0
+
+    def deposit(self) -> None:
+        """Credit the budget for one call."""
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        """Take one retry from the budget; False if it is exhausted."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.max_tokens, self._tokens + (now - self._updated) * self.min_per_second
+            )
+            self._updated = now
+            if self._tokens < 1:
+                self.rejected += 1
+                return False
+            self._tokens -= 1
+            self.retries += 1
+            return True
+
+    def stats(self) -> Dict[str, Any]:
+        """Return budget metrics."""
+        return {
+            "tokens": round(self._tokens, 3),
+            "retries": self.retries,
+            "rejected": self.rejected,
+        }
+
+
+_budgets: Dict[str, RetryBudget] = {}
+_budgets_lock = threading.Lock()
+
+
+def get_retry_budget(name: str = "default", **config: Any) -> RetryBudget:
+    """Get (or create) the process-wide retry budget ``name``.
+
+    Args:
+        name: Budget name, e.g. a provider such as "openai".
+        **config: RetryBudget arguments; when given for an existing name the
+            budget is replaced.
+
+    Returns:
+        The shared RetryBudget.
+    """
+    with _budgets_lock:
+        if config or name not in _budgets:
+            _budgets[name] = RetryBudget(**config)
+        return _budgets[name]
+
+
+def retry_after(exc: BaseException) -> Optional[float]:
+    """Seconds the server asked us to wait, if the exception carries it.
+
+    Looks at ``exc.retry_after`` and then at a ``Retry-After`` header on
+    ``exc.response`` (as raised by httpx, requests and most SDKs). Both the
+    delta-seconds and HTTP-date forms are understood.
+    """
+    value = getattr(exc, "retry_after", None)
+    if value is None:
+        headers = getattr(getattr(exc, "response", None), "headers", None)
+        if headers is not None:
+            try:
+                value = headers.get("retry-after") or headers.get("Retry-After")
+            except Exception:
+                value = None
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(str(value)).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+ExceptionTypes = Union[Type[BaseException], Tuple[Type[BaseException], ...]]
+
+
+class RetryPolicy:
+    """When and how long to wait before retrying a failed attempt."""
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+        multiplier: float = 2.0,
+        jitter: bool = True,
+        retry_on: ExceptionTypes = (Exception,),
+        give_up_on: ExceptionTypes = (NotImplementedError,),
+        classify: Optional[Callable[[BaseException], bool]] = None,
+        respect_retry_after: bool = True,
+        max_retry_after: float = 60.0,
+        budget: Union[RetryBudget, str, None] = None,
+    ):
+        """Initialize the policy.
+
+        Args:
+            max_attempts: Total attempts, including the first.
+            base_delay: Backoff before the first retry, in seconds.
+            max_delay: Upper bound on the backoff.
+            multiplier: Backoff growth per retry.
+            jitter: Full jitter: sleep a uniform random time up to the backoff.
+            retry_on: Exception types worth retrying.
+            give_up_on: Exception types never retried (checked first).
+            classify: Optional callback overriding retry_on; return True to retry.
+            respect_retry_after: Wait at least as long as the server asks.
+            max_retry_after: Give up instead of waiting longer than this.
+            budget: RetryBudget, or the name of a process-wide one, to draw
+                retries from.
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.retry_on = retry_on
+        self.give_up_on = give_up_on
+        self.classify = classify
+        self.respect_retry_after = respect_retry_after
+        self.max_retry_after = max_retry_after
+        self.budget = budget
+
+    @classmethod
+    def fixed(cls, max_attempts: int, wait: float = 0) -> "RetryPolicy":
+        """Policy matching a node's plain ``max_retries`` / ``wait`` settings."""
+        return cls(
+            max_attempts=max_attempts,
+            base_delay=wait,
+            max_delay=wait,
+            multiplier=1.0,
+            jitter=False,
+            give_up_on=(),
+            respect_retry_after=False,
+        )
+
+    def _budget(self) -> Optional[RetryBudget]:
+        if self.budget is None or isinstance(self.budget, RetryBudget):
+            return self.budget
+        return get_retry_budget(self.budget)
+
+    def start(self) -> None:
+        """Note a new call (earns retry budget)."""
+        budget = self._budget()
+        if budget is not None:
+            budget.deposit()
+
+    def is_retryable(self, exc: BaseException) -> bool:
+        """Classify an exception as transient (retry) or permanent."""
+        if self.give_up_on and isinstance(exc, self.give_up_on):
+            return False
+        if self.classify is not None:
+            return bool(self.classify(exc))
+        return isinstance(exc, self.retry_on)
+
+    def backoff(self, attempt: int) -> float:
+        """Delay before retry number ``attempt`` (1-based), before Retry-After."""
+        delay = min(self.max_delay, self.base_delay * self.multiplier ** (attempt - 1))
+        return random.uniform(0, delay) if self.jitter else delay
+
+    def next_delay(self, exc: BaseException, attempt: int) -> Optional[float]:
+        """Seconds to wait before retrying, or None to give up.
+
+        Args:
+            exc: The exception the attempt failed with.
+            attempt: Number of attempts made so far (1 after the first failure).
+        """
+        if attempt >= self.max_attempts or not self.is_retryable(exc):
+            return None
+        delay = self.backoff(attempt)
+        if self.respect_retry_after:
+            requested = retry_after(exc)
+            if requested is not None:
+                if requested > self.max_retry_after:
+                    return None
+                delay = max(delay, requested)
+        budget = self._budget()
+        if budget is not None and not budget.withdraw():
+            return None
+        return delay
@@ -1,5 +1,5 @@
 import json
-import time
+import logging
 import uuid
 import os
 import warnings
@@ -7,6 +7,9 @@ from datetime import datetime
 from typing import Dict, Any, List, Optional, Union
 from contextlib import contextmanager
 
+from agora import console as console_module
+from agora.clock import ClockAnchor, elapsed_ms, now_ns
+
 # Import base classes from the core
 from agora import (
     BaseNode, Node, BatchNode, Flow, 
@@ -28,15 +31,37 @@ except ImportError:
 # AUDIT LOGGER (ENHANCED WITH HIERARCHICAL SPAN SUPPORT)
 # ======================================================================
 
+# Console level of each audit event type (others log at INFO)
+_EVENT_LEVELS = {
+    "node_start": logging.DEBUG,
+    "flow_transition": logging.DEBUG,
+    "node_error": logging.WARNING,
+}
+
+
 class AuditLogger:
-    """Records node execution events and flow transitions with JSON export capability"""
+    """Records node execution events and flow transitions with JSON export capability
+    
+    With console=True every event is also logged to the ``agora.audit``
+    logger, which agora.console writes out from a background thread.
+    """
     
-    def __init__(self, session_id: Optional[str] = None, save_dir: str = "./logs"):
+    def __init__(self, session_id: Optional[str] = None, save_dir: str = "./logs",
+                 console: bool = False, console_level: Union[int, str] = logging.INFO):
         self.session_id = session_id or str(uuid.uuid4())
-        self.events: List[Dict[str, Any]] = []
-        self.start_time = datetime.utcnow()
+        # New events are appended as (perf_counter_ns, event) and replaced
+        # in place by their formatted dict when read through .events
+        self._events: List[Any] = []
+        self.anchor = ClockAnchor()
         self.save_dir = save_dir
         self.tracer = None
+        self.console = console
+        if isinstance(console_level, str):
+            console_level = logging.getLevelName(console_level.upper())
+        self.console_level = console_level
+        self._log = console_module.get_logger("audit")
+        if console:
+            console_module.install()
         
         # Storage for completed spans (for JSON export)
         self.completed_spans: List[Dict[str, Any]] = []
@@ -50,15 +75,43 @@ class AuditLogger:
         if OTEL_AVAILABLE:
             self.tracer = trace.get_tracer(__name__)
     
+    @property
+    def start_time(self) -> datetime:
+        """Session start (naive UTC)"""
+        return self.anchor.utc_datetime(self.anchor.perf_ns)
+    
+    @property
+    def events(self) -> List[Dict[str, Any]]:
+        """Logged events with ISO timestamps (formatted on first read)
+        
+        This is the logger's own list: clearing or editing it changes what
+        gets exported.
+        """
+        events = self._events
+        # Unformatted events only ever sit at the end of the list
+        i = len(events)
+        while i and isinstance(events[i - 1], tuple):
+            i -= 1
+        for j in range(i, len(events)):
+            ns, event = events[j]
+            events[j] = {
+                "session_id": self.session_id,
+                "timestamp": self.anchor.isoformat(ns),
+                **event
+            }
+        return events
+    
+    @events.setter
+    def events(self, value: List[Dict[str, Any]]):
+        self._events = list(value)
+    
     def log_event(self, event_type: str, **kwargs):
         """Log a single event with timestamp"""
-        event = {
-            "session_id": self.session_id,
-            "timestamp": datetime.utcnow().isoformat(),
-            "event_type": event_type,
-            **kwargs
-        }
-        self.events.append(event)
+        self._events.append((now_ns(), {"event_type": event_type, **kwargs}))
+        if self.console:
+            level = _EVENT_LEVELS.get(event_type, logging.INFO)
+            if level >= self.console_level:
+                self._log.log(level, "[AUDIT] %s %s", event_type, kwargs)
     
     def log_node_start(self, node_name: str, node_type: str, params: Dict[str, Any] = None):
         """Log node execution start"""
@@ -127,7 +180,7 @@ class AuditLogger:
         summary = {
             "session_id": self.session_id,
             "start_time": self.start_time.isoformat(),
-            "end_time": datetime.utcnow().isoformat(),
+            "end_time": self.anchor.isoformat(now_ns()),
             "total_events": len(self.events),
             "event_counts": self._get_event_counts(),
             "events": self.events
@@ -144,15 +197,17 @@ class AuditLogger:
         """Get audit session summary"""
         return {
             "session_id": self.session_id,
-            "total_events": len(self.events),
+            "total_events": len(self._events),
             "event_counts": self._get_event_counts(),
-            "duration_seconds": (datetime.utcnow() - self.start_time).total_seconds()
+            "duration_seconds": elapsed_ms(self.anchor.perf_ns) / 1000
         }
     
     def _get_event_counts(self) -> Dict[str, int]:
         """Count events by type"""
         counts = {}
-        for event in self.events:
+        for event in self._events:
+            if isinstance(event, tuple):
+                event = event[1]
             event_type = event.get("event_type", "unknown")
             counts[event_type] = counts.get(event_type, 0) + 1
         return counts
@@ -196,8 +251,8 @@ class AuditLogger:
             span.set_attribute(key, str(value) if value is not None else "None")
         
         # Store start time for duration calculation
-        if not hasattr(span, '_agora_start_time'):
-            span._agora_start_time = time.time()
+        if not hasattr(span, '_agora_start_ns'):
+            span._agora_start_ns = now_ns()
         
         return span
     
@@ -219,7 +274,8 @@ class AuditLogger:
             span.set_attribute("error.message", str(error))
         
         # Calculate duration
-        duration_ms = (time.time() - getattr(span, '_agora_start_time', time.time())) * 1000
+        start_ns = getattr(span, '_agora_start_ns', None) or now_ns()
+        duration_ms = elapsed_ms(start_ns)
         
         # Extract span information for JSON export
         span_context = span.get_span_context()
@@ -238,9 +294,7 @@ class AuditLogger:
             "duration_ms": round(duration_ms, 2),
             "attributes": {},
             "status": "error" if error else "ok",
-            "start_time": datetime.fromtimestamp(
-                getattr(span, '_agora_start_time', time.time())
-            ).isoformat(),
+            "_start_ns": start_ns,  # formatted as start_time on export
             "_internal_id": span_id  # For parent lookup
         }
         
@@ -262,6 +316,14 @@ class AuditLogger:
         # End the span
         span.end()
     
+    def _export_span(self, span_info: Dict[str, Any]) -> Dict[str, Any]:
+        """Completed span with its start_time formatted (local time)"""
+        data = {k: v for k, v in span_info.items() if k != "_start_ns"}
+        data["start_time"] = datetime.fromtimestamp(
+            self.anchor.wall_time(span_info["_start_ns"])
+        ).isoformat()
+        return data
+    
     def save_trace_json(self, filename: str = "trace.json"):
         """
         Save hierarchical trace data to JSON file.
@@ -281,9 +343,9 @@ class AuditLogger:
             "session_id": self.session_id,
             "service_name": "agora",
             "start_time": self.start_time.isoformat(),
-            "end_time": datetime.utcnow().isoformat(),
+            "end_time": self.anchor.isoformat(now_ns()),
             "total_spans": len(self.completed_spans),
-            "spans": self.completed_spans
+            "spans": [self._export_span(span) for span in self.completed_spans]
         }
         
         with open(filepath, 'w') as f:
@@ -301,19 +363,20 @@ class AuditMixin:
     
     def _time_phase(self, phase_name: str, func, *args, **kwargs):
         """Time a phase execution"""
-        start_time = time.time()
+        start_ns = now_ns()
         try:
             result = func(*args, **kwargs)
-            self.phase_times[phase_name] = (time.time() - start_time) * 1000
+            self.phase_times[phase_name] = elapsed_ms(start_ns)
             return result
         except Exception as e:
-            self.phase_times[phase_name] = (time.time() - start_time) * 1000
+            self.phase_times[phase_name] = elapsed_ms(start_ns)
             raise
     
     def _audit_run(self, shared):
         """Common audited run logic for sync nodes with span hierarchy"""
         self.audit_logger.log_node_start(self.name, self.__class__.__name__, self.params)
-        total_start = time.time()
+        total_start = now_ns()
+        self.trace_attributes = {}
         
         # Get parent span from shared context
         parent_span = shared.get("parent_span")
@@ -336,7 +399,7 @@ class AuditMixin:
             
             self.after_run(shared)
             
-            total_latency = (time.time() - total_start) * 1000
+            total_latency = elapsed_ms(total_start)
             
             # Track batch sizes
             input_size = len(prep_result) if hasattr(prep_result, '__len__') else None
@@ -345,7 +408,8 @@ class AuditMixin:
             phase_latencies_with_sizes = {
                 **self.phase_times.copy(),
                 "input_batch_size": input_size,
-                "output_batch_size": output_size
+                "output_batch_size": output_size,
+                **self.trace_attributes  # node-reported, e.g. cache_hits / cache_misses
             }
             
             self.audit_logger.log_node_success(
@@ -364,13 +428,15 @@ class AuditMixin:
                     span.set_attribute("input_batch_size", str(input_size))
                 if output_size is not None:
                     span.set_attribute("output_batch_size", str(output_size))
+                for key, value in self.trace_attributes.items():
+                    span.set_attribute(key, str(value))
             
             self.audit_logger.end_span(span)
             
             return post_result
             
         except Exception as exc:
-            total_latency = (time.time() - total_start) * 1000
+            total_latency = elapsed_ms(total_start)
             retry_count = getattr(self, 'cur_retry', 0)
             
             self.audit_logger.log_node_error(
@@ -395,19 +461,20 @@ class AsyncAuditMixin:
     
     async def _time_phase_async(self, phase_name: str, func, *args, **kwargs):
         """Time an async phase execution"""
-        start_time = time.time()
+        start_ns = now_ns()
         try:
             result = await func(*args, **kwargs)
-            self.phase_times[phase_name] = (time.time() - start_time) * 1000
+            self.phase_times[phase_name] = elapsed_ms(start_ns)
             return result
         except Exception as e:
-            self.phase_times[phase_name] = (time.time() - start_time) * 1000
+            self.phase_times[phase_name] = elapsed_ms(start_ns)
             raise
     
     async def _audit_run_async(self, shared):
         """Common audited run logic for async nodes with span hierarchy"""
         self.audit_logger.log_node_start(self.name, self.__class__.__name__, self.params)
-        total_start = time.time()
+        total_start = now_ns()
+        self.trace_attributes = {}
         
         # Get parent span from shared context
         parent_span = shared.get("parent_span")
@@ -430,7 +497,7 @@ class AsyncAuditMixin:
             
             await self.after_run_async(shared)
             
-            total_latency = (time.time() - total_start) * 1000
+            total_latency = elapsed_ms(total_start)
             
             # Track batch sizes
             input_size = len(prep_result) if hasattr(prep_result, '__len__') else None
@@ -439,7 +506,8 @@ class AsyncAuditMixin:
             phase_latencies_with_sizes = {
                 **self.phase_times.copy(),
                 "input_batch_size": input_size,
-                "output_batch_size": output_size
+                "output_batch_size": output_size,
+                **self.trace_attributes  # node-reported, e.g. cache_hits / cache_misses
             }
             
             self.audit_logger.log_node_success(
@@ -457,13 +525,15 @@ class AsyncAuditMixin:
                     span.set_attribute("input_batch_size", str(input_size))
                 if output_size is not None:
                     span.set_attribute("output_batch_size", str(output_size))
+                for key, value in self.trace_attributes.items():
+                    span.set_attribute(key, str(value))
             
             self.audit_logger.end_span(span)
             
             return post_result
             
         except Exception as exc:
-            total_latency = (time.time() - total_start) * 1000
+            total_latency = elapsed_ms(total_start)
             retry_count = getattr(self, 'cur_retry', 0)
             
             self.audit_logger.log_node_error(
@@ -490,8 +560,8 @@ class AsyncAuditMixin:
 class AuditedNode(AuditMixin, Node):
     """Node with audit logging and optional OpenTelemetry tracing"""
     
-    def __init__(self, name=None, audit_logger: AuditLogger = None, max_retries=1, wait=0):
-        super().__init__(name, max_retries, wait)
+    def __init__(self, name=None, audit_logger: AuditLogger = None, max_retries=1, wait=0, **kwargs):
+        super().__init__(name, max_retries, wait, **kwargs)
         self.audit_logger = audit_logger
         self.phase_times = {}
     
@@ -505,8 +575,8 @@ class AuditedNode(AuditMixin, Node):
 class AuditedBatchNode(AuditMixin, BatchNode):
     """BatchNode with audit logging and optional OpenTelemetry tracing"""
     
-    def __init__(self, name=None, audit_logger: AuditLogger = None, max_retries=1, wait=0):
-        super().__init__(name, max_retries, wait)
+    def __init__(self, name=None, audit_logger: AuditLogger = None, max_retries=1, wait=0, **kwargs):
+        super().__init__(name, max_retries, wait, **kwargs)
         self.audit_logger = audit_logger
         self.phase_times = {}
     
@@ -520,8 +590,8 @@ class AuditedBatchNode(AuditMixin, BatchNode):
 class AuditedFlow(Flow):
     """Flow with audit logging and hierarchical span support"""
     
-    def __init__(self, name=None, audit_logger: AuditLogger = None, start=None):
-        super().__init__(name, start)
+    def __init__(self, name=None, audit_logger: AuditLogger = None, start=None, **kwargs):
+        super().__init__(name, start, **kwargs)
         self.audit_logger = audit_logger
     
     def get_next_node(self, curr, action):
@@ -536,7 +606,7 @@ class AuditedFlow(Flow):
             return super()._run(shared)
         
         self.audit_logger.log_flow_start(self.name, self.__class__.__name__)
-        total_start = time.time()
+        total_start = now_ns()
         
         # Create root span for the flow
         span = self.audit_logger.create_span(
@@ -557,7 +627,7 @@ class AuditedFlow(Flow):
             
             self.after_run(shared)
             
-            total_latency = (time.time() - total_start) * 1000
+            total_latency = elapsed_ms(total_start)
             
             self.audit_logger.log_flow_end(
                 self.name,
@@ -574,7 +644,7 @@ class AuditedFlow(Flow):
             return post_result
             
         except Exception as exc:
-            total_latency = (time.time() - total_start) * 1000
+            total_latency = elapsed_ms(total_start)
             
             self.audit_logger.log_node_error(
                 self.name,
@@ -599,8 +669,8 @@ class AuditedFlow(Flow):
 class AuditedAsyncNode(AsyncAuditMixin, AsyncNode):
     """AsyncNode with audit logging and optional OpenTelemetry tracing"""
     
-    def __init__(self, name=None, audit_logger: AuditLogger = None, max_retries=1, wait=0):
-        super().__init__(name, max_retries, wait)
+    def __init__(self, name=None, audit_logger: AuditLogger = None, max_retries=1, wait=0, **kwargs):
+        super().__init__(name, max_retries, wait, **kwargs)
         self.audit_logger = audit_logger
         self.phase_times = {}
     
@@ -614,8 +684,8 @@ class AuditedAsyncNode(AsyncAuditMixin, AsyncNode):
 class AuditedAsyncBatchNode(AsyncAuditMixin, AsyncBatchNode):
     """AsyncBatchNode with audit logging and optional OpenTelemetry tracing"""
     
-    def __init__(self, name=None, audit_logger: AuditLogger = None, max_retries=1, wait=0):
-        super().__init__(name, max_retries, wait)
+    def __init__(self, name=None, audit_logger: AuditLogger = None, max_retries=1, wait=0, **kwargs):
+        super().__init__(name, max_retries, wait, **kwargs)
         self.audit_logger = audit_logger
         self.phase_times = {}
     
@@ -629,8 +699,9 @@ class AuditedAsyncBatchNode(AsyncAuditMixin, AsyncBatchNode):
 class AuditedAsyncParallelBatchNode(AsyncAuditMixin, AsyncParallelBatchNode):
     """AsyncParallelBatchNode with audit logging and optional OpenTelemetry tracing"""
     
-    def __init__(self, name=None, audit_logger: AuditLogger = None, max_retries=1, wait=0):
-        super().__init__(name, max_retries, wait)
+    def __init__(self, name=None, audit_logger: AuditLogger = None, max_retries=1, wait=0,
+                 max_concurrency=None, ordered=None, error_policy=None, **kwargs):
+        super().__init__(name, max_retries, wait, max_concurrency, ordered, error_policy, **kwargs)
         self.audit_logger = audit_logger
         self.phase_times = {}
     
@@ -644,8 +715,8 @@ class AuditedAsyncParallelBatchNode(AsyncAuditMixin, AsyncParallelBatchNode):
 class AuditedAsyncFlow(AsyncFlow):
     """AsyncFlow with audit logging and hierarchical span support"""
     
-    def __init__(self, name=None, audit_logger: AuditLogger = None, start=None):
-        super().__init__(name, start)
+    def __init__(self, name=None, audit_logger: AuditLogger = None, start=None, **kwargs):
+        super().__init__(name, start, **kwargs)
         self.audit_logger = audit_logger
     
     def get_next_node(self, curr, action):
@@ -660,7 +731,7 @@ class AuditedAsyncFlow(AsyncFlow):
             return await super()._run_async(shared)
         
         self.audit_logger.log_flow_start(self.name, self.__class__.__name__)
-        total_start = time.time()
+        total_start = now_ns()
         
         # Create root span for the flow
         span = self.audit_logger.create_span(
@@ -681,7 +752,7 @@ class AuditedAsyncFlow(AsyncFlow):
             
             await self.after_run_async(shared)
             
-            total_latency = (time.time() - total_start) * 1000
+            total_latency = elapsed_ms(total_start)
             
             self.audit_logger.log_flow_end(
                 self.name,
@@ -698,7 +769,7 @@ class AuditedAsyncFlow(AsyncFlow):
             return post_result
             
         except Exception as exc:
-            total_latency = (time.time() - total_start) * 1000
+            total_latency = elapsed_ms(total_start)
             
             self.audit_logger.log_node_error(
                 self.name,
@@ -0,0 +1,257 @@
+"""Streaming JSONL sink for Agora traces.
+
+JsonlTraceWriter appends one JSON object per line as spans and traces
+finish. Callers only put records on a bounded in-memory queue; a
+background thread serializes them, writes and flushes the file, and rotates
+it by size or age (optionally gzipping rotated files). When the queue is
+full, records are dropped and counted instead of blocking the event loop.
+
+Usage:
+    writer = JsonlTraceWriter("logs/traces.jsonl", max_bytes=50_000_000, compress=True)
+    tracer = Tracer(enable_console=False, sink=writer)
+    ...
+    writer.close()
+"""
+
+import gzip
+import json
+import os
+import queue
+import shutil
+import threading
+import time
+from typing import Any, Dict, Optional
+
+_STOP = object()
+
+
+class _FlushRequest:
+    __slots__ = ("done",)
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+
+
+class JsonlTraceWriter:
+    """Background-thread JSONL writer with rotation and drop accounting."""
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: Optional[int] = 100_000_000,
+        rotate_interval: Optional[float] = None,
+        compress: bool = False,
+        queue_size: int = 10_000,
+        flush_interval: float = 1.0,
+    ):
+        """Initialize the writer and start its thread.
+
+        Args:
+            path: File to append to; rotated files get a timestamp suffix.
+            max_bytes: Rotate once the file reaches this size (None: never).
+            rotate_interval: Rotate after this many seconds (None: never).
+            compress: Gzip files as they are rotated out.
+            queue_size: Records buffered before new ones are dropped.
+            flush_interval: Maximum seconds between flushes to disk.
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.rotate_interval = rotate_interval
+        self.compress = compress
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self._file = None
+        self._opened_at = 0.0
+        self._size = 0
+        self._retry_rotation_at = 0.0
+        self._closed = False
+
+        # Metrics
+        self.written = 0
+        self.dropped = 0
+        self.errors = 0
+        self.rotations = 0
+        self.rotation_errors = 0
+        self.last_error: Optional[str] = None
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name="agora-trace-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, record: Any, **fields: Any) -> bool:
+        """Queue a record without blocking.
+
+        Args:
+            record: A dict, or an object with ``to_dict()`` (serialized on the
+                writer thread, so it must not change after being queued).
+            **fields: Extra keys placed before the record's own.
+
+        Returns:
+            False if the record was dropped because the queue is full.
+        """
+        if self._closed:
+            self.dropped += 1
+            return False
+        try:
+            self._queue.put_nowait((record, fields))
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    # Lets the writer be passed directly as Tracer(on_evict=writer)
+    __call__ = write
+
+    def _open(self) -> None:
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._size = self._file.tell()
+        self._opened_at = time.monotonic()
+
+    def _rotated_name(self) -> str:
+        base = f"{self.path}.{time.strftime('%Y%m%d-%H%M%S')}"
+        name, n = base, 1
+        while os.path.exists(name) or os.path.exists(name + ".gz"):
+            name, n = f"{base}.{n}", n + 1
+        return name
+
+    def _rotate(self) -> None:
+        """Move the file aside and start a new one.
+
+        Whatever fails, writing continues to a reopened ``path``; the
+        failure is counted in rotation_errors and rotation is retried after
+        flush_interval rather than on every line.
+        """
+        self._file.close()
+        self._file = None
+        try:
+            target = self._rotated_name()
+            os.replace(self.path, target)
+            if self.compress:
+                with open(target, "rb") as src, gzip.open(target + ".gz", "wb") as dst:
+                    shutil.copyfileobj(src, dst)
+                os.remove(target)
+            self.rotations += 1
+        except Exception as e:
+            self.rotation_errors += 1
+            self.last_error = repr(e)
+            self._retry_rotation_at = time.monotonic() + self.flush_interval
+        finally:
+            self._open()
+
+    def _due_for_rotation(self) -> bool:
+        if self._size == 0 or time.monotonic() < self._retry_rotation_at:
+            return False
+        if self.max_bytes is not None and self._size >= self.max_bytes:
+            return True
+        return (
+            self.rotate_interval is not None
+            and time.monotonic() - self._opened_at >= self.rotate_interval
+        )
+
+    def _write_line(self, record: Any, fields: Dict[str, Any]) -> None:
+        if self._file is None:
+            self._open()  # a previous reopen failed; try again
+        data = record.to_dict() if hasattr(record, "to_dict") else record
+        if fields:
+            data = {**fields, **data}
+        line = json.dumps(data, default=str) + "\n"
+        self._file.write(line)
+        self._size += len(line)
+        self.written += 1
+
+    def _run(self) -> None:
+        try:
+            self._open()
+        except Exception as e:  # retried by the first write
+            self.errors += 1
+            self.last_error = repr(e)
+        last_flush = time.monotonic()
+        stopping = False
+        while not stopping:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                item = None
+            # Drain whatever else is queued before touching the disk again
+            batch = [] if item is None else [item]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            flush_now = []
+            for entry in batch:
+                if entry is _STOP:
+                    stopping = True
+                    continue
+                if isinstance(entry, _FlushRequest):
+                    flush_now.append(entry)
+                    continue
+                try:
+                    self._write_line(*entry)
+                    if self._due_for_rotation():
+                        self._rotate()
+                except Exception as e:
+                    self.errors += 1
+                    self.last_error = repr(e)
+            try:
+                if self._file is not None and self._due_for_rotation():
+                    self._rotate()
+                now = time.monotonic()
+                if self._file is not None and (
+                    stopping or flush_now or now - last_flush >= self.flush_interval
+                ):
+                    self._file.flush()
+                    last_flush = now
+            except Exception as e:
+                self.errors += 1
+                self.last_error = repr(e)
+            for request in flush_now:
+                request.done.set()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def flush(self, timeout: Optional[float] = 5.0) -> bool:
+        """Block until everything queued so far is written and flushed.
+
+        Meant for shutdown and tests, not the event loop.
+
+        Returns:
+            False if the writer is closed or the timeout expired first.
+        """
+        if self._closed or not self._thread.is_alive():
+            return False
+        request = _FlushRequest()
+        try:
+            self._queue.put(request, timeout=timeout)
+        except queue.Full:
+            return False
+        return request.done.wait(timeout)
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        """Write out queued records and stop the thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def __enter__(self) -> "JsonlTraceWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return write / drop / rotation counters."""
+        return {
+            "written": self.written,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "rotations": self.rotations,
+            "rotation_errors": self.rotation_errors,
+            "last_error": self.last_error,
+            "queued": self._queue.qsize(),
+        }
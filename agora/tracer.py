@@ -1,31 +1,145 @@
 """Lightweight tracing for Agora workflows.
 
 Tracks timing, node status, and custom attributes for each node execution.
-Provides console logging and JSON export capabilities.
+Provides console logging and JSON export capabilities. Console lines go
+through the ``agora.tracer`` logger and agora.console's background thread,
+never straight to stdout.
+
+The trace and span stack of the run in progress live in context variables,
+so one Tracer can follow many concurrent runs (one per asyncio task).
 """
 
+import contextvars
+import itertools
 import json
-import time
+import logging
+import sys
+import warnings
+from collections import deque
 from contextlib import contextmanager
-from dataclasses import asdict, dataclass, field
-from typing import Any, Dict, List, Optional
-
-
-@dataclass
-class NodeSpan:
-    """Represents a single node execution trace."""
-
-    node_name: str
-    node_type: str
-    start_time: float
-    end_time: Optional[float] = None
-    duration_ms: Optional[float] = None
-    status: str = "running"
-    action: Optional[str] = None
-    error: Optional[str] = None
-    attributes: Dict[str, Any] = field(default_factory=dict)
-    parent_span_id: Optional[str] = None
-    span_id: str = field(default_factory=lambda: f"span_{id(object())}")
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple, Union
+
+from . import console
+from .clock import ClockAnchor, elapsed_ms, now_ns, process_anchor
+
+# Process-unique, monotonic ids; id(object()) is reused once the object dies
+_span_ids = itertools.count(1)
+_trace_ids = itertools.count(1)
+
+_intern = sys.intern
+
+
+class _Timed:
+    """Start/end readings from the shared clock, converted to wall time on demand."""
+
+    __slots__ = ("anchor", "start_ns", "end_ns")
+
+    @property
+    def start_time(self) -> float:
+        """Start as epoch seconds."""
+        return self.anchor.wall_time(self.start_ns)
+
+    @start_time.setter
+    def start_time(self, value: float) -> None:
+        self.start_ns = self.anchor.ns_at(value)
+
+    @property
+    def end_time(self) -> Optional[float]:
+        """End as epoch seconds, or None while running."""
+        return self.anchor.wall_time(self.end_ns) if self.end_ns is not None else None
+
+    @end_time.setter
+    def end_time(self, value: Optional[float]) -> None:
+        self.end_ns = self.anchor.ns_at(value) if value is not None else None
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        """Monotonic duration in milliseconds, or None while running."""
+        return elapsed_ms(self.start_ns, self.end_ns) if self.end_ns is not None else None
+
+    @duration_ms.setter
+    def duration_ms(self, value: Optional[float]) -> None:
+        self.end_ns = self.start_ns + round(value * 1e6) if value is not None else None
+
+    def _set_wall_times(
+        self, start_time: Optional[float], end_time: Optional[float], duration_ms: Optional[float]
+    ) -> None:
+        """Apply times passed the pre-anchor way (epoch seconds / milliseconds)."""
+        if start_time is not None:
+            self.start_time = start_time
+        if end_time is not None:
+            self.end_time = end_time
+        elif duration_ms is not None:
+            self.duration_ms = duration_ms
+
+
+class NodeSpan(_Timed):
+    """Represents a single node execution trace.
+
+    Spans are slotted and their attributes dict is only allocated when
+    something is stored in it, to keep long traces compact. Node names and
+    types are interned, so repeated spans of a node share one string.
+    Times are perf_counter_ns readings relative to the trace's anchor;
+    start_time / end_time (epoch seconds) and duration_ms can still be
+    passed and set, and are converted through the anchor.
+    """
+
+    __slots__ = (
+        "node_name",
+        "node_type",
+        "status",
+        "action",
+        "error",
+        "_attributes",
+        "parent_span_id",
+        "span_id",
+    )
+
+    def __init__(
+        self,
+        node_name: str,
+        node_type: str,
+        start_time: Optional[float] = None,
+        end_time: Optional[float] = None,
+        duration_ms: Optional[float] = None,
+        status: str = "running",
+        action: Optional[str] = None,
+        error: Optional[str] = None,
+        attributes: Optional[Dict[str, Any]] = None,
+        parent_span_id: Optional[int] = None,
+        span_id: Optional[int] = None,
+        *,
+        anchor: Optional[ClockAnchor] = None,
+        start_ns: Optional[int] = None,
+        end_ns: Optional[int] = None,
+    ):
+        self.node_name = _intern(node_name)
+        self.node_type = _intern(node_type)
+        self.anchor = anchor or process_anchor
+        self.start_ns = now_ns() if start_ns is None else start_ns
+        self.end_ns = end_ns
+        self._set_wall_times(start_time, end_time, duration_ms)
+        self.status = status
+        self.action = action
+        self.error = error
+        self._attributes = attributes or None
+        self.parent_span_id = parent_span_id
+        self.span_id = next(_span_ids) if span_id is None else span_id
+
+    @property
+    def attributes(self) -> Dict[str, Any]:
+        """Custom attributes, created on first access."""
+        if self._attributes is None:
+            self._attributes = {}
+        return self._attributes
+
+    @attributes.setter
+    def attributes(self, value: Dict[str, Any]) -> None:
+        self._attributes = value
+
+    def get_attribute(self, key: str, default: Any = None) -> Any:
+        """Read one attribute without allocating the attributes dict."""
+        return self._attributes.get(key, default) if self._attributes else default
 
     def end(
         self,
@@ -34,91 +148,350 @@ class NodeSpan:
         error: Optional[str] = None,
     ) -> None:
         """Mark the span as complete."""
-        self.end_time = time.time()
-        self.duration_ms = (self.end_time - self.start_time) * 1000
+        self.end_ns = now_ns()
+        self.status = status
+        self.action = action
+        self.error = error
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for serialization (attributes are copied shallowly)."""
+        return {
+            "node_name": self.node_name,
+            "node_type": self.node_type,
+            "start_time": self.start_time,
+            "end_time": self.end_time,
+            "duration_ms": self.duration_ms,
+            "status": self.status,
+            "action": self.action,
+            "error": self.error,
+            "attributes": dict(self._attributes) if self._attributes else {},
+            "parent_span_id": self.parent_span_id,
+            "span_id": self.span_id,
+        }
+
+    def __repr__(self) -> str:
+        return (
+            f"NodeSpan(node_name={self.node_name!r}, span_id={self.span_id}, "
+            f"status={self.status!r}, duration_ms={self.duration_ms})"
+        )
+
+
+class FlowCycle(_Timed):
+    """One engine cycle of a flow run; spans[span_start:span_end] belong to it."""
+
+    __slots__ = ("index", "span_start", "span_end", "status", "action", "error")
+
+    def __init__(
+        self,
+        index: int,
+        span_start: int,
+        anchor: Optional[ClockAnchor] = None,
+        start_ns: Optional[int] = None,
+        end_ns: Optional[int] = None,
+        span_end: Optional[int] = None,
+        status: str = "running",
+        action: Optional[str] = None,
+        error: Optional[str] = None,
+    ):
+        self.index = index
+        self.span_start = span_start
+        self.anchor = anchor or process_anchor
+        self.start_ns = now_ns() if start_ns is None else start_ns
+        self.end_ns = end_ns
+        self.span_end = span_end
         self.status = status
         self.action = action
         self.error = error
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for serialization."""
-        return asdict(self)
+        return {
+            "index": self.index,
+            "start_time": self.start_time,
+            "end_time": self.end_time,
+            "duration_ms": self.duration_ms,
+            "span_start": self.span_start,
+            "span_end": self.span_end,
+            "status": self.status,
+            "action": self.action,
+            "error": self.error,
+        }
+
+    def __repr__(self) -> str:
+        return (
+            f"FlowCycle(index={self.index}, spans={self.span_start}:{self.span_end}, "
+            f"status={self.status!r}, duration_ms={self.duration_ms})"
+        )
 
 
-@dataclass
-class FlowTrace:
-    """Represents a complete flow execution trace."""
+class FlowTrace(_Timed):
+    """Represents a complete flow execution trace.
 
-    flow_name: str
-    start_time: float
-    end_time: Optional[float] = None
-    duration_ms: Optional[float] = None
-    status: str = "running"
-    spans: List[NodeSpan] = field(default_factory=list)
-    attributes: Dict[str, Any] = field(default_factory=dict)
-    trace_id: str = field(default_factory=lambda: f"trace_{id(object())}")
+    Each trace reads the wall clock once, into its anchor; its spans are
+    timed with perf_counter_ns against that anchor. Times passed as
+    start_time / end_time / duration_ms are converted through the anchor.
+    """
+
+    __slots__ = ("flow_name", "status", "spans", "cycles", "attributes", "trace_id")
+
+    def __init__(
+        self,
+        flow_name: str,
+        start_time: Optional[float] = None,
+        end_time: Optional[float] = None,
+        duration_ms: Optional[float] = None,
+        status: str = "running",
+        spans: Optional[List[NodeSpan]] = None,
+        attributes: Optional[Dict[str, Any]] = None,
+        trace_id: Optional[str] = None,
+        *,
+        cycles: Optional[List[FlowCycle]] = None,
+        anchor: Optional[ClockAnchor] = None,
+        start_ns: Optional[int] = None,
+        end_ns: Optional[int] = None,
+    ):
+        self.flow_name = _intern(flow_name)
+        self.anchor = anchor or ClockAnchor()
+        self.start_ns = self.anchor.perf_ns if start_ns is None else start_ns
+        self.end_ns = end_ns
+        self._set_wall_times(start_time, end_time, duration_ms)
+        self.status = status
+        self.spans: List[NodeSpan] = spans if spans is not None else []
+        self.cycles: List[FlowCycle] = cycles if cycles is not None else []
+        self.attributes: Dict[str, Any] = attributes if attributes is not None else {}
+        self.trace_id = trace_id or f"trace_{next(_trace_ids)}"
 
     def end(self, status: str = "success") -> None:
         """Mark the trace as complete."""
-        self.end_time = time.time()
-        self.duration_ms = (self.end_time - self.start_time) * 1000
+        self.end_ns = now_ns()
         self.status = status
 
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for serialization."""
-        data = asdict(self)
-        data["spans"] = [span.to_dict() for span in self.spans]
-        return data
+        """Convert to dictionary for serialization (no deep copies)."""
+        return {
+            "flow_name": self.flow_name,
+            "start_time": self.start_time,
+            "end_time": self.end_time,
+            "duration_ms": self.duration_ms,
+            "status": self.status,
+            "spans": [span.to_dict() for span in self.spans],
+            "cycles": [cycle.to_dict() for cycle in self.cycles],
+            "attributes": dict(self.attributes),
+            "trace_id": self.trace_id,
+        }
+
+    def __repr__(self) -> str:
+        return (
+            f"FlowTrace(flow_name={self.flow_name!r}, trace_id={self.trace_id!r}, "
+            f"spans={len(self.spans)}, status={self.status!r})"
+        )
+
+
+class _JsonLine:
+    """Defers json.dumps of a finished span to whoever formats the log record."""
+
+    __slots__ = ("span",)
+
+    def __init__(self, span: NodeSpan):
+        self.span = span
+
+    def __str__(self) -> str:
+        return json.dumps(self.span.to_dict())
 
 
 class Tracer:
     """Lightweight tracer for Agora workflows.
 
     Tracks timing, status, and attributes for node/flow executions.
-    Supports console logging and JSON line export.
+    Supports console logging and JSON line export. For production, pass a
+    sink (e.g. a JsonlTraceWriter) to stream finished spans and traces to
+    disk from a background thread instead of printing them inline.
+
+    Finished and running traces are retained within max_traces, max_spans
+    and max_age; finished traces are evicted in the order they ended and
+    handed to on_evict (e.g. an exporter) if given. Running traces are never
+    evicted: they count toward the limits and become eligible once they end.
+    Starting, ending and evicting traces are O(1) however many runs are in
+    flight.
     """
 
-    def __init__(self, enable_console: bool = True, enable_json: bool = False):
+    def __init__(
+        self,
+        enable_console: bool = True,
+        enable_json: bool = False,
+        max_traces: Optional[int] = 1000,
+        max_spans: Optional[int] = None,
+        max_age: Optional[float] = None,
+        on_evict: Optional[Callable[[FlowTrace], None]] = None,
+        sink: Optional[Any] = None,
+        console_level: Union[int, str] = logging.DEBUG,
+        summary_every: Optional[int] = None,
+    ):
         """Initialize tracer.
 
         Args:
             enable_console: Print human-readable logs to console.
             enable_json: Output JSON lines for each span.
+            max_traces: Maximum traces retained (None for unbounded).
+            max_spans: Maximum spans retained across all traces.
+            max_age: Seconds after its start a finished trace is retained
+                for (checked in the order traces ended, when traces start or
+                end and when max_spans is exceeded). The last retained trace
+                is never evicted for span count or age.
+            on_evict: Called with each finished trace as it is evicted.
+            sink: Object with a non-blocking ``write(record, **fields)``,
+                such as JsonlTraceWriter; receives every finished span and
+                a summary of every finished trace.
+            console_level: Lowest level logged to the console: DEBUG for
+                every node start/finish, INFO for flows, metrics and
+                summaries only, ERROR for failures only.
+            summary_every: Log one INFO line summarizing every N finished
+                spans (use with console_level=INFO under load).
         """
         self.enable_console = enable_console
         self.enable_json = enable_json
-        self.current_trace: Optional[FlowTrace] = None
-        self.traces: List[FlowTrace] = []
-        self._span_stack: List[NodeSpan] = []
+        self.max_traces = max_traces
+        self.max_spans = max_spans
+        self.max_age = max_age
+        self.on_evict = on_evict
+        self.sink = sink
+        if isinstance(console_level, str):
+            console_level = logging.getLevelName(console_level.upper())
+        self.console_level = console_level
+        self.summary_every = summary_every
+        self._summary_spans = 0
+        self._summary_errors = 0
+        self._summary_ms = 0.0
+        self._log = console.get_logger("tracer")
+        if enable_console or enable_json:
+            console.install()
+        self._finished: Deque[FlowTrace] = deque()
+        self._running: Dict[int, FlowTrace] = {}
+        self._retained: set = set()
+        self._span_count = 0
+        self.evicted = 0
+        self._trace_var: contextvars.ContextVar = contextvars.ContextVar(
+            f"agora_trace_{id(self)}", default=None
+        )
+        self._stack_var: contextvars.ContextVar = contextvars.ContextVar(
+            f"agora_span_stack_{id(self)}", default=()
+        )
+
+    @property
+    def current_trace(self) -> Optional[FlowTrace]:
+        """The calling run's trace (None outside any run)."""
+        return self._trace_var.get()
+
+    @current_trace.setter
+    def current_trace(self, trace: Optional[FlowTrace]) -> None:
+        self._trace_var.set(trace)
+
+    @property
+    def traces(self) -> List[FlowTrace]:
+        """Retained traces: finished ones in the order they ended, then running ones."""
+        return [*self._finished, *self._running.values()]
+
+    @property
+    def latest_trace(self) -> Optional[FlowTrace]:
+        """For inspection: the calling run's trace, else the latest running or finished one."""
+        trace = self._trace_var.get()
+        if trace is not None:
+            return trace
+        if self._running:
+            return next(reversed(self._running.values()))
+        return self._finished[-1] if self._finished else None
+
+    @property
+    def _span_stack(self) -> Tuple[NodeSpan, ...]:
+        """Open spans of the calling run, innermost last."""
+        return self._stack_var.get()
 
     def start_flow_trace(self, flow_name: str, **attributes: Any) -> FlowTrace:
-        """Start a new flow trace."""
-        trace = FlowTrace(
-            flow_name=flow_name, start_time=time.time(), attributes=attributes
-        )
+        """Start a new flow trace and make it current for the calling context.
+
+        The previous trace and span stack are not restored afterwards; runs
+        that may be nested in another one should use flow_trace() instead.
+        """
+        trace = self._new_trace(flow_name, attributes)
         self.current_trace = trace
-        self.traces.append(trace)
+        self._stack_var.set(())
+        return trace
+
+    @contextmanager
+    def flow_trace(self, flow_name: str, **attributes: Any):
+        """Context manager starting a flow trace that is current only inside it.
+
+        On exit the caller's trace and span stack are restored, so a run
+        started from inside another run's node doesn't capture that run's
+        later spans. Ending the trace is still up to end_flow_trace().
+
+        Usage:
+            with tracer.flow_trace("my_flow") as trace:
+                ...
+                tracer.end_flow_trace(trace=trace)
+        """
+        trace = self._new_trace(flow_name, attributes)
+        trace_token = self._trace_var.set(trace)
+        stack_token = self._stack_var.set(())
+        try:
+            yield trace
+        finally:
+            self._stack_var.reset(stack_token)
+            self._trace_var.reset(trace_token)
+
+    def _new_trace(self, flow_name: str, attributes: Dict[str, Any]) -> FlowTrace:
+        trace = FlowTrace(flow_name=flow_name, attributes=attributes)
+        self._running[id(trace)] = trace
+        self._retained.add(id(trace))
+        self._enforce_retention()
 
-        if self.enable_console:
-            print(f"[TRACE] Starting flow: {flow_name}")
+        if self.enable_console and self.console_level <= logging.INFO:
+            self._log.info("[TRACE] Starting flow: %s", flow_name)
 
         return trace
 
     def end_flow_trace(
-        self, status: str = "success", error: Optional[str] = None
+        self,
+        status: str = "success",
+        error: Optional[str] = None,
+        trace: Optional[FlowTrace] = None,
     ) -> None:
-        """End the current flow trace."""
-        if self.current_trace:
-            self.current_trace.end(status)
-
-            if self.enable_console:
-                print(
-                    f"[TRACE] Flow completed: {self.current_trace.flow_name} "
-                    f"({self.current_trace.duration_ms:.2f}ms) - {status}"
+        """End the current flow trace (or the given one)."""
+        trace = trace or self.current_trace
+        if trace:
+            trace.end(status)
+            if self._running.pop(id(trace), None) is not None:
+                self._finished.append(trace)
+                self._enforce_retention()
+
+            if self.enable_console and self.console_level <= logging.INFO:
+                self._log.info(
+                    "[TRACE] Flow completed: %s (%.2fms) - %s",
+                    trace.flow_name,
+                    trace.duration_ms,
+                    status,
                 )
 
-            if error and self.enable_console:
-                print(f"[TRACE] Error: {error}")
+            if error and self.enable_console and self.console_level <= logging.ERROR:
+                self._log.error("[TRACE] Error: %s", error)
+
+            if self.sink is not None:
+                # Spans were streamed as they ended; write only the summary
+                self.sink.write(
+                    {
+                        "type": "trace",
+                        "trace_id": trace.trace_id,
+                        "flow_name": trace.flow_name,
+                        "start_time": trace.start_time,
+                        "end_time": trace.end_time,
+                        "duration_ms": trace.duration_ms,
+                        "status": status,
+                        "error": error,
+                        "span_count": len(trace.spans),
+                        "cycles": [cycle.to_dict() for cycle in trace.cycles],
+                        "attributes": dict(trace.attributes),
+                    }
+                )
 
     @contextmanager
     def start_node_span(self, node_name: str, node_type: str, **attributes: Any):
@@ -129,60 +502,127 @@ class Tracer:
                 # execute node logic
                 pass
         """
-        parent_span_id = (
-            self._span_stack[-1].span_id if self._span_stack else None
-        )
+        stack = self._stack_var.get()
+        parent_span_id = stack[-1].span_id if stack else None
+        trace = self.current_trace
 
         span = NodeSpan(
             node_name=node_name,
             node_type=node_type,
-            start_time=time.time(),
+            # Outside a trace, a span gets its own wall-clock reading
+            anchor=trace.anchor if trace else ClockAnchor(),
             parent_span_id=parent_span_id,
             attributes=attributes,
         )
 
-        self._span_stack.append(span)
+        token = self._stack_var.set(stack + (span,))
 
-        if self.current_trace:
-            self.current_trace.spans.append(span)
+        if trace:
+            trace.spans.append(span)
+            if id(trace) in self._retained:
+                self._span_count += 1
+                if self.max_spans is not None and self._span_count > self.max_spans:
+                    self._enforce_retention()
 
-        if self.enable_console:
-            indent = "  " * (len(self._span_stack) - 1)
-            print(f"{indent}[NODE] → {node_name} ({node_type})")
+        if self.enable_console and self.console_level <= logging.DEBUG:
+            self._log.debug("%s[NODE] → %s (%s)", "  " * len(stack), node_name, node_type)
 
         try:
             yield span
         except Exception as e:
             span.end(status="error", error=str(e))
-            if self.enable_console:
-                indent = "  " * (len(self._span_stack) - 1)
-                print(f"{indent}[NODE] ✗ {node_name} - ERROR: {str(e)}")
+            if self.enable_console and self.console_level <= logging.ERROR:
+                self._log.error("%s[NODE] ✗ %s - ERROR: %s", "  " * len(stack), node_name, e)
+            if self.summary_every:
+                self._summarize(span)
+            self._write_span(span, trace)
             raise
         finally:
-            self._span_stack.pop()
+            self._stack_var.reset(token)
+
+    def start_cycle(self, index: int) -> FlowCycle:
+        """Start timing cycle ``index`` of the calling run's flow trace."""
+        trace = self.current_trace
+        cycle = FlowCycle(
+            index=index,
+            span_start=len(trace.spans) if trace else 0,
+            anchor=trace.anchor if trace else None,
+        )
+        if trace:
+            trace.cycles.append(cycle)
+        return cycle
+
+    def end_cycle(
+        self,
+        cycle: FlowCycle,
+        status: str = "success",
+        action: Optional[str] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        """Finish a cycle started with start_cycle()."""
+        cycle.end_ns = now_ns()
+        trace = self.current_trace
+        cycle.span_end = len(trace.spans) if trace else 0
+        cycle.status = status
+        cycle.action = action
+        cycle.error = error
 
     def end_node_span(self, span: NodeSpan, action: Optional[str] = None) -> None:
         """End a node span with an action result."""
         span.end(status="success", action=action)
 
-        if self.enable_console:
-            indent = "  " * len(self._span_stack)
-            action_str = f" → {action}" if action else ""
-            print(
-                f"{indent}[NODE] ✓ {span.node_name} "
-                f"({span.duration_ms:.2f}ms){action_str}"
+        if self.enable_console and self.console_level <= logging.DEBUG:
+            self._log.debug(
+                "%s[NODE] ✓ %s (%.2fms)%s",
+                "  " * len(self._span_stack),
+                span.node_name,
+                span.duration_ms,
+                f" → {action}" if action else "",
             )
 
+        if self.summary_every:
+            self._summarize(span)
+
         if self.enable_json:
-            print(json.dumps(span.to_dict()))
+            # Serialized on the console thread; the span no longer changes
+            self._log.info("%s", _JsonLine(span))
+
+        if self.sink is not None:
+            self._write_span(span, self.current_trace)
+
+    def _summarize(self, span: NodeSpan) -> None:
+        self._summary_spans += 1
+        self._summary_ms += span.duration_ms or 0.0
+        if span.status == "error":
+            self._summary_errors += 1
+        if self._summary_spans >= self.summary_every:
+            if self.enable_console and self.console_level <= logging.INFO:
+                self._log.info(
+                    "[TRACE] %d spans: %d ok, %d errors, avg %.2fms",
+                    self._summary_spans,
+                    self._summary_spans - self._summary_errors,
+                    self._summary_errors,
+                    self._summary_ms / self._summary_spans,
+                )
+            self._summary_spans = self._summary_errors = 0
+            self._summary_ms = 0.0
+
+    def _write_span(self, span: NodeSpan, trace: Optional[FlowTrace]) -> None:
+        if self.sink is not None:
+            # The span is finished, so the sink may serialize it later
+            self.sink.write(
+                span,
+                type="span",
+                trace_id=trace.trace_id if trace else None,
+                flow_name=trace.flow_name if trace else None,
+            )
 
-    def emit_metrics(self) -> Dict[str, Any]:
-        """Emit accumulated metrics for all traces."""
-        if not self.current_trace:
+    def emit_metrics(self, trace: Optional[FlowTrace] = None) -> Dict[str, Any]:
+        """Emit metrics for the given trace (default: latest_trace)."""
+        trace = trace or self.latest_trace
+        if not trace:
             return {}
 
-        trace = self.current_trace
-
         total_nodes = len(trace.spans)
         successful = sum(1 for s in trace.spans if s.status == "success")
         failed = sum(1 for s in trace.spans if s.status == "error")
@@ -196,13 +636,63 @@ class Tracer:
             "trace_id": trace.trace_id,
         }
 
-        if self.enable_console:
-            print("\n[METRICS]")
-            for key, value in metrics.items():
-                print(f"  {key}: {value}")
+        # Engine cycles (agent-loop iterations)
+        if len(trace.cycles) > 1:
+            durations = [c.duration_ms for c in trace.cycles if c.duration_ms is not None]
+            metrics["cycles"] = len(trace.cycles)
+            metrics["avg_cycle_ms"] = round(sum(durations) / len(durations), 3)
+            metrics["max_cycle_ms"] = round(max(durations), 3)
+
+        # Result-cache counters reported by cached nodes
+        cache_hits = sum(s.get_attribute("cache_hits", 0) for s in trace.spans)
+        cache_misses = sum(s.get_attribute("cache_misses", 0) for s in trace.spans)
+        if cache_hits or cache_misses:
+            metrics["cache_hits"] = cache_hits
+            metrics["cache_misses"] = cache_misses
+
+        # Time nodes spent queued behind rate limiters
+        rate_limit_wait = sum(s.get_attribute("rate_limit_wait_ms", 0) for s in trace.spans)
+        if rate_limit_wait:
+            metrics["rate_limit_wait_ms"] = round(rate_limit_wait, 3)
+
+        # Backup attempts fired by hedged nodes
+        hedges = sum(1 for s in trace.spans if s.get_attribute("hedge_fired"))
+        if hedges:
+            metrics["hedges_fired"] = hedges
+            metrics["hedges_won"] = sum(
+                1 for s in trace.spans if s.get_attribute("hedge_winner") == "hedge"
+            )
+
+        if self.enable_console and self.console_level <= logging.INFO:
+            lines = "".join(f"\n  {key}: {value}" for key, value in metrics.items())
+            self._log.info("\n[METRICS]%s", lines)
 
         return metrics
 
+    def _evict(self, trace: FlowTrace) -> None:
+        self._retained.discard(id(trace))
+        self._span_count -= len(trace.spans)
+        self.evicted += 1
+        if self.on_evict is not None:
+            try:
+                self.on_evict(trace)
+            except Exception as e:
+                warnings.warn(f"Tracer on_evict failed: {e!r}")
+
+    def _enforce_retention(self) -> None:
+        """Evict the oldest finished traces until every retention limit holds."""
+        finished = self._finished
+        cutoff = now_ns() - int(self.max_age * 1e9) if self.max_age is not None else None
+        while finished:
+            retained = len(finished) + len(self._running)
+            if self.max_traces is None or retained <= self.max_traces:
+                if retained == 1:
+                    break  # the last trace stays for span count and age
+                over_spans = self.max_spans is not None and self._span_count > self.max_spans
+                if not over_spans and (cutoff is None or finished[0].start_ns >= cutoff):
+                    break
+            self._evict(finished.popleft())
+
     def get_trace_data(self) -> List[Dict[str, Any]]:
         """Get all trace data as dictionaries."""
         return [trace.to_dict() for trace in self.traces]
@@ -215,5 +705,8 @@ class Tracer:
     def reset(self) -> None:
         """Reset tracer state."""
         self.current_trace = None
-        self.traces = []
-        self._span_stack = []
+        self._stack_var.set(())
+        self._finished = deque()
+        self._running = {}
+        self._retained = set()
+        self._span_count = 0
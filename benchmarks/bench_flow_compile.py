@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Flow / AsyncFlow orchestration before and after compile().
+
+Runs a two-node loop (step -> check -> step ...) for 10k iterations and
+prints steps/sec for the default per-step-copy orchestration and for the
+compiled transition table.
+
+Usage:
+    python benchmarks/bench_flow_compile.py [iterations]
+
+Each node step is counted once; the final Done step is ignored.
+"""
+
+import asyncio
+import sys
+import time
+
+from agora import Node, Flow, AsyncNode, AsyncFlow
+
+
+class Step(Node):
+    def exec(self, prep_res):
+        return prep_res
+
+    def prep(self, shared):
+        shared["i"] += 1
+        return shared["i"]
+
+
+class Check(Node):
+    def exec(self, prep_res):
+        return prep_res
+
+    def prep(self, shared):
+        return shared["i"]
+
+    def post(self, shared, prep_res, exec_res):
+        return "loop" if exec_res < shared["n"] else "done"
+
+
+class Done(Node):
+    def exec(self, prep_res):
+        return "done"
+
+
+class AsyncStep(AsyncNode):
+    async def prep_async(self, shared):
+        shared["i"] += 1
+        return shared["i"]
+
+    async def exec_async(self, prep_res):
+        return prep_res
+
+
+class AsyncCheck(AsyncNode):
+    async def prep_async(self, shared):
+        return shared["i"]
+
+    async def exec_async(self, prep_res):
+        return prep_res
+
+    async def post_async(self, shared, prep_res, exec_res):
+        return "loop" if exec_res < shared["n"] else "done"
+
+
+class AsyncDone(AsyncNode):
+    async def exec_async(self, prep_res):
+        return "done"
+
+
+def build_sync():
+    step, check = Step(), Check()
+    step >> check
+    check - "loop" >> step
+    check - "done" >> Done()
+    return Flow(start=step)
+
+
+def build_async():
+    step, check = AsyncStep(), AsyncCheck()
+    step >> check
+    check - "loop" >> step
+    check - "done" >> AsyncDone()
+    return AsyncFlow(start=step)
+
+
+def bench_sync(flow, n):
+    shared = {"i": 0, "n": n}
+    start = time.perf_counter()
+    flow.run(shared)
+    return 2 * n / (time.perf_counter() - start)
+
+
+def bench_async(flow, n):
+    shared = {"i": 0, "n": n}
+    start = time.perf_counter()
+    asyncio.run(flow.run_async(shared))
+    return 2 * n / (time.perf_counter() - start)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+
+    print(f"Looping flow, {n} iterations ({2 * n} node steps)")
+    print("-" * 60)
+    for label, build, bench in (("Flow", build_sync, bench_sync),
+                                ("AsyncFlow", build_async, bench_async)):
+        before = bench(build(), n)
+        after = bench(build().compile(), n)
+        print(f"{label:<10} default : {before:>12,.0f} steps/sec")
+        print(f"{label:<10} compiled: {after:>12,.0f} steps/sec  ({after / before:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
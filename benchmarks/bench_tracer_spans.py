@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Tracer span memory and throughput.
+
+Records a million node spans (1,000 traces x 1,000 spans) through
+Tracer.start_node_span / end_node_span, the same path EventEngine uses,
+and prints retained bytes per span and spans/sec. The same workload is
+repeated with a replica of the previous dataclass-based NodeSpan for
+comparison, and FlowTrace.to_dict() is timed against dataclasses.asdict().
+
+Usage:
+    python benchmarks/bench_tracer_spans.py [spans]
+"""
+
+import gc
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Optional
+
+from agora import tracer as tracer_module
+from agora.tracer import NodeSpan, Tracer
+
+SPANS_PER_TRACE = 1_000
+NODE_NAMES = [f"node_{i}" for i in range(10)]
+
+
+@dataclass
+class DataclassSpan:
+    """The NodeSpan layout before slots and the shared clock (for comparison)."""
+
+    node_name: str
+    node_type: str
+    anchor: Any = None  # accepted for Tracer's constructor call, unused
+    start_time: float = field(default_factory=time.time)
+    end_time: Optional[float] = None
+    duration_ms: Optional[float] = None
+    status: str = "running"
+    action: Optional[str] = None
+    error: Optional[str] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    parent_span_id: Optional[str] = None
+    span_id: str = field(default_factory=lambda: f"span_{id(object())}")
+
+    def end(self, status="success", action=None, error=None):
+        self.end_time = time.time()
+        self.duration_ms = (self.end_time - self.start_time) * 1000
+        self.status = status
+        self.action = action
+        self.error = error
+
+
+def record(n, measure_memory):
+    """Record n spans; return (tracer, seconds, retained bytes or None)."""
+    tracer = Tracer(enable_console=False, max_traces=None)
+    gc.collect()
+    if measure_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    for t in range(n // SPANS_PER_TRACE):
+        tracer.start_flow_trace("bench_flow")
+        for i in range(SPANS_PER_TRACE):
+            # Names are built per span, as f"{cls}_{id}" names are in real flows
+            name = "".join(("node_", str(i % 10)))
+            with tracer.start_node_span(name, "AsyncNode", retry=0) as span:
+                tracer.end_node_span(span, action="default")
+        tracer.end_flow_trace()
+    elapsed = time.perf_counter() - start
+    retained = None
+    if measure_memory:
+        gc.collect()
+        retained, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return tracer, elapsed, retained
+
+
+def best_of(fn, repeat=5):
+    gc.disable()
+    try:
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - start)
+        return min(times)
+    finally:
+        gc.enable()
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    print(f"Tracer spans, {n:,} spans in {n // SPANS_PER_TRACE:,} traces")
+    print("-" * 60)
+
+    results = {}
+    for label, span_cls in (("dataclass", DataclassSpan), ("slots", NodeSpan)):
+        tracer_module.NodeSpan = span_cls
+        try:
+            # Throughput without tracemalloc overhead, then retained memory
+            tracer, elapsed, _ = record(n, measure_memory=False)
+            del tracer
+            tracer, _, retained = record(n, measure_memory=True)
+        finally:
+            tracer_module.NodeSpan = NodeSpan
+        # Keep one trace for the to_dict comparison; drop the rest so the
+        # next run isn't slowed by GC walking these spans
+        results[label] = (tracer.traces[-1], elapsed, retained)
+        del tracer
+        print(
+            f"{label:<10}: {retained / n:>8.1f} bytes/span   "
+            f"{n / elapsed:>12,.0f} spans/sec"
+        )
+
+    before, after = results["dataclass"][2], results["slots"][2]
+    print(f"memory: {before / after:.2f}x smaller")
+
+    trace, legacy = results["slots"][0], results["dataclass"][0]
+    fast = best_of(trace.to_dict)
+    slow = best_of(lambda: [asdict(span) for span in legacy.spans])
+    print(
+        f"to_dict of {SPANS_PER_TRACE:,} spans: {fast * 1000:.2f}ms "
+        f"(asdict: {slow * 1000:.2f}ms, {slow / fast:.1f}x faster)"
+    )
+
+
+if __name__ == "__main__":
+    main()
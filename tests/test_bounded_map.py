@@ -0,0 +1,164 @@
+import asyncio
+
+import pytest
+
+from agora import AsyncParallelBatchNode, BatchError, _bounded_map
+
+
+@pytest.mark.parametrize("limit", [1, 3, 50])
+async def test_ordered_results_follow_input_order(limit):
+    async def square(x):
+        await asyncio.sleep(0.001 * (5 - x % 5))
+        return x * x
+
+    assert await _bounded_map(square, range(20), limit) == [x * x for x in range(20)]
+
+
+async def test_unordered_returns_completion_order():
+    async def delayed(x):
+        await asyncio.sleep(0.01 * x)
+        return x
+
+    assert await _bounded_map(delayed, [3, 1, 2], 3, ordered=False) == [1, 2, 3]
+
+
+async def test_concurrency_is_bounded_and_items_pulled_lazily():
+    in_flight = peak = pulled = 0
+
+    def items():
+        nonlocal pulled
+        for i in range(100):
+            pulled += 1
+            yield i
+
+    async def work(x):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        assert pulled - x <= 4  # never more than `limit` items ahead
+        return x
+
+    assert await _bounded_map(work, items(), 4) == list(range(100))
+    assert peak <= 4
+
+
+async def test_async_iterable_source():
+    async def source():
+        for i in range(10):
+            yield i
+
+    async def ident(x):
+        return x
+
+    assert await _bounded_map(ident, source(), 3) == list(range(10))
+
+
+async def test_cancelling_the_map_cancels_its_workers():
+    cancelled = []
+
+    async def work(x):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(x)
+            raise
+
+    task = asyncio.ensure_future(_bounded_map(work, range(10), 3))
+    await asyncio.sleep(0.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert sorted(cancelled) == [0, 1, 2]
+
+
+async def _double(x):
+    await asyncio.sleep(0.001 * (x % 3))
+    if x % 5 == 4:
+        raise ValueError(x)
+    return x * 2
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+async def test_fail_fast_cancels_in_flight_items(ordered):
+    started, cancelled = [], []
+
+    async def work(x):
+        started.append(x)
+        if x == 0:
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(x)
+            raise
+
+    counts = {}
+    with pytest.raises(ValueError, match="boom"):
+        await asyncio.wait_for(_bounded_map(work, range(100), 4, ordered, counts=counts), 2)
+    assert sorted(started) == [0, 1, 2, 3]  # nothing new was pulled after the failure
+    assert sorted(cancelled) == [1, 2, 3]
+    assert counts == {"completed": 0, "failed": 1, "cancelled": 3}
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+async def test_collect_raises_batch_error_after_every_item(ordered):
+    counts = {}
+    with pytest.raises(BatchError) as info:
+        await _bounded_map(_double, range(10), 3, ordered, "collect", counts)
+    assert sorted(info.value.errors) == [4, 9]
+    assert all(isinstance(e, ValueError) for e in info.value.errors.values())
+    if ordered:
+        assert info.value.results == [0, 2, 4, 6, None, 10, 12, 14, 16, None]
+    else:
+        assert sorted(info.value.results) == [0, 2, 4, 6, 10, 12, 14, 16]
+    assert counts == {"completed": 8, "failed": 2, "cancelled": 0}
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+async def test_best_effort_skips_failures(ordered):
+    results = await _bounded_map(_double, range(10), 3, ordered, "best_effort")
+    if ordered:
+        assert results == [0, 2, 4, 6, None, 10, 12, 14, 16, None]
+    else:
+        assert sorted(results) == [0, 2, 4, 6, 10, 12, 14, 16]
+
+
+async def test_unknown_error_policy():
+    with pytest.raises(ValueError, match="errors must be one of"):
+        await _bounded_map(_double, [], 1, errors="ignore")
+
+
+class Doubler(AsyncParallelBatchNode):
+    async def prep_async(self, shared):
+        return shared["items"]
+
+    async def exec_async(self, item):
+        return await _double(item)
+
+    async def post_async(self, shared, prep_res, exec_res):
+        shared["results"] = exec_res
+
+
+async def test_parallel_batch_node_reports_item_counts():
+    shared = {"items": range(10)}
+    node = Doubler(max_concurrency=3, error_policy="best_effort")
+    await node.run_async(shared)
+    assert shared["results"] == [0, 2, 4, 6, None, 10, 12, 14, 16, None]
+    assert node.trace_attributes["batch_completed"] == 8
+    assert node.trace_attributes["batch_failed"] == 2
+
+
+async def test_cancelled_items_are_counted():
+    async def work(x):
+        await asyncio.sleep(10)
+
+    counts = {}
+    task = asyncio.ensure_future(_bounded_map(work, range(10), 3, counts=counts))
+    await asyncio.sleep(0.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert counts == {"completed": 0, "failed": 0, "cancelled": 3}
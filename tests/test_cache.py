@@ -0,0 +1,77 @@
+import os
+import subprocess
+import sys
+import time
+
+from agora import Node
+from agora.cache import SQLiteCache, cache_key, stable_hash
+
+
+def test_stable_hash_ignores_order_but_not_types():
+    assert stable_hash({"a": 1, "b": [1, 2]}) == stable_hash({"b": [1, 2], "a": 1})
+    assert stable_hash({3, 1, 2}) == stable_hash({1, 2, 3})
+    assert stable_hash((1, 2)) != stable_hash([1, 2])
+    assert stable_hash({1: "x"}) != stable_hash({"1": "x"})
+    assert stable_hash(1) != stable_hash(1.0) != stable_hash(True)
+    assert stable_hash(lambda: None) is None
+
+
+def test_stable_hash_does_not_depend_on_hash_seed():
+    code = "from agora.cache import stable_hash; print(stable_hash({'k': {'a', 'b', 'c'}}))"
+    digests = {
+        subprocess.run(
+            [sys.executable, "-c", code],
+            env={**os.environ, "PYTHONHASHSEED": seed},
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+        for seed in ("1", "2", "3")
+    }
+    assert digests == {stable_hash({"k": {"a", "b", "c"}})}
+
+
+def test_sqlite_cache_survives_reopening(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = SQLiteCache(path)
+    cache.set("k", {"v": [1, 2]})
+    cache.set("unpicklable", lambda: None)  # skipped, not an error
+    cache.close()
+
+    cache = SQLiteCache(path)
+    assert cache.get("k") == (True, {"v": [1, 2]})
+    assert cache.get("unpicklable") == (False, None)
+    assert cache.stats() == {"hits": 1, "misses": 1}
+    cache.clear()
+    assert cache.get("k") == (False, None)
+
+
+def test_sqlite_cache_entries_expire():
+    cache = SQLiteCache(":memory:", ttl=0.05)
+    cache.set("k", 1)
+    assert cache.get("k") == (True, 1)
+    time.sleep(0.1)
+    assert cache.get("k") == (False, None)
+
+
+class Double(Node):
+    def prep(self, shared):
+        return shared["x"]
+
+    def exec(self, x):
+        Double.calls += 1
+        return x * 2
+
+    def post(self, shared, prep_res, exec_res):
+        shared["y"] = exec_res
+
+
+def test_nodes_reuse_results_from_disk(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    Double.calls = 0
+    for _ in range(2):  # a fresh node and backend each time, as after a restart
+        shared = {"x": 21}
+        Double(cache=SQLiteCache(path)).run(shared)
+        assert shared["y"] == 42
+    assert Double.calls == 1
+    assert cache_key(Double(), 21) == cache_key(Double(), 21)
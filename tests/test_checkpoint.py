@@ -0,0 +1,158 @@
+import pytest
+
+from agora import AsyncBatchFlow, AsyncFlow, AsyncNode, AsyncParallelBatchFlow
+from agora.checkpoint import FileCheckpointStore, SQLiteCheckpointStore
+from agora.engine import EventEngine
+from agora.tracer import Tracer
+
+
+class Step(AsyncNode):
+    """Counts its runs in shared; raises in post while `crash_at` names it."""
+
+    crash_at = None
+    ran = []
+
+    async def exec_async(self, prep_res):
+        return 1
+
+    async def post_async(self, shared, prep_res, exec_res):
+        Step.ran.append(self.name)
+        if self.name == Step.crash_at:
+            raise RuntimeError(f"crashed at {self.name}")
+        shared[self.name] = shared.get("total", 0) + 1
+        shared["total"] = shared[self.name]
+
+
+def _chain(n=5):
+    nodes = [Step(f"n{i}", max_retries=1) for i in range(n)]
+    for a, b in zip(nodes, nodes[1:]):
+        a >> b
+    return nodes[0]
+
+
+@pytest.fixture(autouse=True)
+def _reset_steps():
+    Step.crash_at, Step.ran = None, []
+    yield
+    Step.crash_at, Step.ran = None, []
+
+
+@pytest.fixture(params=["file", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "file":
+        return FileCheckpointStore(str(tmp_path / "checkpoints"))
+    return SQLiteCheckpointStore(str(tmp_path / "checkpoints.sqlite"))
+
+
+async def test_resume_continues_after_the_last_completed_node(store):
+    flow = AsyncFlow(start=_chain())
+    flow.checkpoint_store = store
+    Step.crash_at = "n3"
+    with pytest.raises(RuntimeError, match="crashed at n3"):
+        await flow.run_async({})
+    execution_id = flow.execution_id
+    assert [record["node"] for record in store.load(execution_id)] == ["n0", "n1", "n2"]
+
+    Step.crash_at, Step.ran = None, []
+    resumed = AsyncFlow(start=_chain())
+    resumed.checkpoint_store = store
+    shared = {}
+    await resumed.resume(execution_id, shared)
+    assert Step.ran == ["n3", "n4"]
+    assert shared == {"n0": 1, "n1": 2, "n2": 3, "n3": 4, "n4": 5, "total": 5}
+
+
+async def test_resuming_a_finished_run_does_nothing(store):
+    flow = AsyncFlow(start=_chain(2))
+    flow.checkpoint_store = store
+    await flow.run_async({})
+    Step.ran = []
+    await flow.resume(flow.execution_id, {})
+    assert Step.ran == []
+
+
+async def test_resume_needs_a_store():
+    with pytest.raises(ValueError):
+        await AsyncFlow(start=_chain()).resume("missing")
+
+
+async def test_engine_exposes_the_execution_id_of_a_failed_run():
+    engine = EventEngine(
+        tracer=Tracer(enable_console=False),
+        checkpoint_store=SQLiteCheckpointStore(":memory:"),
+        max_retries=0,
+    )
+    flow = AsyncFlow(start=_chain())
+    Step.crash_at = "n2"
+    with pytest.raises(RuntimeError) as info:
+        await engine.run_flow(flow, {})
+    execution_id = info.value.execution_id
+
+    Step.crash_at, Step.ran = None, []
+    shared = {}
+    action, metrics = await engine.resume(flow, execution_id, shared)
+    assert Step.ran == ["n2", "n3", "n4"]
+    assert shared["total"] == 5
+    assert metrics["execution_id"] == execution_id
+
+
+async def test_engine_accepts_a_caller_execution_id_once():
+    engine = EventEngine(
+        tracer=Tracer(enable_console=False), checkpoint_store=SQLiteCheckpointStore(":memory:")
+    )
+    _, metrics = await engine.run_flow(AsyncFlow(start=_chain(2)), {}, execution_id="job-1")
+    assert metrics["execution_id"] == "job-1"
+    with pytest.raises(ValueError):
+        await engine.run_flow(AsyncFlow(start=_chain(2)), {}, execution_id="job-1")
+
+
+class Item(AsyncNode):
+    """Records the item it ran on; raises while `crash_on` names the item."""
+
+    crash_on = None
+    ran = []
+
+    async def prep_async(self, shared):
+        return shared["item"]
+
+    async def exec_async(self, item):
+        return item * 10
+
+    async def post_async(self, shared, item, exec_res):
+        Item.ran.append(item)
+        if item == Item.crash_on:
+            raise RuntimeError(f"crashed on {item}")
+        shared[f"wrote_{item}"] = exec_res
+        return exec_res
+
+
+def _batch_flow(flow_class, store):
+    flow = flow_class(start=Item(max_retries=1))
+    flow.checkpoint_store, flow.merge_shared = store, True
+    return flow
+
+
+@pytest.mark.parametrize("flow_class", [AsyncBatchFlow, AsyncParallelBatchFlow])
+async def test_batch_flow_resume_reruns_only_unfinished_items(store, flow_class):
+    Item.crash_on, Item.ran = 2, []
+    flow = _batch_flow(flow_class, store)
+    with pytest.raises(RuntimeError, match="crashed on 2"):
+        await flow.run_async({"items": [0, 1, 2, 3]})
+    records = store.load(flow.execution_id)
+    assert [r["step"] for r in records] == list(range(len(records)))
+    assert all(r["next_id"] >= 0 for r in records)
+
+    finished = set(Item.ran) - {2}
+    Item.crash_on, Item.ran = None, []
+    shared = {}
+    await _batch_flow(flow_class, store).resume(flow.execution_id, shared)
+    assert sorted(Item.ran) == sorted({0, 1, 2, 3} - finished)
+    assert shared["batch_results"] == [0, 10, 20, 30]
+    assert {k: v for k, v in shared.items() if k.startswith("wrote_")} == {
+        "wrote_0": 0, "wrote_1": 10, "wrote_2": 20, "wrote_3": 30,
+    }
+    assert not any(k.startswith("_agora") for k in shared)
+
+    Item.ran = []
+    await _batch_flow(flow_class, store).resume(flow.execution_id, {})
+    assert Item.ran == []  # finished
@@ -0,0 +1,51 @@
+import sys
+
+import pytest
+
+from agora import AsyncFlow, AsyncNode
+from agora.engine import EventEngine
+from agora.tracer import Tracer
+
+
+class Loop(AsyncNode):
+    """Asks for another cycle until shared["remaining"] runs out."""
+
+    async def prep_async(self, shared):
+        return shared["remaining"]
+
+    async def exec_async(self, remaining):
+        return remaining
+
+    async def post_async(self, shared, prep_res, exec_res):
+        shared["remaining"] = prep_res - 1
+        shared["_recurse_flow"] = prep_res > 1
+        return "again" if prep_res > 1 else "done"
+
+
+def _engine(**kwargs):
+    return EventEngine(tracer=Tracer(enable_console=False), **kwargs)
+
+
+async def test_cycles_do_not_grow_the_stack():
+    cycles = sys.getrecursionlimit() + 100
+    engine = _engine(max_cycles=cycles)
+    shared = {"remaining": cycles}
+    action, _ = await engine.run_flow(AsyncFlow(start=Loop()), shared)
+    assert action == "done" and shared["remaining"] == 0
+
+
+async def test_each_cycle_is_recorded_on_the_trace():
+    engine = _engine()
+    await engine.run_flow(AsyncFlow(name="agent", start=Loop()), {"remaining": 3})
+    trace = engine.tracer.latest_trace
+    assert [c.index for c in trace.cycles] == [0, 1, 2]
+    assert [c.action for c in trace.cycles] == ["again", "again", "done"]
+    assert all(c.status == "success" and c.duration_ms >= 0 for c in trace.cycles)
+    assert [c.span_end - c.span_start for c in trace.cycles] == [1, 1, 1]
+
+
+async def test_max_cycles_stops_runaway_loops():
+    engine = _engine(max_cycles=5)
+    with pytest.raises(RuntimeError, match="maximum cycles"):
+        await engine.run_flow(AsyncFlow(start=Loop()), {"remaining": 10})
+    assert len(engine.tracer.latest_trace.cycles) == 5
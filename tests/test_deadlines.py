@@ -0,0 +1,108 @@
+import asyncio
+import time
+
+import pytest
+
+from agora import AsyncFlow, AsyncNode, DeadlineExceeded
+from agora.engine import EventEngine
+from agora.tracer import Tracer
+
+
+class Slow(AsyncNode):
+    """Sleeps `delay` seconds per attempt and counts its attempts."""
+
+    def __init__(self, delay, **kwargs):
+        super().__init__(**kwargs)
+        self.delay = delay
+        self.attempts = 0
+
+    async def exec_async(self, prep_res):
+        self.attempts += 1
+        await asyncio.sleep(self.delay)
+        return "done"
+
+    async def post_async(self, shared, prep_res, exec_res):
+        shared.setdefault("results", []).append(exec_res)
+
+
+class WithFallback(Slow):
+    async def exec_fallback_async(self, prep_res, exc):
+        return f"fallback:{type(exc).__name__}"
+
+
+async def test_timed_out_attempts_are_retried_then_fall_back():
+    node = WithFallback(1, timeout=0.02, max_retries=3)
+    shared = {}
+    await node.run_async(shared)
+    assert node.attempts == 3
+    assert shared["results"] == ["fallback:TimeoutError"]
+
+
+async def test_timeout_leaves_fast_attempts_alone():
+    node = WithFallback(0, timeout=1)
+    shared = {}
+    await node.run_async(shared)
+    assert shared["results"] == ["done"]
+
+
+async def test_flow_deadline_cancels_the_running_node():
+    first, second = Slow(0.2), Slow(0.2)
+    first >> second
+    started = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        await AsyncFlow(start=first, deadline=0.3).run_async({})
+    assert time.monotonic() - started < 0.45
+
+
+async def test_deadline_stops_retries():
+    class Stuck(AsyncNode):
+        attempts = 0
+
+        async def exec_async(self, prep_res):
+            type(self).attempts += 1
+            await asyncio.sleep(1)
+
+    started = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        await AsyncFlow(start=Stuck(max_retries=5), deadline=0.05).run_async({})
+    assert time.monotonic() - started < 0.5
+    assert Stuck.attempts == 1
+
+
+async def test_no_retry_when_backoff_would_pass_the_deadline():
+    class Failing(AsyncNode):
+        attempts = 0
+
+        async def exec_async(self, prep_res):
+            type(self).attempts += 1
+            raise RuntimeError("flaky")
+
+        async def exec_fallback_async(self, prep_res, exc):
+            return repr(exc)
+
+        async def post_async(self, shared, prep_res, exec_res):
+            shared["result"] = exec_res
+
+    shared = {}
+    started = time.monotonic()
+    await AsyncFlow(start=Failing(max_retries=5, wait=1), deadline=0.2).run_async(shared)
+    assert time.monotonic() - started < 0.5
+    assert Failing.attempts == 1
+    assert shared["result"] == "RuntimeError('flaky')"
+
+
+async def test_nested_flow_inherits_the_tighter_deadline():
+    inner = AsyncFlow(start=Slow(1), deadline=10)
+    started = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        await AsyncFlow(start=inner, deadline=0.05).run_async({})
+    assert time.monotonic() - started < 0.5
+
+
+async def test_engine_deadline():
+    engine = EventEngine(tracer=Tracer(enable_console=False))
+    with pytest.raises(DeadlineExceeded):
+        await engine.run_flow(AsyncFlow(start=Slow(1)), {}, deadline=0.05)
+    shared = {}
+    await engine.run_flow(AsyncFlow(start=Slow(0)), shared, deadline=1)
+    assert shared["results"] == ["done"]
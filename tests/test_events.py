@@ -0,0 +1,75 @@
+import asyncio
+
+from agora import AsyncFlow, AsyncNode
+from agora.engine import EventEngine
+from agora.events import Event, EventBus
+from agora.retry import RetryPolicy
+from agora.tracer import Tracer
+
+
+async def test_slow_subscribers_drop_their_oldest_events():
+    bus = EventBus(maxsize=3)
+    slow, fast = bus.subscribe(), bus.subscribe(maxsize=10)
+    for i in range(5):
+        bus.publish(Event(type="tick", data={"i": i}))
+    assert slow.stats() == {"delivered": 0, "dropped": 2, "lag": 3}
+    assert (await slow.__anext__()).data == {"i": 2}
+    assert fast.lag == 5
+    assert bus.stats()["dropped"] == 2 and bus.stats()["max_lag"] == 5
+
+
+async def test_subscribers_filter_by_type_and_end_on_close():
+    bus = EventBus()
+    sub = bus.subscribe(types={"error"})
+    received = []
+
+    async def read():
+        async for event in sub:
+            received.append(event.type)
+
+    reader = asyncio.ensure_future(read())
+    await asyncio.sleep(0)  # reader is now waiting
+    bus.publish(Event(type="node_end"))
+    bus.publish(Event(type="error"))
+    bus.close()
+    await asyncio.wait_for(reader, 1)
+    assert received == ["error"]
+    assert not bus.has_subscribers
+
+
+class Flaky(AsyncNode):
+    async def prep_async(self, shared):
+        return shared
+
+    async def exec_async(self, shared):
+        shared["attempts"] = shared.get("attempts", 0) + 1
+        if shared["attempts"] == 1:
+            raise ValueError("flaky")
+        return "ok"
+
+    async def post_async(self, shared, prep_res, exec_res):
+        return exec_res
+
+
+async def test_engine_publishes_lifecycle_events():
+    engine = EventEngine(
+        tracer=Tracer(enable_console=False),
+        retry_policy=RetryPolicy(max_attempts=2, base_delay=0),
+    )
+    async with engine.events.subscribe() as events:
+        await engine.run_flow(AsyncFlow(name="f", start=Flaky(name="flaky")), {})
+        engine.events.close()
+        received = [event async for event in events]
+
+    assert [e.type for e in received] == [
+        "flow_start", "node_start", "node_end", "retry", "node_start", "node_end", "flow_end",
+    ]
+    assert {e.flow_name for e in received} == {"f"}
+    assert len({e.run_id for e in received}) == 1
+    assert received[2].data["status"] == "error" and received[-2].data["action"] == "ok"
+
+
+async def test_publishing_without_subscribers_is_skipped():
+    engine = EventEngine(tracer=Tracer(enable_console=False))
+    await engine.run_flow(AsyncFlow(start=Flaky()), {"attempts": 1})
+    assert engine.events.published == 0
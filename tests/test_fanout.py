@@ -0,0 +1,181 @@
+import asyncio
+import time
+
+import pytest
+
+from agora import AsyncFlow, AsyncJoinNode, AsyncNode, JoinConflictError
+
+
+class Set(AsyncNode):
+    """Writes shared[key] = value after sleeping `delay` seconds."""
+
+    def __init__(self, name, key, value, delay=0.0):
+        super().__init__(name)
+        self.key, self.value, self.delay = key, value, delay
+
+    async def exec_async(self, prep_res):
+        await asyncio.sleep(self.delay)
+        return self.value
+
+    async def post_async(self, shared, prep_res, exec_res):
+        shared[self.key] = exec_res
+        shared.setdefault("ran", []).append(self.name)
+
+
+class Join(AsyncJoinNode):
+    async def prep_async(self, shared):
+        return sorted(k for k in shared if k != "ran")
+
+    async def post_async(self, shared, prep_res, exec_res):
+        shared[f"seen_by_{self.name}"] = exec_res
+        shared.setdefault("ran", []).append(self.name)
+
+
+def _diamond(delay=0.05):
+    start = Set("start", "start", 0)
+    start >> [Set("a", "a", 1, delay), Set("b", "b", 2, delay), Set("c", "c", 3, delay)] >> Join("join")
+    return start
+
+
+@pytest.mark.parametrize("compiled", [False, True])
+async def test_branches_run_concurrently_and_merge_before_the_join(compiled):
+    flow = AsyncFlow(start=_diamond(0.1))
+    if compiled:
+        flow = flow.compile()
+    shared = {}
+    started = time.monotonic()
+    await flow.run_async(shared)
+    assert time.monotonic() - started < 0.25  # not 3 x 0.1s
+    assert (shared["a"], shared["b"], shared["c"]) == (1, 2, 3)
+    assert shared["seen_by_join"] == ["a", "b", "c", "start"]
+    assert shared["ran"][-1] == "join"
+
+
+async def test_max_concurrency_limits_branches():
+    shared = {}
+    started = time.monotonic()
+    await AsyncFlow(start=_diamond(0.03), max_concurrency=1).run_async(shared)
+    assert time.monotonic() - started >= 0.09
+    assert shared["seen_by_join"] == ["a", "b", "c", "start"]
+
+
+async def test_branches_read_shared_but_not_each_others_writes():
+    class Peek(AsyncNode):
+        async def prep_async(self, shared):
+            await asyncio.sleep(0.01 if self.name == "late" else 0)
+            return dict(shared)
+
+        async def exec_async(self, prep_res):
+            return prep_res
+
+        async def post_async(self, shared, prep_res, exec_res):
+            shared[self.name] = sorted(exec_res)
+
+    start = Set("start", "base", 1)
+    start >> [Peek("early"), Peek("late")] >> AsyncJoinNode("join")
+    shared = {}
+    await AsyncFlow(start=start).run_async(shared)
+    assert shared["early"] == ["base", "ran"]
+    assert shared["late"] == ["base", "ran"]
+
+
+async def test_conflicting_writes_raise():
+    start = Set("start", "start", 0)
+    start >> [Set("a", "k", 1), Set("b", "k", 2)] >> AsyncJoinNode("join")
+    with pytest.raises(JoinConflictError) as info:
+        await AsyncFlow(start=start).run_async({})
+    assert info.value.conflicts == {"k": [0, 1]}
+
+
+async def test_equal_writes_do_not_conflict():
+    start = Set("start", "start", 0)
+    start >> [Set("a", "k", 1), Set("b", "k", 1)] >> AsyncJoinNode("join")
+    shared = {}
+    await AsyncFlow(start=start).run_async(shared)
+    assert shared["k"] == 1
+
+
+async def test_join_merge_can_be_overridden():
+    class Sum(AsyncJoinNode):
+        def merge(self, shared, branches):
+            shared["total"] = sum(state["k"] for state in branches)
+
+    start = Set("start", "start", 0)
+    start >> [Set("a", "k", 1), Set("b", "k", 2)] >> Sum("join")
+    shared = {}
+    await AsyncFlow(start=start).run_async(shared)
+    assert shared["total"] == 3 and "k" not in shared
+
+
+async def test_nested_fan_out_runs_its_own_join():
+    start, p, q = Set("start", "start", 0), Set("p", "p", 1), Set("q", "q", 2)
+    inner, outer = Join("inner"), Join("outer")
+    start >> [p, q]
+    p >> [Set("r", "r", 3), Set("t", "t", 4)] >> inner
+    inner >> outer
+    q >> outer
+    shared = {}
+    await AsyncFlow(start=start).run_async(shared)
+    assert shared["seen_by_inner"] == ["p", "r", "start", "t"]  # q's branch is a sibling
+    assert shared["seen_by_outer"] == ["p", "q", "r", "seen_by_inner", "start", "t"]
+    assert shared["ran"].count("inner") == 1 and shared["ran"][-1] == "outer"
+
+
+async def test_fan_out_without_join_merges_at_the_end():
+    start = Set("start", "start", 0)
+    start >> [Set("a", "a", 1), Set("b", "b", 2)]
+    shared = {}
+    await AsyncFlow(start=start).run_async(shared)
+    assert (shared["a"], shared["b"]) == (1, 2)
+
+
+class Track(AsyncNode):
+    """Counts how many Track nodes are running at once."""
+
+    running = peak = 0
+
+    async def exec_async(self, prep_res):
+        Track.running += 1
+        Track.peak = max(Track.peak, Track.running)
+        await asyncio.sleep(0.01)
+        Track.running -= 1
+        return self.name
+
+    async def post_async(self, shared, prep_res, exec_res):
+        shared[self.name] = exec_res
+
+
+def _nested_fan_out():
+    start, p, q = Track("start"), Track("p"), Track("q")
+    p >> [Track("p1"), Track("p2")] >> AsyncJoinNode("join_p")
+    q >> [Track("q1"), Track("q2")] >> AsyncJoinNode("join_q")
+    start >> [p, q] >> AsyncJoinNode("outer")
+    return start
+
+
+@pytest.mark.parametrize("via_engine", [False, True])
+async def test_max_concurrency_covers_nested_fan_outs(via_engine):
+    Track.running = Track.peak = 0
+    flow = AsyncFlow(start=_nested_fan_out(), max_concurrency=2)
+    shared = {}
+    if via_engine:
+        from agora.engine import EventEngine
+        from agora.tracer import Tracer
+
+        await EventEngine(tracer=Tracer(enable_console=False)).run_flow(flow, shared)
+    else:
+        await flow.run_async(shared)
+    assert Track.peak == 2
+    assert sorted(k for k in shared if k.startswith(("p", "q"))) == ["p", "p1", "p2", "q", "q1", "q2"]
+
+
+async def test_fan_out_in_a_sub_flow_does_not_deadlock_on_the_cap():
+    Track.running = Track.peak = 0
+    inner_start = Track("inner")
+    inner_start >> [Track("i1"), Track("i2")] >> AsyncJoinNode("inner_join")
+    start = Track("start")
+    start >> [AsyncFlow(start=inner_start), Track("other")]
+    shared = {}
+    await asyncio.wait_for(AsyncFlow(start=start, max_concurrency=1).run_async(shared), 2)
+    assert Track.peak == 1
+    assert {"i1", "i2", "other"} <= set(shared)
@@ -0,0 +1,159 @@
+import asyncio
+
+import pytest
+
+from agora import AsyncNode, HedgePolicy
+
+
+def _warmed(latency=0.01, **kwargs):
+    policy = HedgePolicy(percentile=50, budget=1.0, min_samples=5, **kwargs)
+    for _ in range(5):
+        policy.observe(latency)
+    return policy
+
+
+def _recorder():
+    attributes = {}
+    return attributes, attributes.update
+
+
+async def test_no_hedge_before_min_samples():
+    policy = HedgePolicy(min_samples=5, budget=1.0)
+    calls = 0
+
+    async def attempt():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.02)
+        return calls
+
+    attributes, annotate = _recorder()
+    assert await policy.run(attempt, annotate) == 1
+    assert calls == 1 and attributes == {}
+    assert policy.stats()["hedge_delay_ms"] is None
+
+
+async def test_hedge_wins_and_slow_primary_is_cancelled():
+    policy = _warmed()
+    calls, cancelled = 0, []
+
+    async def attempt():
+        nonlocal calls
+        calls += 1
+        index = calls
+        try:
+            await asyncio.sleep(1 if index == 1 else 0.001)
+        except asyncio.CancelledError:
+            cancelled.append(index)
+            raise
+        return index
+
+    attributes, annotate = _recorder()
+    assert await asyncio.wait_for(policy.run(attempt, annotate), 0.5) == 2
+    await asyncio.sleep(0)
+    assert cancelled == [1]
+    assert attributes["hedge_fired"] is True
+    assert attributes["hedge_winner"] == "hedge"
+    assert policy.stats()["hedges"] == 1 and policy.stats()["hedge_wins"] == 1
+
+
+async def test_primary_wins_and_backup_is_cancelled():
+    policy = _warmed()
+    calls, cancelled = 0, []
+
+    async def attempt():
+        nonlocal calls
+        calls += 1
+        index = calls
+        try:
+            await asyncio.sleep(0.03 if index == 1 else 1)
+        except asyncio.CancelledError:
+            cancelled.append(index)
+            raise
+        return index
+
+    attributes, annotate = _recorder()
+    assert await asyncio.wait_for(policy.run(attempt, annotate), 0.5) == 1
+    await asyncio.sleep(0)
+    assert cancelled == [2]
+    assert attributes["hedge_winner"] == "primary"
+    assert policy.stats()["hedge_wins"] == 0
+
+
+async def test_fast_primary_is_not_hedged():
+    policy = _warmed(latency=0.5)
+
+    async def attempt():
+        return "fast"
+
+    attributes, annotate = _recorder()
+    assert await policy.run(attempt, annotate) == "fast"
+    assert attributes == {} and policy.hedges == 0
+
+
+async def test_budget_limits_hedges():
+    policy = _warmed()
+    policy.budget = 0.0
+
+    async def attempt():
+        await asyncio.sleep(0.03)
+        return "slow"
+
+    attributes, annotate = _recorder()
+    assert await policy.run(attempt, annotate) == "slow"
+    assert policy.hedges == 0
+
+
+async def test_both_attempts_failing_raises_the_primary_error():
+    policy = _warmed()
+    calls = 0
+
+    async def attempt():
+        nonlocal calls
+        calls += 1
+        index = calls
+        await asyncio.sleep(0.03 if index == 1 else 0.001)
+        raise RuntimeError(f"attempt {index}")
+
+    attributes, annotate = _recorder()
+    with pytest.raises(RuntimeError, match="attempt 1"):
+        await policy.run(attempt, annotate)
+    assert attributes["hedge_winner"] is None
+
+
+async def test_cancelling_the_caller_cancels_both_attempts():
+    policy = _warmed()
+    cancelled = []
+
+    async def attempt():
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    task = asyncio.ensure_future(policy.run(attempt, lambda **kw: None))
+    await asyncio.sleep(0.05)  # past the hedge delay: both attempts running
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert len(cancelled) == 2
+
+
+async def test_hedged_node_annotates_its_span():
+    class Lookup(AsyncNode):
+        calls = 0
+
+        async def exec_async(self, prep_res):
+            type(self).calls += 1
+            await asyncio.sleep(1 if type(self).calls == 1 else 0.001)
+            return "ok"
+
+        async def post_async(self, shared, prep_res, exec_res):
+            shared["result"] = exec_res
+
+    node = Lookup(hedge=_warmed())
+    shared = {}
+    await asyncio.wait_for(node.run_async(shared), 0.5)
+    assert shared["result"] == "ok"
+    assert node.trace_attributes["hedge_winner"] == "hedge"
@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+
+from agora import AsyncFlow, AsyncMicroBatchNode
+
+
+class Upper(AsyncMicroBatchNode):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.batches = []
+
+    async def prep_async(self, shared):
+        return shared["text"]
+
+    async def exec_batch_async(self, items):
+        self.batches.append(list(items))
+        await asyncio.sleep(0.001)
+        return [item.upper() for item in items]
+
+    async def post_async(self, shared, prep_res, exec_res):
+        shared["result"] = exec_res
+
+
+async def test_concurrent_runs_share_batches_and_get_their_own_result():
+    node = Upper(max_batch_size=8, max_wait_ms=20)
+    flow = AsyncFlow(start=node)
+    shareds = [{"text": f"t{i}"} for i in range(20)]
+    await asyncio.gather(*[flow.run_async(shared) for shared in shareds])
+    assert [shared["result"] for shared in shareds] == [f"T{i}" for i in range(20)]
+    assert [len(batch) for batch in node.batches] == [8, 8, 4]
+    assert sorted(item for batch in node.batches for item in batch) == sorted(
+        shared["text"] for shared in shareds
+    )
+
+
+async def test_partial_batch_flushes_after_max_wait():
+    node = Upper(max_batch_size=100, max_wait_ms=5)
+    shared = {"text": "solo"}
+    await asyncio.wait_for(node.run_async(shared), 1)
+    assert shared["result"] == "SOLO"
+    assert node.batches == [["solo"]]
+    assert node.trace_attributes["batch_size"] == 1
+
+
+async def test_batch_failure_reaches_every_caller():
+    class Broken(Upper):
+        async def exec_batch_async(self, items):
+            raise RuntimeError("model down")
+
+    flow = AsyncFlow(start=Broken(max_batch_size=3, max_wait_ms=5))
+    results = await asyncio.gather(
+        *[flow.run_async({"text": str(i)}) for i in range(3)], return_exceptions=True
+    )
+    assert all(isinstance(r, RuntimeError) and str(r) == "model down" for r in results)
+
+
+async def test_wrong_number_of_results_is_an_error():
+    class Short(Upper):
+        async def exec_batch_async(self, items):
+            return items[:-1]
+
+    flow = AsyncFlow(start=Short(max_batch_size=2, max_wait_ms=5))
+    with pytest.raises(ValueError, match="returned 1 results for 2 items"):
+        await asyncio.gather(*[flow.run_async({"text": str(i)}) for i in range(2)])
+
+
+async def test_fallback_applies_per_item():
+    class Fallback(Upper):
+        async def exec_batch_async(self, items):
+            raise RuntimeError("model down")
+
+        async def exec_fallback_async(self, prep_res, exc):
+            return f"fallback:{prep_res}"
+
+    flow = AsyncFlow(start=Fallback(max_batch_size=2, max_wait_ms=5))
+    shareds = [{"text": "a"}, {"text": "b"}]
+    await asyncio.gather(*[flow.run_async(shared) for shared in shareds])
+    assert [shared["result"] for shared in shareds] == ["fallback:a", "fallback:b"]
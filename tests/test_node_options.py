@@ -0,0 +1,44 @@
+import pytest
+
+from agora import (
+    AsyncBatchNode,
+    AsyncMicroBatchNode,
+    AsyncNode,
+    AsyncParallelBatchNode,
+    AsyncProcessPoolBatchNode,
+    AsyncStreamNode,
+    BatchNode,
+    Node,
+    ParallelBatchNode,
+    ProcessPoolBatchNode,
+)
+from agora.cache import LRUCache
+from agora.hedge import HedgePolicy
+from agora.retry import RetryPolicy
+from agora.telemetry import AuditedAsyncNode, AuditedAsyncParallelBatchNode, AuditedNode
+
+SYNC = [Node, BatchNode, ParallelBatchNode, ProcessPoolBatchNode, AuditedNode]
+ASYNC = [
+    AsyncNode,
+    AsyncBatchNode,
+    AsyncParallelBatchNode,
+    AsyncMicroBatchNode,
+    AsyncProcessPoolBatchNode,
+    AsyncStreamNode,
+    AuditedAsyncNode,
+    AuditedAsyncParallelBatchNode,
+]
+
+
+@pytest.mark.parametrize("node_class", SYNC + ASYNC)
+def test_subclasses_accept_cache_and_retry_policy(node_class):
+    cache, policy = LRUCache(), RetryPolicy(max_attempts=3)
+    node = node_class(cache=cache, retry_policy=policy)
+    assert node.cache is cache and node.retry_policy is policy
+
+
+@pytest.mark.parametrize("node_class", ASYNC)
+def test_async_subclasses_accept_timeout_and_hedge(node_class):
+    hedge = HedgePolicy()
+    node = node_class(timeout=1, hedge=hedge)
+    assert node.timeout == 1 and node.hedge is hedge
@@ -0,0 +1,103 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from agora import AsyncProcessPoolBatchNode, ProcessPoolBatchNode
+
+# Node classes live at module level so worker processes can unpickle them
+
+
+class Square(ProcessPoolBatchNode):
+    def prep(self, shared):
+        return shared["items"]
+
+    def exec(self, item):
+        if item < 0:
+            raise ValueError(f"negative: {item}")
+        if item == 7 and self.cur_retry == 0:
+            raise RuntimeError("flaky")  # succeeds on the retry
+        return item * item
+
+    def exec_fallback(self, item, exc):
+        return f"fallback:{exc}"
+
+    def post(self, shared, prep_res, exec_res):
+        shared["results"] = exec_res
+
+
+class AsyncSquare(AsyncProcessPoolBatchNode):
+    async def prep_async(self, shared):
+        return shared["items"]
+
+    def exec(self, item):
+        return Square.exec(self, item)
+
+    def exec_fallback(self, item, exc):
+        return f"fallback:{exc}"
+
+    async def post_async(self, shared, prep_res, exec_res):
+        shared["results"] = exec_res
+
+
+@pytest.fixture(scope="module")
+def pool():
+    with ProcessPoolExecutor(2) as executor:
+        yield executor
+
+
+def _run_sync(items, **kwargs):
+    shared = {"items": items}
+    Square(**kwargs).run(shared)
+    return shared
+
+
+@pytest.mark.parametrize("chunksize", [1, 3])
+def test_sync_node_runs_items_in_order(pool, chunksize):
+    shared = _run_sync(list(range(7)), chunksize=chunksize, executor=pool)
+    assert shared["results"] == [i * i for i in range(7)]
+
+
+@pytest.mark.parametrize("chunksize", [1, 3])
+async def test_async_node_runs_items_in_order(pool, chunksize):
+    shared = {"items": list(range(7))}
+    await AsyncSquare(chunksize=chunksize, executor=pool).run_async(shared)
+    assert shared["results"] == [i * i for i in range(7)]
+
+
+def test_sync_node_creates_its_own_pool():
+    shared = _run_sync([1, 2, 3], max_workers=2)
+    assert shared["results"] == [1, 4, 9]
+
+
+async def test_async_node_creates_its_own_pool():
+    shared = {"items": [1, 2, 3]}
+    await AsyncSquare(max_workers=2).run_async(shared)
+    assert shared["results"] == [1, 4, 9]
+
+
+def test_sync_failures_retry_then_fall_back_per_item(pool):
+    shared = _run_sync([1, -2, 7, 3], max_retries=2, chunksize=2, executor=pool)
+    assert shared["results"] == [1, "fallback:negative: -2", 49, 9]
+
+
+async def test_async_failures_retry_then_fall_back_per_item(pool):
+    shared = {"items": [1, -2, 7, 3]}
+    await AsyncSquare(max_retries=2, chunksize=2, executor=pool).run_async(shared)
+    assert shared["results"] == [1, "fallback:negative: -2", 49, 9]
+
+
+def test_empty_batch(pool):
+    shared = _run_sync([], executor=pool)
+    assert shared["results"] == []
+
+
+@pytest.mark.parametrize("node_class", [Square, AsyncSquare])
+async def test_unpicklable_node_is_rejected(pool, node_class):
+    node = node_class(executor=pool)
+    node.transform = lambda x: x  # lambdas can't be pickled
+    shared = {"items": [1, 2]}
+    with pytest.raises(TypeError, match="can't be sent to worker processes"):
+        if isinstance(node, AsyncProcessPoolBatchNode):
+            await node.run_async(shared)
+        else:
+            node.run(shared)
@@ -0,0 +1,80 @@
+import asyncio
+import time
+
+import pytest
+
+from agora import AsyncNode
+from agora.ratelimit import RateLimiter, TokenBucket, get_rate_limiter, resolve_rate_limiter
+
+
+def test_token_bucket_reserves_ahead_of_the_refill():
+    bucket = TokenBucket(rate=10, capacity=2)
+    assert bucket.reserve() == 0 and bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(0.1, abs=0.02)
+    assert bucket.reserve() == pytest.approx(0.2, abs=0.02)  # queued behind the previous caller
+
+
+async def test_requests_per_second_spaces_calls():
+    limiter = RateLimiter(requests_per_second=20, burst=1)
+    started = time.monotonic()
+
+    async def call():
+        async with limiter.slot():
+            pass
+
+    await asyncio.gather(*(call() for _ in range(5)))
+    assert time.monotonic() - started >= 0.18  # 4 waits of 50ms after the burst
+    assert limiter.stats()["acquired"] == 5 and limiter.stats()["waiting"] == 0
+
+
+async def test_max_concurrent_caps_requests_in_flight():
+    limiter = RateLimiter(max_concurrent=2)
+    running = peak = 0
+
+    async def call():
+        nonlocal running, peak
+        async with limiter.slot():
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+    await asyncio.gather(*(call() for _ in range(6)))
+    assert peak == 2
+
+
+def test_limiters_are_shared_by_name():
+    with pytest.raises(KeyError):
+        get_rate_limiter("test-unconfigured")
+    limiter = get_rate_limiter("test-shared", requests_per_second=5)
+    assert get_rate_limiter("test-shared") is limiter
+    assert resolve_rate_limiter("test-shared") is limiter
+    assert resolve_rate_limiter(None) is None
+
+
+class Limited(AsyncNode):
+    rate_limit = RateLimiter(tokens_per_minute=600)  # 10 tokens/s, burst of 600
+
+    async def prep_async(self, shared):
+        return shared["text"]
+
+    def estimate_tokens(self, prep_res):
+        return len(prep_res)
+
+    async def exec_async(self, prep_res):
+        return prep_res.upper()
+
+    async def post_async(self, shared, prep_res, exec_res):
+        shared["out"] = exec_res
+        shared["attrs"] = dict(self.trace_attributes)
+
+
+async def test_nodes_wait_for_token_capacity_and_report_it():
+    shared = {"text": "x" * 600}
+    await Limited().run_async(shared)  # uses up the burst
+    assert shared["attrs"]["rate_limit_wait_ms"] < 20
+
+    shared = {"text": "y"}
+    await Limited().run_async(shared)
+    assert shared["out"] == "Y"
+    assert shared["attrs"]["rate_limit_wait_ms"] >= 80  # one token at 10/s
@@ -0,0 +1,100 @@
+import random
+import time
+from email.utils import formatdate
+from types import SimpleNamespace
+
+import pytest
+
+from agora import AsyncFlow, AsyncNode
+from agora.engine import EventEngine
+from agora.retry import RetryBudget, RetryPolicy, retry_after
+from agora.tracer import Tracer
+
+
+class Throttled(Exception):
+    def __init__(self, retry_after=None, headers=None):
+        super().__init__("throttled")
+        if retry_after is not None:
+            self.retry_after = retry_after
+        if headers is not None:
+            self.response = SimpleNamespace(headers=headers)
+
+
+def test_full_jitter_stays_within_the_capped_backoff():
+    random.seed(0)
+    policy = RetryPolicy(max_attempts=10, base_delay=1.0, max_delay=5.0, multiplier=2.0)
+    for attempt, cap in [(1, 1.0), (2, 2.0), (3, 4.0), (4, 5.0), (8, 5.0)]:
+        delays = [policy.backoff(attempt) for _ in range(200)]
+        assert all(0 <= d <= cap for d in delays)
+        assert max(delays) > cap / 2  # actually spread over the range
+    assert RetryPolicy(base_delay=1.0, jitter=False).backoff(2) == 2.0
+
+
+def test_give_up_on_and_classify():
+    policy = RetryPolicy(give_up_on=(KeyError,))
+    assert policy.next_delay(KeyError("x"), 1) is None
+    assert policy.next_delay(ValueError("x"), 1) is not None
+    assert policy.next_delay(ValueError("x"), 3) is None  # out of attempts
+
+    policy = RetryPolicy(classify=lambda exc: "transient" in str(exc))
+    assert policy.is_retryable(RuntimeError("transient error"))
+    assert not policy.is_retryable(RuntimeError("bad request"))
+    assert not policy.is_retryable(NotImplementedError("transient"))  # give_up_on wins
+
+
+def test_retry_after_seconds_and_http_date():
+    assert retry_after(Throttled(retry_after=3)) == 3.0
+    assert retry_after(Throttled(headers={"retry-after": "7"})) == 7.0
+    date = formatdate(time.time() + 30, usegmt=True)
+    assert 28 <= retry_after(Throttled(headers={"Retry-After": date})) <= 31
+    assert retry_after(Throttled(headers={"retry-after": "soon"})) is None
+    assert retry_after(ValueError()) is None
+
+
+def test_retry_after_is_a_minimum_and_capped():
+    policy = RetryPolicy(base_delay=0.1, jitter=False, max_retry_after=10)
+    assert policy.next_delay(Throttled(retry_after=2), 1) == 2
+    assert policy.next_delay(Throttled(retry_after=60), 1) is None
+    assert policy.next_delay(Throttled(), 1) == 0.1
+
+
+def test_exhausted_budget_stops_retries():
+    budget = RetryBudget(ratio=0.5, min_per_second=0, max_tokens=2)
+    policy = RetryPolicy(max_attempts=10, base_delay=0, budget=budget)
+    assert policy.next_delay(ValueError(), 1) is not None
+    assert policy.next_delay(ValueError(), 2) is not None
+    assert policy.next_delay(ValueError(), 3) is None
+    policy.start()
+    policy.start()  # two calls earn one retry
+    assert policy.next_delay(ValueError(), 1) is not None
+    assert budget.stats()["retries"] == 3 and budget.stats()["rejected"] == 1
+
+
+class Failing(AsyncNode):
+    async def prep_async(self, shared):
+        return shared
+
+    async def exec_async(self, shared):
+        shared["calls"] = shared.get("calls", 0) + 1
+        raise ValueError("boom")
+
+
+async def _attempts(node):
+    engine = EventEngine(
+        tracer=Tracer(enable_console=False),
+        max_retries=2,
+        retry_policy=RetryPolicy(max_attempts=3, base_delay=0),
+    )
+    shared = {}
+    with pytest.raises(ValueError):
+        await engine.run_flow(AsyncFlow(start=node), shared)
+    return shared["calls"]
+
+
+async def test_engine_retries_plain_nodes():
+    assert await _attempts(Failing()) == 3
+
+
+async def test_engine_does_not_retry_nodes_that_retry_themselves():
+    assert await _attempts(Failing(max_retries=2)) == 2
+    assert await _attempts(Failing(retry_policy=RetryPolicy(max_attempts=2, base_delay=0))) == 2
@@ -0,0 +1,88 @@
+import asyncio
+
+from agora import AsyncFlow, AsyncNode
+from agora.engine import EventEngine
+from agora.tracer import Tracer
+
+
+class Work(AsyncNode):
+    running = peak = 0
+
+    async def prep_async(self, shared):
+        return shared["n"]
+
+    async def exec_async(self, n):
+        Work.running += 1
+        Work.peak = max(Work.peak, Work.running)
+        try:
+            await asyncio.sleep(0.001 * (n % 5))
+            if n == 3:
+                raise ValueError("bad input")
+            return n * 10
+        finally:
+            Work.running -= 1
+
+    async def post_async(self, shared, prep_res, exec_res):
+        shared["out"] = exec_res
+
+
+def _engine():
+    return EventEngine(tracer=Tracer(enable_console=False), max_retries=0)
+
+
+async def test_runs_every_input_with_bounded_concurrency():
+    Work.peak = 0
+    pulled = []
+
+    def inputs():
+        for n in range(40):
+            pulled.append(n)
+            yield {"n": n}
+
+    results = {}
+    async with _engine().run_many(AsyncFlow(start=Work()), inputs(), concurrency=4) as runs:
+        async for shared, action, metrics in runs:
+            # Inputs are pulled lazily: only running and queued results are ahead
+            assert len(pulled) - len(results) <= 2 * 4 + 1
+            results[shared["n"]] = (shared.get("out"), metrics.get("error"))
+
+    assert Work.peak <= 4
+    assert len(results) == 40
+    assert results[5] == (50, None)
+    assert results[3] == (None, "bad input")
+    stats = runs.stats
+    assert stats["completed"] == 39 and stats["errors"] == 1 and stats["in_flight"] == 0
+    assert stats["latency_p50_ms"] is not None
+
+
+async def test_accepts_async_iterables():
+    async def inputs():
+        for n in (1, 2):
+            yield {"n": n}
+
+    runs = _engine().run_many(AsyncFlow(start=Work()), inputs(), concurrency=8)
+    assert sorted([shared["out"] async for shared, _, _ in runs]) == [10, 20]
+
+
+async def test_inputs_iterator_errors_reach_the_consumer():
+    def inputs():
+        yield {"n": 1}
+        raise RuntimeError("source failed")
+
+    try:
+        async with _engine().run_many(AsyncFlow(start=Work()), inputs()) as runs:
+            async for _ in runs:
+                pass
+    except RuntimeError as e:
+        assert str(e) == "source failed"
+    else:
+        raise AssertionError("expected the inputs error")
+
+
+async def test_leaving_early_cancels_remaining_runs():
+    inputs = ({"n": 4} for _ in range(100))
+    async with _engine().run_many(AsyncFlow(start=Work()), inputs, concurrency=2) as runs:
+        async for _ in runs:
+            break
+    assert runs.stats["in_flight"] == 0
+    assert runs.stats["completed"] < 100
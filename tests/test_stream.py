@@ -0,0 +1,112 @@
+import asyncio
+
+import pytest
+
+from agora import AsyncFlow, AsyncStreamNode
+
+
+def _leftover_tasks():
+    return [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+
+
+class Source(AsyncStreamNode):
+    output_key = "numbers"
+
+    def __init__(self, count, log, **kwargs):
+        super().__init__(**kwargs)
+        self.count, self.log = count, log
+
+    async def prep_async(self, shared):
+        async def numbers():
+            try:
+                for i in range(self.count):
+                    self.log.append(("produced", i))
+                    yield i
+            finally:
+                self.log.append(("closed", "source"))
+
+        return numbers()
+
+    async def exec_async(self, items):
+        async for item in items:
+            yield item
+
+
+class Double(AsyncStreamNode):
+    input_key, output_key = "numbers", "doubled"
+
+    async def exec_async(self, items):
+        async for item in items:
+            await asyncio.sleep(0)
+            yield item * 2
+
+
+class Collect(AsyncStreamNode):
+    input_key = "doubled"
+
+    def __init__(self, log, limit=None, fail_at=None, **kwargs):
+        super().__init__(**kwargs)
+        self.log, self.limit, self.fail_at = log, limit, fail_at
+
+    async def exec_async(self, items):
+        async for item in items:
+            if item == self.fail_at:
+                raise ValueError("sink failed")
+            self.log.append(("consumed", item))
+            yield item
+            if self.limit is not None and item >= self.limit:
+                break
+
+
+def _consumed(log):
+    return [value for kind, value in log if kind == "consumed"]
+
+
+async def test_chain_streams_every_item_with_bounded_lead():
+    log = []
+    source = Source(200, log, buffer_size=4)
+    source >> Double(buffer_size=4) >> Collect(log)
+    await AsyncFlow(start=source).run_async({})
+    assert _consumed(log) == [i * 2 for i in range(200)]
+    lead = produced = consumed = 0
+    for kind, _ in log:
+        produced += kind == "produced"
+        consumed += kind == "consumed"
+        lead = max(lead, produced - consumed)
+    assert lead <= 16  # a few buffers' worth, not the whole input
+
+
+async def test_early_stop_closes_the_whole_chain():
+    log = []
+    source = Source(10_000, log, buffer_size=2)
+    source >> Double(buffer_size=2) >> Collect(log, limit=6)
+    await AsyncFlow(start=source).run_async({})
+    await asyncio.sleep(0)
+    assert _consumed(log) == [0, 2, 4, 6]
+    assert ("closed", "source") in log
+    assert sum(kind == "produced" for kind, _ in log) < 20
+    assert not _leftover_tasks()
+
+
+async def test_errors_surface_in_the_consumer_and_release_producers():
+    log = []
+    source = Source(10_000, log, buffer_size=2)
+    source >> Double(buffer_size=2) >> Collect(log, fail_at=10)
+    with pytest.raises(ValueError, match="sink failed"):
+        await AsyncFlow(start=source).run_async({})
+    await asyncio.sleep(0)
+    assert ("closed", "source") in log
+    assert not _leftover_tasks()
+
+
+async def test_aclose_releases_a_partly_read_stream():
+    log = []
+    shared = {}
+    await AsyncFlow(start=Source(10_000, log, buffer_size=2)).run_async(shared)
+    async with shared["numbers"] as stream:
+        async for item in stream:
+            if item == 5:
+                break
+    await asyncio.sleep(0)
+    assert ("closed", "source") in log
+    assert not _leftover_tasks()
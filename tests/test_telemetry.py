@@ -0,0 +1,26 @@
+from agora.telemetry import AuditLogger
+
+
+def test_events_are_formatted_in_place(tmp_path):
+    logger = AuditLogger(session_id="s", save_dir=str(tmp_path))
+    logger.log_event("a", x=1)
+    events = logger.events
+    logger.log_event("b")
+    assert logger.events is events
+    assert [e["event_type"] for e in events] == ["a", "b"]
+    assert events[0]["session_id"] == "s" and "timestamp" in events[0]
+
+
+def test_clearing_events_clears_the_log(tmp_path):
+    logger = AuditLogger(save_dir=str(tmp_path))
+    logger.log_event("a")
+    logger.log_event("b")
+    logger.events.clear()
+    assert logger.get_summary()["total_events"] == 0
+
+    logger.log_event("c")
+    assert [e["event_type"] for e in logger.events] == ["c"]
+    assert logger.get_summary()["event_counts"] == {"c": 1}
+
+    logger.events = []
+    assert logger.events == []
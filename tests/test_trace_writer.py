@@ -0,0 +1,53 @@
+import gzip
+import json
+import os
+from unittest import mock
+
+from agora.trace_writer import JsonlTraceWriter
+
+
+def _read_all(directory):
+    records = []
+    for name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, name)
+        opener = gzip.open if name.endswith(".gz") else open
+        with opener(path, "rt", encoding="utf-8") as f:
+            records.extend(json.loads(line) for line in f)
+    return records
+
+
+def test_writes_and_rotates(tmp_path):
+    path = str(tmp_path / "traces.jsonl")
+    with JsonlTraceWriter(path, max_bytes=100, compress=True, flush_interval=0.01) as writer:
+        for i in range(20):
+            assert writer.write({"i": i}, kind="span")
+        assert writer.flush()
+    assert writer.stats()["rotations"] >= 1
+    assert any(name.endswith(".gz") for name in os.listdir(tmp_path))
+    records = _read_all(str(tmp_path))
+    assert sorted(r["i"] for r in records) == list(range(20))
+    assert all(r["kind"] == "span" for r in records)
+
+
+def test_failed_rotation_keeps_writing(tmp_path):
+    path = str(tmp_path / "traces.jsonl")
+    writer = JsonlTraceWriter(path, max_bytes=20, flush_interval=0.01)
+    with mock.patch("agora.trace_writer.os.replace", side_effect=OSError("disk full")):
+        for i in range(5):
+            writer.write({"i": i})
+        assert writer.flush()
+    for i in range(5, 10):
+        writer.write({"i": i})
+    writer.close()
+    stats = writer.stats()
+    assert stats["rotation_errors"] >= 1
+    assert "disk full" in stats["last_error"]
+    assert stats["written"] == 10 and stats["errors"] == 0
+    assert sorted(r["i"] for r in _read_all(str(tmp_path))) == list(range(10))
+
+
+def test_writes_after_close_are_dropped(tmp_path):
+    writer = JsonlTraceWriter(str(tmp_path / "traces.jsonl"), queue_size=1)
+    writer.close()
+    assert writer.write({"late": True}) is False
+    assert writer.stats()["dropped"] == 1
@@ -0,0 +1,182 @@
+import asyncio
+import random
+import time
+
+from agora import AsyncFlow, AsyncNode
+from agora.engine import EventEngine
+from agora.tracer import FlowTrace, NodeSpan, Tracer
+
+
+def _span(tracer, name="node"):
+    with tracer.start_node_span(name, "Node") as span:
+        tracer.end_node_span(span)
+
+
+def _finished_trace(tracer, name, spans=1):
+    with tracer.flow_trace(name) as trace:
+        for _ in range(spans):
+            _span(tracer)
+        tracer.end_flow_trace(trace=trace)
+    return trace
+
+
+class Leaf(AsyncNode):
+    async def exec_async(self, prep_res):
+        await asyncio.sleep(random.random() * 0.005)
+        return 1
+
+
+# Retention
+
+
+def test_max_traces_evicts_oldest_finished_traces():
+    evicted = []
+    tracer = Tracer(enable_console=False, max_traces=3, on_evict=evicted.append)
+    for i in range(5):
+        _finished_trace(tracer, f"t{i}")
+    assert [t.flow_name for t in tracer.traces] == ["t2", "t3", "t4"]
+    assert [t.flow_name for t in evicted] == ["t0", "t1"]
+    assert tracer.evicted == 2
+
+
+def test_running_traces_are_never_evicted():
+    evicted = []
+    tracer = Tracer(enable_console=False, max_traces=2, on_evict=evicted.append)
+    running = tracer.start_flow_trace("long")
+    _span(tracer)
+    for i in range(3):
+        _finished_trace(tracer, f"short{i}")
+    assert tracer.traces[-1] is running  # finished traces come first
+    assert all(t.status != "running" for t in evicted)
+
+    # Spans recorded after other traces came and went still land on it
+    tracer.current_trace = running
+    _span(tracer)
+    tracer.end_flow_trace(trace=running)
+    tracer.start_flow_trace("next")
+    assert running not in evicted  # traces are evicted in the order they ended
+    tracer.start_flow_trace("after")
+    assert running in evicted and len(running.spans) == 2
+
+
+def test_many_running_traces_keep_retention_linear():
+    evicted = []
+    tracer = Tracer(enable_console=False, max_traces=100, on_evict=evicted.append)
+    started = time.perf_counter()
+    running = [tracer.start_flow_trace(f"run{i}") for i in range(8000)]
+    assert len(tracer.traces) == 8000 and not evicted
+    for trace in running:
+        tracer.end_flow_trace(trace=trace)
+    elapsed = time.perf_counter() - started
+    assert len(tracer.traces) == 100 and len(evicted) == 7900
+    assert tracer.traces[-1] is running[-1]
+    assert elapsed < 2  # quadratic bookkeeping took ~17s here
+
+
+def test_max_spans_evicts_whole_traces_but_keeps_the_newest():
+    tracer = Tracer(enable_console=False, max_traces=None, max_spans=5)
+    for i in range(4):
+        _finished_trace(tracer, f"t{i}", spans=2)
+    assert [t.flow_name for t in tracer.traces] == ["t2", "t3"]
+    assert tracer._span_count == 4
+
+    big = _finished_trace(tracer, "big", spans=10)
+    assert list(tracer.traces) == [big]
+
+
+def test_max_age_evicts_expired_traces():
+    tracer = Tracer(enable_console=False, max_traces=None, max_age=0.05)
+    for i in range(3):
+        _finished_trace(tracer, f"old{i}")
+    time.sleep(0.06)
+    _finished_trace(tracer, "new")
+    assert [t.flow_name for t in tracer.traces] == ["new"]
+
+
+def test_on_evict_errors_are_reported_not_raised(recwarn):
+    def broken(trace):
+        raise RuntimeError("exporter down")
+
+    tracer = Tracer(enable_console=False, max_traces=1, on_evict=broken)
+    _finished_trace(tracer, "a")
+    _finished_trace(tracer, "b")
+    assert tracer.evicted == 1
+    assert any("exporter down" in str(w.message) for w in recwarn)
+
+
+async def test_engine_memory_stays_bounded():
+    tracer = Tracer(enable_console=False, max_traces=10, max_spans=25)
+    engine = EventEngine(tracer=tracer)
+    for _ in range(200):
+        a, b = Leaf(), Leaf()
+        a >> b
+        await engine.run_flow(AsyncFlow(start=a), {})
+    assert len(tracer.traces) <= 10
+    assert tracer._span_count <= 25
+    assert tracer.evicted >= 190
+
+
+# Concurrent-run isolation
+
+
+async def test_concurrent_runs_record_only_their_own_spans():
+    engine = EventEngine(tracer=Tracer(enable_console=False, max_traces=None))
+
+    def flow(i):
+        a, b, c = Leaf(f"a{i}"), Leaf(f"b{i}"), Leaf(f"c{i}")
+        a >> b >> c
+        return AsyncFlow(f"f{i}", start=a)
+
+    results = await asyncio.gather(*[engine.run_flow(flow(i), {}) for i in range(100)])
+    for i, (_, metrics) in enumerate(results):
+        assert metrics["flow_name"] == f"f{i}"
+        assert metrics["total_nodes"] == 3
+    for trace in engine.tracer.traces:
+        suffix = trace.flow_name[1:]
+        assert [s.node_name for s in trace.spans] == [f"a{suffix}", f"b{suffix}", f"c{suffix}"]
+        assert all(s.parent_span_id is None for s in trace.spans)
+    assert engine.tracer.current_trace is None
+
+
+async def test_nested_run_restores_the_callers_trace():
+    engine = EventEngine(tracer=Tracer(enable_console=False))
+
+    class Outer(AsyncNode):
+        async def exec_async(self, prep_res):
+            await engine.run_flow(AsyncFlow("inner", start=Leaf("inner_leaf")), {})
+            return 1
+
+    first = Outer("outer_first")
+    first >> Leaf("outer_second")
+    _, metrics = await engine.run_flow(AsyncFlow("outer", start=first), {})
+    traces = {t.flow_name: [s.node_name for s in t.spans] for t in engine.tracer.traces}
+    assert metrics["total_nodes"] == 2
+    assert traces["inner"] == ["inner_leaf"]
+    assert traces["outer"] == ["outer_first", "outer_second"]
+    assert engine.tracer.current_trace is None
+    assert engine.tracer.latest_trace.flow_name == "outer"  # the last to finish
+
+
+async def test_runs_outside_a_flow_do_not_attach_to_a_finished_trace():
+    engine = EventEngine(tracer=Tracer(enable_console=False))
+    await engine.run_flow(AsyncFlow(start=Leaf()), {})
+    spans = len(engine.tracer.traces[-1].spans)
+    await asyncio.create_task(engine.run_node(Leaf("lonely"), {}))
+    assert len(engine.tracer.traces[-1].spans) == spans
+
+
+def test_spans_and_traces_accept_wall_clock_times():
+    start = time.time()
+    span = NodeSpan("a", "b", start)
+    assert abs(span.start_time - start) < 1e-6
+    assert span.end_time is None and span.duration_ms is None
+
+    span.duration_ms = 250.0
+    assert abs(span.duration_ms - 250.0) < 1e-6
+    assert abs(span.end_time - (start + 0.25)) < 1e-6
+
+    trace = FlowTrace(flow_name="flow", start_time=start, end_time=start + 1.5)
+    assert abs(trace.start_time - start) < 1e-6
+    assert abs(trace.duration_ms - 1500.0) < 1e-3
+    trace.end_time = None
+    assert trace.duration_ms is None